@@ -0,0 +1,314 @@
+"""
+benchmarks/run_benchmarks.py
+
+This module benchmarks the framework's own hot paths, offline and without a browser: the Excel reads and writes
+on large workbooks, the resolution of every locator in locators/locators_test.py against the fixture pages,
+AdminPage.validate_visible_options on the FakeDriver, and screenshot capture throughput. Results are compared
+with a stored baseline, and the run fails when a benchmark is slower than its baseline by more than a threshold.
+
+Purpose:
+- To measure every performance change to the framework instead of guessing its effect.
+
+Usage:
+    python -m benchmarks.run_benchmarks                      # compare with benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks --update-baseline    # record a new baseline
+    python -m benchmarks.run_benchmarks -k locator --sizes 1000
+"""
+import argparse
+import base64
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from collections import namedtuple
+
+from openpyxl import Workbook
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_SIZES = (1000, 10000, 100000)
+# Fewest samples a benchmark takes, so a single cold or noisy run never decides a comparison
+MIN_SAMPLES = 3
+HEADER = ["Test_case", "Tested by", "Scenario", "Type", "Expected", "Result"]
+SCREENSHOT_BYTES = 150 * 1024
+SCREENSHOT_BATCH = 50
+
+TOP_MENU = ["User Management", "Job", "Organization", "Qualifications", "Nationalities", "Corporate Branding",
+            "Configuration"]
+
+# A benchmark: its name, a callable running one iteration, how many iterations make one sample, how many samples
+# to take, and how many operations one iteration performs. The reported time is per operation.
+Benchmark = namedtuple("Benchmark", ["name", "function", "number", "repeat", "batch"], defaults=[1])
+Result = namedtuple("Result", ["name", "median", "best", "samples"])
+Comparison = namedtuple("Comparison", ["name", "baseline", "current", "ratio", "regressed"])
+
+
+def measure(benchmark):
+    """Run a benchmark and return the median and best time per operation, in seconds."""
+    if benchmark.number * benchmark.repeat > 1:
+        benchmark.function()  # Warm up caches and lazy imports; single-shot benchmarks are cold by design
+    samples = []
+    for _ in range(benchmark.repeat):
+        started = time.perf_counter()
+        for _ in range(benchmark.number):
+            benchmark.function()
+        samples.append((time.perf_counter() - started) / (benchmark.number * benchmark.batch))
+    return Result(benchmark.name, statistics.median(samples), min(samples), len(samples))
+
+
+def build_workbook(path, rows):
+    """Write a test plan shaped workbook with the given number of case rows."""
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")
+    sheet.append(HEADER)
+    for index in range(1, rows + 1):
+        sheet.append([f"TC_{index:06d}", "Tester", f"Scenario {index}", "Positive", "Expected outcome", "Pass"])
+    workbook.save(path)
+
+
+def is_selected(name, selected):
+    """Return whether a benchmark is selected by the -k text (every benchmark is when there is none)."""
+    return not selected or selected in name
+
+
+def excel_benchmarks(directory, sizes, selected=None):
+    """Yield the read and write benchmarks of ExcelFunctions, direct and through an ExcelResultRecorder.
+
+    Workbooks are only built, and loaded into a recorder, for the sizes and paths that have a selected benchmark.
+    """
+    from utils.excel_functions import ExcelFunctions, ExcelResultRecorder
+
+    for rows in sizes:
+        direct = [name for name in (f"excel.read_data[{rows}]", f"excel.write_data[{rows}]")
+                  if is_selected(name, selected)]
+        recorded = [name for name in (f"excel.recorder.read_data[{rows}]", f"excel.recorder.write_and_flush[{rows}]")
+                    if is_selected(name, selected)]
+        if not direct and not recorded:
+            continue
+        path = os.path.join(directory, f"plan_{rows}.xlsx")
+        build_workbook(path, rows)
+        # Loading a large workbook takes seconds, so take fewer samples of the slow paths
+        repeat = 5 if rows <= 10000 else MIN_SAMPLES
+        middle = rows // 2 + 1
+        if direct:
+            excel = ExcelFunctions(path, "Sheet1")
+            yield Benchmark(f"excel.read_data[{rows}]", lambda e=excel, r=middle: e.read_data(r, 6), 1, repeat)
+            yield Benchmark(
+                f"excel.write_data[{rows}]", lambda e=excel, r=middle: e.write_data(r, 6, "Pass"), 1, repeat
+            )
+        if not recorded:
+            continue
+
+        recorder = ExcelResultRecorder(path)
+        recorded_excel = ExcelFunctions(path, "Sheet1", recorder=recorder)
+        yield Benchmark(
+            f"excel.recorder.read_data[{rows}]", lambda e=recorded_excel, r=middle: e.read_data(r, 6), 1000, 5
+        )
+
+        def write_and_flush(excel=recorded_excel, recorder=recorder, rows=rows):
+            # A session's worth of result writes, saved at once
+            for row in range(2, min(rows, 50) + 2):
+                excel.write_data(row, 6, "Fail")
+            recorder.flush()
+
+        yield Benchmark(f"excel.recorder.write_and_flush[{rows}]", write_and_flush, 1, repeat)
+
+
+def locator_benchmarks():
+    """Yield one benchmark per locator in locators/locators_test.py, looked up as BasePage does (in its CSS form
+    where the registry has one) on the first page it matches. A locator template is benchmarked with its sample
+    value, including the call that builds the locator."""
+    from locators.registry import LocatorTemplate, declared_locators, registry
+    from utils.fake_driver import page_states
+
+    states = page_states()
+    for name, declared in declared_locators().items():
+        template = declared if isinstance(declared, LocatorTemplate) else None
+        locator = template(template.sample) if template else declared
+        driver = next((d for d in states.values() if d.find_elements(*locator)), None)
+        if driver is None:
+            raise AssertionError(f"{name} matches no fixture page: {locator[1]}")
+        if template is None:
+            function = lambda d=driver, l=locator: d.find_elements(*registry.resolve(l))
+        else:
+            # Page objects build the locator on every call, so the (cached) template call is part of the lookup
+            function = lambda d=driver, t=template: d.find_elements(*registry.resolve(t(t.sample)))
+        yield Benchmark(f"locator.{name}", function, 1000, 7)
+
+
+def admin_benchmarks():
+    """Yield the benchmark of AdminPage.validate_visible_options on the FakeDriver's Admin page."""
+    from pages.admin_page import AdminPage
+    from utils.fake_driver import page_states
+
+    admin_page = AdminPage(page_states()["admin"])
+    yield Benchmark(
+        "admin.validate_visible_options", lambda: admin_page.validate_visible_options(TOP_MENU), 50, 5
+    )
+
+
+class _ScreenshotDriver:
+    """A driver returning a distinct screenshot of realistic size on every call, so none is deduplicated."""
+
+    def __init__(self):
+        self._payload = os.urandom(SCREENSHOT_BYTES)
+        self._count = 0
+
+    def get_screenshot_as_base64(self):
+        self._count += 1
+        return base64.b64encode(self._count.to_bytes(8, "big") + self._payload).decode("ascii")
+
+
+def screenshot_benchmarks(directory):
+    """Yield the screenshot throughput benchmark: captures queued from the test thread until all are written."""
+    from utils.screenshots import ScreenshotService
+
+    service = ScreenshotService(directory=os.path.join(directory, "screenshots"), max_files=SCREENSHOT_BATCH)
+    driver = _ScreenshotDriver()
+
+    def capture_batch():
+        for index in range(SCREENSHOT_BATCH):
+            service.capture(driver, f"TC_{index:02d}")
+        service.wait()
+
+    try:
+        yield Benchmark("screenshot.capture_screenshot", capture_batch, 1, 5, SCREENSHOT_BATCH)
+    finally:
+        service.close()
+
+
+def run(selected=None, sizes=DEFAULT_SIZES):
+    """Run the benchmarks whose name contains the selected text, or all of them.
+
+    Returns:
+        list: A Result per benchmark, in run order.
+    """
+    from utils.timing import tracer
+
+    directory = tempfile.mkdtemp(prefix="orangehrm-bench-")
+    results = []
+    try:
+        groups = [excel_benchmarks(directory, sizes, selected), locator_benchmarks(), admin_benchmarks(),
+                  screenshot_benchmarks(directory)]
+        for group in groups:
+            for benchmark in group:
+                if not is_selected(benchmark.name, selected):
+                    continue
+                result = measure(benchmark)
+                results.append(result)
+                print(f"{result.name:<60} {result.median * 1000:>12.3f} ms")
+                # Page-object methods record tracer spans; do not let them pile up over thousands of calls
+                tracer.reset()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Compare results with a baseline.
+
+    Args:
+        results (list): The Result of each benchmark.
+        baseline (dict): Benchmark name -> {"median": seconds, ...}, as stored in the baseline file.
+        threshold (float): The allowed slowdown, e.g. 0.25 for 25% slower than the baseline median.
+
+    Returns:
+        list: A Comparison per result that has a baseline.
+    """
+    comparisons = []
+    for result in results:
+        if result.name not in baseline:
+            continue
+        reference = baseline[result.name]["median"]
+        ratio = result.median / reference if reference else float("inf")
+        comparisons.append(Comparison(result.name, reference, result.median, ratio, ratio > 1 + threshold))
+    return comparisons
+
+
+def machine():
+    """Describe the machine and interpreter the benchmarks run on, as stored with a baseline."""
+    return {"python": platform.python_version(), "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine()}
+
+
+def _read_baseline(path):
+    try:
+        with open(path, encoding="utf-8") as baseline_file:
+            return json.load(baseline_file)
+    except FileNotFoundError:
+        return {}
+
+
+def load_baseline(path=BASELINE_FILE):
+    return _read_baseline(path).get("benchmarks", {})
+
+
+def machine_mismatch(path=BASELINE_FILE):
+    """Return the machine fields that differ between the baseline and this machine, as name -> (baseline,
+    current)."""
+    recorded = _read_baseline(path).get("machine")
+    if not recorded:
+        return {}
+    current = machine()
+    return {name: (recorded.get(name), value) for name, value in current.items() if recorded.get(name) != value}
+
+
+def save_baseline(results, path=BASELINE_FILE):
+    """Store the results as the new baseline, keeping the baselines of benchmarks that were not run."""
+    benchmarks = load_baseline(path)
+    for result in results:
+        benchmarks[result.name] = {"median": result.median, "best": result.best, "samples": result.samples}
+    data = {
+        "machine": machine(),
+        "benchmarks": dict(sorted(benchmarks.items())),
+    }
+    with open(path, "w", encoding="utf-8") as baseline_file:
+        json.dump(data, baseline_file, indent=2)
+        baseline_file.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the framework's hot paths against a stored baseline.")
+    parser.add_argument("-k", dest="selected", help="Only run the benchmarks whose name contains this text.")
+    parser.add_argument("--sizes", type=lambda text: [int(size) for size in text.split(",")],
+                        default=list(DEFAULT_SIZES), help="Comma-separated workbook row counts (default: %(default)s).")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown over the baseline before failing, e.g. 0.25 for 25%% (default: 0.25).")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="The baseline file (default: benchmarks/baseline.json).")
+    parser.add_argument("--update-baseline", action="store_true", help="Record the results as the new baseline.")
+    parser.add_argument("--output", help="Also write the results of this run to a JSON file.")
+    args = parser.parse_args(argv)
+
+    results = run(args.selected, args.sizes)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump({result.name: result._asdict() for result in results}, output_file, indent=2)
+
+    if args.update_baseline:
+        save_baseline(results, args.baseline)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    mismatch = machine_mismatch(args.baseline)
+    if mismatch:
+        differences = ", ".join(f"{name} {recorded} -> {current}" for name, (recorded, current) in mismatch.items())
+        print(f"\nWarning: the baseline was recorded on a different machine ({differences}); "
+              "ratios may reflect the machine rather than the code. Record a baseline here with --update-baseline.")
+    comparisons = compare(results, load_baseline(args.baseline), args.threshold)
+    regressions = [comparison for comparison in comparisons if comparison.regressed]
+    print()
+    for comparison in comparisons:
+        marker = "REGRESSED" if comparison.regressed else "ok"
+        print(f"{comparison.name:<60} {comparison.ratio:>7.2f}x baseline  {marker}")
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) slower than the baseline by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
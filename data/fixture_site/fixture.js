@@ -0,0 +1,46 @@
+/*
+ * Behaviour of the offline OrangeHRM fixture pages, driven by data attributes:
+ *   data-navigate="URL"      clicking the element opens URL
+ *   data-required="a b"      the navigation only happens if the named inputs are filled; otherwise a
+ *                            "Required" message is added to each empty input's group
+ *   data-login               a session cookie is set before navigating
+ * The in-memory fake driver (utils/fake_driver.py) implements the same rules.
+ */
+(function () {
+    var ERROR_CLASS = 'oxd-text oxd-text--span oxd-input-field-error-message oxd-input-group__message';
+
+    function missingFields(element) {
+        var names = (element.getAttribute('data-required') || '').split(/\s+/).filter(Boolean);
+        return names.filter(function (name) {
+            var input = document.querySelector('input[name="' + name + '"]');
+            var group = input.closest('.oxd-input-group');
+            var error = group.querySelector('.oxd-input-field-error-message');
+            if (input.value.trim()) {
+                if (error) { error.remove(); }
+                return false;
+            }
+            if (!error) {
+                error = document.createElement('span');
+                error.className = ERROR_CLASS;
+                error.textContent = 'Required';
+                group.appendChild(error);
+            }
+            return true;
+        });
+    }
+
+    document.addEventListener('click', function (event) {
+        var target = event.target.closest('[data-navigate]');
+        if (!target) {
+            return;
+        }
+        event.preventDefault();
+        if (missingFields(target).length) {
+            return;
+        }
+        if (target.hasAttribute('data-login')) {
+            document.cookie = 'orangehrm=fixture-session; path=/';
+        }
+        window.location.href = target.getAttribute('data-navigate');
+    });
+})();
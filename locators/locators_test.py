@@ -4,9 +4,11 @@ locators/locators.test.py
 This module contains locator definitions for the various elements 
 in the login and admin pages of the OrangeHRM application. 
 Using Selenium's By class, locators are defined for easy access 
-to web elements during automation testing.
+to web elements during automation testing. Locators built at runtime from a value, such as
+the text of a menu option, are declared as LocatorTemplates.
 """
 from selenium.webdriver.common.by import By
+from locators.registry import LocatorTemplate
 
 class LoginPageLocators:
     FORGOT_PASSWORD_LINK = (By.XPATH, "//p[@class='oxd-text oxd-text--p orangehrm-login-forgot-header']")
@@ -22,4 +24,12 @@ class ForgotPasswordPageLocators:
     CANCEL_BUTTON = (By.XPATH, "//button[contains(@class, 'orangehrm-forgot-password-button--cancel')]")
 
 class AdminPageLocators:
-    ADMIN_TAB = (By.XPATH, "//span[text()='Admin']")
\ No newline at end of file
+    ADMIN_TAB = (By.XPATH, "//span[text()='Admin']")
+    # An option of the Admin module's top menu, by its text
+    TOP_MENU_OPTION = LocatorTemplate(
+        By.XPATH, "//nav[@aria-label='Topbar Menu']//li[normalize-space()={}]", sample="User Management"
+    )
+    # An item of the side menu, by its text
+    SIDE_MENU_OPTION = LocatorTemplate(
+        By.XPATH, "//nav[@aria-label='Sidepanel']//li[normalize-space()={}]", sample="Leave"
+    )
@@ -0,0 +1,258 @@
+"""
+locators/registry.py
+
+This module provides the LocatorRegistry class, which compiles the XPath locators of locators_test.py to
+equivalent CSS selectors where one exists, and validates every locator offline against saved page snapshots:
+each must match on some page, match at most one element per page, and its CSS form must match exactly the
+same elements as the XPath. It also provides LocatorTemplate, for locators built at runtime from a value such
+as the text of a menu option.
+
+Purpose:
+- To let the browser use its cheaper CSS engine for the locators that can be expressed in CSS.
+- To catch broken or ambiguous locators without a browser, and to show what each lookup costs.
+
+Usage:
+    python -m locators.registry    # validate all locators against the fixture pages and report their cost
+"""
+import functools
+import re
+import sys
+import time
+from collections import namedtuple
+
+from selenium.webdriver.common.by import By
+
+# One location step of an XPath: the axis separator, the tag, and its predicates
+_STEP = re.compile(r"(//|/)([A-Za-z][\w-]*|\*)((?:\[[^\[\]]*\])*)")
+_PREDICATE = re.compile(r"\[([^\[\]]*)\]")
+_STRING = r"""('[^']*'|"[^"]*")"""
+# XPath conditions with an exact CSS attribute selector equivalent
+_CONDITIONS = [
+    (re.compile(rf"@([\w-]+)\s*=\s*{_STRING}"), "[{0}={1}]"),
+    (re.compile(rf"contains\(\s*@([\w-]+)\s*,\s*{_STRING}\s*\)"), "[{0}*={1}]"),
+    (re.compile(rf"starts-with\(\s*@([\w-]+)\s*,\s*{_STRING}\s*\)"), "[{0}^={1}]"),
+    (re.compile(r"@([\w-]+)"), "[{0}]"),
+]
+_AND = re.compile(r"\s+and\s+")
+
+LocatorReport = namedtuple(
+    "LocatorReport",
+    ["name", "locator", "css", "pages", "max_matches", "equivalent", "xpath_cost", "css_cost"],
+)
+
+
+def _css_condition(condition):
+    for pattern, template in _CONDITIONS:
+        match = pattern.fullmatch(condition.strip())
+        if match:
+            values = match.groups()
+            if len(values) == 2 and not values[1][1:-1]:
+                return None  # contains(@x, '') matches everything, [x*=''] matches nothing
+            return template.format(*values)
+    return None
+
+
+def xpath_to_css(xpath):
+    """Translate an XPath to an equivalent CSS selector, if it only uses steps and attribute conditions.
+
+    Text conditions such as normalize-space() or text(), positions and other axes have no CSS equivalent.
+
+    Args:
+        xpath (str): An XPath such as "//input[@placeholder='Username']".
+
+    Returns:
+        str: The CSS selector, e.g. "input[placeholder='Username']", or None if there is no equivalent.
+    """
+    if not xpath.startswith("//"):
+        return None  # Absolute paths start at the document root, which CSS cannot anchor to
+    parts = []
+    position = 0
+    for step in _STEP.finditer(xpath):
+        if step.start() != position:
+            return None
+        separator, tag, predicates = step.groups()
+        selector = "" if tag == "*" and predicates else tag
+        for predicate in _PREDICATE.findall(predicates):
+            for condition in _AND.split(predicate):
+                css = _css_condition(condition)
+                if css is None:
+                    return None
+                selector += css
+        if parts:
+            parts.append(" " if separator == "//" else " > ")
+        parts.append(selector)
+        position = step.end()
+    if position != len(xpath) or not parts:
+        return None
+    return "".join(parts)
+
+
+def xpath_literal(text):
+    """Quote a string as an XPath literal, including strings that contain both kinds of quotes."""
+    if "'" not in text:
+        return f"'{text}'"
+    if '"' not in text:
+        return f'"{text}"'
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in text.split("'")) + ")"
+
+
+class LocatorTemplate:
+    def __init__(self, by, pattern, sample):
+        """Initialize a locator template.
+
+                Args:
+                    by (str): The locator strategy, e.g. By.XPATH.
+                    pattern (str): The locator value with a {} placeholder for the quoted value.
+                    sample (str): A value the template matches on the fixture pages, used to validate it.
+        """
+        self.by = by
+        self.pattern = pattern
+        self.sample = sample
+        self._format = functools.lru_cache(maxsize=256)(self._build)
+
+    def __repr__(self):
+        return f"LocatorTemplate({self.by!r}, {self.pattern!r})"
+
+    def _build(self, value):
+        quoted = xpath_literal(value) if self.by == By.XPATH else value
+        return self.by, self.pattern.format(quoted)
+
+    def __call__(self, value):
+        """Return the locator for a value. Each value's locator is built once and then served from a cache."""
+        return self._format(value)
+
+
+def declared_locators():
+    """Return every locator and locator template in locators_test.py by name, e.g. "LoginPageLocators.LOGIN_BUTTON"."""
+    from locators import locators_test
+
+    declared = {}
+    for class_name, locator_class in vars(locators_test).items():
+        if isinstance(locator_class, type) and class_name.endswith("Locators"):
+            for attribute, value in vars(locator_class).items():
+                if isinstance(value, (tuple, LocatorTemplate)):
+                    declared[f"{class_name}.{attribute}"] = value
+    return declared
+
+
+class LocatorRegistry:
+    def __init__(self, compile_css=True):
+        """Initialize the LocatorRegistry.
+
+                Args:
+                    compile_css (bool): Whether XPath locators are resolved to their CSS equivalent.
+        """
+        self.compile_css = compile_css
+        self._resolved = {}
+
+    def resolve(self, locator):
+        """Return the locator the driver should use: the CSS equivalent of an XPath if there is one.
+
+                Translations are cached, so a locator is only parsed the first time it is used.
+
+                Args:
+                    locator: A (By, value) tuple.
+
+                Returns:
+                    tuple: A (By, value) tuple.
+        """
+        if not self.compile_css or locator[0] != By.XPATH:
+            return locator
+        try:
+            return self._resolved[locator]
+        except KeyError:
+            css = xpath_to_css(locator[1])
+            resolved = (By.CSS_SELECTOR, css) if css else locator
+            self._resolved[locator] = resolved
+            return resolved
+
+    def validate(self, snapshots, locators=None, rounds=200):
+        """Check locators against page snapshots and measure their lookup cost.
+
+                Args:
+                    snapshots (dict): Page name -> HTML source.
+                    locators (dict, optional): Name -> locator or template. Defaults to locators_test.py.
+                    rounds (int): The number of lookups each cost is averaged over.
+
+                Returns:
+                    list: A LocatorReport per locator. A sound locator matches on at least one page
+                    (pages is not empty), at most one element per page (max_matches == 1), and its
+                    CSS form, if any, is equivalent.
+        """
+        import lxml.html
+        from lxml.cssselect import CSSSelector
+        from lxml.etree import XPath
+
+        documents = {name: lxml.html.document_fromstring(source) for name, source in snapshots.items()}
+        reports = []
+        for name, locator in (locators or declared_locators()).items():
+            if isinstance(locator, LocatorTemplate):
+                locator = locator(locator.sample)
+            by, value = locator
+            if by != By.XPATH:
+                raise ValueError(f"{name}: only XPath locators can be validated, not {by}")
+            xpath = XPath(value)
+            resolved = self.resolve(locator)
+            css = CSSSelector(resolved[1]) if resolved[0] == By.CSS_SELECTOR else None
+
+            pages, max_matches, equivalent = [], 0, True
+            for page, document in documents.items():
+                matches = xpath(document)
+                if matches:
+                    pages.append(page)
+                    max_matches = max(max_matches, len(matches))
+                if css is not None and css(document) != matches:
+                    equivalent = False
+
+            document = documents[pages[0]] if pages else next(iter(documents.values()))
+            reports.append(LocatorReport(
+                name, locator, resolved[1] if css is not None else None, pages, max_matches, equivalent,
+                _cost(xpath, document, rounds), _cost(css, document, rounds) if css is not None else None,
+            ))
+        return reports
+
+
+def _cost(matcher, document, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        matcher(document)
+    return (time.perf_counter() - started) / rounds
+
+
+def problems(reports):
+    """Return a description of every unsound locator in the reports."""
+    found = []
+    for report in reports:
+        if not report.pages:
+            found.append(f"{report.name} matches no page: {report.locator[1]}")
+        elif report.max_matches > 1:
+            found.append(f"{report.name} matches {report.max_matches} elements on a page: {report.locator[1]}")
+        if not report.equivalent:
+            found.append(f"{report.name} CSS form '{report.css}' does not match the same elements")
+    return found
+
+
+registry = LocatorRegistry()
+
+
+def main():
+    from utils.fake_driver import page_states
+
+    snapshots = {name: driver.page_source for name, driver in page_states().items()}
+    reports = registry.validate(snapshots)
+    print(f"{'Locator':<55} {'Engine':<6} {'XPath us':>9} {'CSS us':>9}  Pages")
+    for report in reports:
+        css_cost = f"{report.css_cost * 1e6:9.1f}" if report.css_cost is not None else f"{'-':>9}"
+        engine = "css" if report.css else "xpath"
+        print(f"{report.name:<55} {engine:<6} {report.xpath_cost * 1e6:9.1f} {css_cost}  {', '.join(report.pages)}")
+    found = problems(reports)
+    for problem in found:
+        print(f"PROBLEM: {problem}")
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    # Run the imported module, whose LocatorTemplate class is the one locators_test.py uses, not this __main__ copy
+    from locators import registry as imported_registry
+
+    sys.exit(imported_registry.main())
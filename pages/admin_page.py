@@ -2,27 +2,43 @@
 pages/admin_page.py
 
 This module contains the AdminPage class, which defines methods for interacting with the Admin page of the OrangeHRM application.
-The methods include navigation to the Admin section, retrieving the page title, checking element visibility, fetching element text, 
-and validating the visibility of expected options in the Admin menu.
+The methods include navigation to the Admin section, retrieving the page title, and validating the visibility of expected
+options in the Admin menu with a single DOM query. Visibility, absence and text helpers are inherited from BasePage.
 
 Purpose:
 - To provide a clear and reusable interface for test automation on the Admin page of the OrangeHRM application.
 """
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
-from selenium.webdriver.common.by import By
+from collections import namedtuple
 from locators.locators_test import AdminPageLocators
+from pages.base_page import BasePage
+from utils.step_retry import retry_step
+
+# Returns the normalized text of every rendered item inside the matching menus, in one round trip
+VISIBLE_MENU_TEXT_SCRIPT = """
+var items = document.querySelectorAll(arguments[0]);
+var texts = [];
+for (var i = 0; i < items.length; i++) {
+    var item = items[i];
+    if (!item.getClientRects().length || window.getComputedStyle(item).visibility === 'hidden') {
+        continue;
+    }
+    var text = (item.innerText || item.textContent || '').replace(/\\s+/g, ' ').trim();
+    if (text) {
+        texts.push(text);
+    }
+}
+return texts;
+"""
 
-class AdminPage:
-    def __init__(self, driver):
-        """Initialize the AdminPage with the given WebDriver instance.
+MENU_ITEM_SELECTOR = "nav li, nav a, nav span"
 
-        Args:
-            driver: A Selenium WebDriver instance used to interact with the web page.
-        """
-        self.driver = driver
+ADMIN_URL_FRAGMENT = "/web/index.php/admin/viewSystemUsers"
+
+OptionVisibility = namedtuple("OptionVisibility", ["visible", "missing"])
 
+
+class AdminPage(BasePage):
+    @retry_step
     def navigate_to_admin(self):
         """Navigate to the Admin tab.
 
@@ -30,14 +46,11 @@ class AdminPage:
          It also waits for the URL to contain the expected path to confirm successful navigation.
          """
         # Wait for the Admin tab to be clickable and click it
-        WebDriverWait(self.driver, 10).until(
-            EC.element_to_be_clickable(AdminPageLocators.ADMIN_TAB)
-        ).click()
+        self.click(AdminPageLocators.ADMIN_TAB)
 
         # Wait for the URL to contain the expected path after navigation
-        WebDriverWait(self.driver, 10).until(
-            EC.url_contains("/web/index.php/admin/viewSystemUsers")
-        )
+        self.wait_for_url_contains(ADMIN_URL_FRAGMENT)
+
     def get_title(self):
         """Get the title of the current page.
 
@@ -46,40 +59,36 @@ class AdminPage:
         """
         return self.driver.title
 
-    def is_element_visible(self, xpath):
-        """Check if an element specified by the XPath is visible on the page.
+    def get_visible_menu_texts(self, selector=MENU_ITEM_SELECTOR):
+        """Read the text of every visible menu item in a single script call.
+
+        The method waits until at least one menu item has rendered, so the result reflects the loaded page.
 
         Args:
-            xpath: The XPath locator for the element to check.
+            selector: The CSS selector of the menu items to read.
 
         Returns:
-            bool: True if the element is visible, False otherwise.
+            set: The normalized texts of the visible menu items.
         """
-        try:
-            WebDriverWait(self.driver, 10).until(
-                EC.visibility_of_element_located((By.XPATH, xpath))
-            )
-            return True
-        except TimeoutException:
-            return False
+        texts = self.wait_until(lambda driver: driver.execute_script(VISIBLE_MENU_TEXT_SCRIPT, selector))
+        return set(texts)
+
+    def get_visible_options(self, expected_options, selector=MENU_ITEM_SELECTOR):
+        """Split the expected options into visible and missing ones with one DOM query.
 
-    def get_element_text(self, xpath):
-        """Get the text of an element specified by the XPath.
+        Unlike checking each option with its own explicit wait, a missing option costs no extra time.
 
         Args:
-            xpath: The XPath locator for the element.
+            expected_options: A list of options to look for.
+            selector: The CSS selector of the menu items to compare against.
 
         Returns:
-            str: The text of the element if found, None if not found or not visible.
+            OptionVisibility: The visible and the missing options, each in the order of expected_options.
         """
-        try:
-            element = WebDriverWait(self.driver, 10).until(
-                EC.visibility_of_element_located((By.XPATH, xpath))
-            )
-            return element.text  # Get the text of the element
-        except Exception as e:
-            print(f"Error finding element at '{xpath}': {e}")
-            return None  # Return None if the element is not found or not visible
+        present = self.get_visible_menu_texts(selector)
+        visible = [option for option in expected_options if option in present]
+        missing = [option for option in expected_options if option not in present]
+        return OptionVisibility(visible, missing)
 
     def validate_visible_options(self, expected_options):
         """Validate the visibility of expected options in the Admin menu.
@@ -90,9 +99,4 @@ class AdminPage:
         Returns:
             list: A list of options that are actually visible on the page.
         """
-        visible_options = []
-        for option in expected_options:
-            option_xpath = f"//span[text()='{option}'] | //a[span[text()='{option}']]"
-            if self.is_element_visible(option_xpath):
-                visible_options.append(option)
-        return visible_options
\ No newline at end of file
+        return self.get_visible_options(expected_options).visible
@@ -0,0 +1,318 @@
+"""
+pages/base_page.py
+
+This module contains the BasePage class, the common parent of the page objects of the OrangeHRM application.
+Every wait of the page objects goes through BasePage.wait_until, which applies the shared WaitPolicy, and every
+public method of a page object is timed by the shared Tracer. Locators are looked up in their CSS form when the
+locator registry has one, element and URL waits are resolved by DOM events where the browser allows it,
+found elements are cached per page until the browser navigates, and actions decorated with retry_step are
+retried on the live session when they fail in a transient way.
+
+Purpose:
+- To give all page objects the same waiting, lookup and visibility helpers, tuned in one place.
+"""
+import inspect
+import logging
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.by import By
+from locators.registry import registry
+from utils.dependencies import class_dependency, dependencies
+from utils.dom_settle import check_absence
+from utils.element_cache import ElementCache, track_navigation
+from utils.step_retry import NavigationTimeout, get_default_retry_policy, retry_log
+from utils.timing import locator_name, tracer
+from utils.wait_policy import get_default_policy
+
+logger = logging.getLogger(__name__)
+
+
+# Sets each field through its native value setter and fires the input and change events Vue listens to, then
+# clicks the submit element. Returns the indexes of the fields that are missing or did not keep their value,
+# and whether the submit element was clicked (only if every field was filled).
+FILL_FORM_SCRIPT = """
+var fields = arguments[0], submit = arguments[1];
+function find(using, value) {
+    if (using === 'css') { return document.querySelector(value); }
+    return document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+var rejected = [];
+for (var i = 0; i < fields.length; i++) {
+    var el = find(fields[i][0], fields[i][1]), text = fields[i][2];
+    var proto = el ? Object.getPrototypeOf(el) : null, descriptor = null;
+    while (proto && !(descriptor = Object.getOwnPropertyDescriptor(proto, 'value'))) {
+        proto = Object.getPrototypeOf(proto);
+    }
+    if (!el || !descriptor || !descriptor.set || el.disabled || el.readOnly) {
+        rejected.push(i);
+        continue;
+    }
+    el.focus();
+    descriptor.set.call(el, text);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    if (el.value !== text) { rejected.push(i); }
+}
+var submitted = false;
+if (submit && !rejected.length) {
+    var button = find(submit[0], submit[1]);
+    if (button && !button.disabled) {
+        button.click();
+        submitted = true;
+    }
+}
+return {rejected: rejected, submitted: submitted};
+"""
+
+SCRIPT_STRATEGIES = {By.CSS_SELECTOR: "css", By.XPATH: "xpath"}
+
+
+class BasePage:
+    def __init_subclass__(cls, **kwargs):
+        """Time every public method a page object defines as a "page" span named after the class and method, and
+        record the page object as a dependency of the tests calling it."""
+        super().__init_subclass__(**kwargs)
+        dependency = class_dependency(cls)
+        for name, value in list(vars(cls).items()):
+            if not name.startswith("_") and inspect.isfunction(value):
+                setattr(cls, name, tracer.traced("page", f"{cls.__name__}.{name}")(
+                    dependencies.touching(dependency, value)))
+
+    def __init__(self, driver, wait_policy=None, retry_policy=None):
+        """Initialize the page with the given WebDriver instance.
+
+        Args:
+            driver: A Selenium WebDriver instance used to interact with the web page.
+            wait_policy: An optional WaitPolicy. Defaults to the suite-wide policy.
+            retry_policy: An optional StepRetryPolicy for the actions decorated with retry_step. Defaults to the
+                suite-wide policy.
+        """
+        self.driver = track_navigation(driver)
+        self.wait_policy = wait_policy or get_default_policy()
+        self.retry_policy = retry_policy or get_default_retry_policy()
+        self.elements = ElementCache(self.driver)
+
+    @staticmethod
+    def as_locator(locator):
+        """Return a (By, value) tuple for a locator tuple or an XPath string."""
+        if isinstance(locator, str):
+            return By.XPATH, locator
+        return locator
+
+    @staticmethod
+    def resolve(locator):
+        """Return the locator the driver is sent: the CSS equivalent of an XPath locator where one exists."""
+        dependencies.touch_locator(locator)
+        return registry.resolve(locator)
+
+    def wait_until(self, condition, locator=None, timeout=None, event=None):
+        """Wait until the condition returns a truthy value, using the page's wait policy.
+
+        Args:
+            condition: A callable taking the driver, such as an expected condition.
+            locator: The locator the condition is about, used to pick a per-locator timeout.
+            timeout: The number of seconds to wait, overriding the policy.
+            event: An optional (kind, target) pair describing the condition, e.g. ("visible", locator), so the
+                policy can wait for it by DOM events instead of polling (see WaitPolicy.wait_for).
+
+        Returns:
+            The truthy value returned by the condition.
+
+        Raises:
+            TimeoutException: If the condition is not met in time.
+        """
+        if timeout is None:
+            timeout = self.wait_policy.timeout_for(locator)
+        message = f"Timed out after {timeout}s waiting for {locator}" if locator else ""
+        label = locator_name(locator) if locator else getattr(condition, "__qualname__", "condition")
+        with tracer.span("wait", label):
+            if event is not None:
+                kind, target = event
+                return self.wait_policy.wait_for(self.driver, kind, target, condition, timeout, message)
+            return self.wait_policy.until(self.driver, condition, timeout, message)
+
+    def _find(self, kind, locator, timeout=None):
+        """Wait for an element to be present, visible or clickable, and cache it for the current page."""
+        locator = self.as_locator(locator)
+        target = self.resolve(locator)
+        condition = {
+            "presence": EC.presence_of_element_located,
+            "visible": EC.visibility_of_element_located,
+            "clickable": EC.element_to_be_clickable,
+        }[kind](target)
+        element = self.wait_until(condition, locator, timeout, event=(kind, target))
+        self.elements.put(locator, kind, element)
+        return element
+
+    def find_present(self, locator, timeout=None):
+        """Wait for an element to be present in the DOM and return it."""
+        return self._find("presence", locator, timeout)
+
+    def find_visible(self, locator, timeout=None):
+        """Wait for an element to be visible and return it."""
+        return self._find("visible", locator, timeout)
+
+    def find_clickable(self, locator, timeout=None):
+        """Wait for an element to be visible and enabled and return it."""
+        return self._find("clickable", locator, timeout)
+
+    def interact(self, locator, action, kind="clickable"):
+        """Run an action on an element, reusing the element found earlier on the same page if there is one.
+
+        If the element went stale (the page re-rendered it without navigating), it is looked up again and the
+        action is retried once; the retry is recorded in the retry log.
+
+        Args:
+            locator: A (By, value) tuple, or an XPath string.
+            action: A callable taking the element, e.g. ``lambda element: element.click()``.
+            kind: What the element must be for the action: "presence", "visible" or "clickable".
+
+        Returns:
+            The value returned by the action.
+        """
+        locator = self.as_locator(locator)
+        element = self.elements.get(locator, kind)
+        if element is None:
+            element = self._find(kind, locator)
+        try:
+            return action(element)
+        except StaleElementReferenceException as exc:
+            retry_log.record(f"{type(self).__name__}.interact({locator_name(locator)})", 1, exc, 0.0)
+            self.elements.invalidate(locator)
+            return action(self._find(kind, locator))
+
+    def click(self, locator):
+        """Click an element once it is clickable."""
+        self.interact(locator, lambda element: element.click())
+
+    def type_text(self, locator, text):
+        """Type text into an element once it is present."""
+        self.interact(locator, lambda element: element.send_keys(text), kind="presence")
+
+    def read_text(self, locator, kind="visible"):
+        """Return the text of an element once it is visible (or only present, with kind="presence")."""
+        return self.interact(locator, lambda element: element.text, kind=kind)
+
+    def wait_for_url_contains(self, fragment, timeout=None):
+        """Wait for the current URL to contain the given fragment.
+
+        Raises:
+            NavigationTimeout: A TimeoutException that retry_step retries, if the URL does not change in time.
+        """
+        try:
+            return self.wait_until(EC.url_contains(fragment), fragment, timeout, event=("url", fragment))
+        except TimeoutException as exc:
+            raise NavigationTimeout(exc.msg, exc.screen, exc.stacktrace) from exc
+
+    def is_element_visible(self, locator):
+        """Check if an element is visible on the page.
+
+        Args:
+            locator: A (By, value) tuple, or an XPath string.
+
+        Returns:
+            bool: True if the element is visible, False otherwise.
+        """
+        try:
+            self.find_visible(locator)
+            return True
+        except TimeoutException:
+            return False
+
+    def get_element_text(self, locator):
+        """Get the text of a visible element.
+
+        Args:
+            locator: A (By, value) tuple, or an XPath string.
+
+        Returns:
+            str: The text of the element if found, None if not found or not visible. Other driver errors are
+                raised.
+        """
+        try:
+            return self.read_text(locator)
+        except TimeoutException as exc:
+            logger.warning("No visible element at %r: %s", locator, exc.msg)
+            return None
+
+    def fill_form(self, fields, submit=None):
+        """Fill several fields and optionally submit the form, in as few driver commands as possible.
+
+        After waiting for the first field, one script sets every value and fires the input and change events
+        the Vue form expects, then clicks the submit element. Fields the script cannot fill (missing, read-only,
+        or changing the value they were given) are cleared and typed into instead, before submitting.
+        Unlike type_text, the fields' current values are replaced.
+
+        Args:
+            fields (dict): Locator -> text. Locators are (By, value) tuples or XPath strings.
+            submit: The locator of the element to click after filling, if any.
+        """
+        fields = [(self.as_locator(locator), str(text)) for locator, text in fields.items()]
+        if fields and self.elements.get(fields[0][0]) is None:
+            self.find_present(fields[0][0])
+
+        targets = [self.resolve(locator) for locator, _ in fields]
+        submit_target = self.resolve(self.as_locator(submit)) if submit is not None else None
+        if all(by in SCRIPT_STRATEGIES for by, _ in targets + ([submit_target] if submit_target else [])):
+            result = self.driver.execute_script(
+                FILL_FORM_SCRIPT,
+                [[SCRIPT_STRATEGIES[by], value, text] for (by, value), (_, text) in zip(targets, fields)],
+                [SCRIPT_STRATEGIES[submit_target[0]], submit_target[1]] if submit_target else None,
+            )
+            rejected, submitted = result["rejected"], result["submitted"]
+        else:
+            # The script only evaluates CSS and XPath; other locators are typed into one by one
+            rejected, submitted = range(len(fields)), False
+
+        for index in rejected:
+            locator, text = fields[index]
+            self.interact(locator, lambda element, text=text: (element.clear(), element.send_keys(text)),
+                          kind="presence")
+        if submit is not None and not submitted:
+            self.click(submit)
+        elif submitted:
+            # A click from a script is not seen by the navigation tracker, so forget this page's elements here
+            self.elements.invalidate()
+
+    def check_absence(self, locator):
+        """Check that an element is absent once the page has settled.
+
+        Instead of waiting out the full timeout, the check waits until the document is ready and the DOM has
+        stopped changing, then looks for the element once.
+
+        Args:
+            locator: A (By, value) tuple, or an XPath string.
+
+        Returns:
+            AbsenceCheck: Whether the element is absent, the seconds the check took, and whether the page settled.
+        """
+        locator = self.as_locator(locator)
+        return check_absence(self.driver, self.resolve(locator), timeout=self.wait_policy.timeout_for(locator))
+
+    def is_element_absent(self, locator):
+        """Check if an element is absent (missing or not displayed) from the settled page.
+
+        Args:
+            locator: A (By, value) tuple, or an XPath string.
+
+        Returns:
+            bool: True if the element is absent, False otherwise.
+        """
+        return self.check_absence(locator).absent
+
+    def assert_absent(self, locator):
+        """Assert that an element is absent from the settled page.
+
+        Args:
+            locator: A (By, value) tuple, or an XPath string.
+
+        Returns:
+            AbsenceCheck: The result of the check, including the seconds it took.
+
+        Raises:
+            AssertionError: If the element is displayed.
+        """
+        result = self.check_absence(locator)
+        if not result.absent:
+            raise AssertionError(f"Element at '{locator}' is displayed (checked in {result.elapsed:.3f}s)")
+        return result
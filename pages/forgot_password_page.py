@@ -9,51 +9,53 @@ Purpose:
 - To encapsulate the actions that can be performed on the forgot password page, facilitating test automation
   for the forgot password functionalities.
 """
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from locators.locators_test import ForgotPasswordPageLocators
+from pages.base_page import BasePage
+from utils.step_retry import retry_step
 
 
-class ForgotPasswordPage:
-    def __init__(self, driver):
-        """Initialize the ForgotPasswordPage with the given WebDriver instance.
+class ForgotPasswordPage(BasePage):
+    @retry_step
+    def enter_username(self, username):
+        """Enter the username in the username field.
+
+                This method waits for the username field to be present and sets it to the provided username.
 
                 Args:
-                    driver: A Selenium WebDriver instance used to interact with the web page.
+                    username: The username to be entered in the forgot password field.
                 """
-        self.driver = driver
+        self.fill_form({ForgotPasswordPageLocators.USERNAME_FIELD: username})
 
-    def enter_username(self, username):
-        """Enter the username in the username field.
+    @retry_step
+    def request_reset(self, username):
+        """Enter the username and click the 'Reset' button.
 
-                This method waits for the username field to be present and inputs the provided username.
+                The field is filled and the button clicked with a single script (see BasePage.fill_form).
 
                 Args:
-                    username: The username to be entered in the forgot password field.
+                    username: The username to request a password reset for.
                 """
-        WebDriverWait(self.driver, 10).until(
-            EC.presence_of_element_located(ForgotPasswordPageLocators.USERNAME_FIELD)
-        ).send_keys(username)
+        self.fill_form(
+            {ForgotPasswordPageLocators.USERNAME_FIELD: username}, submit=ForgotPasswordPageLocators.RESET_BUTTON
+        )
 
+    @retry_step
     def click_reset(self):
         """Click the 'Reset' button.
 
         This method waits for the reset button to be clickable and then clicks it.
         """
 
-        WebDriverWait(self.driver, 10).until(
-            EC.element_to_be_clickable(ForgotPasswordPageLocators.RESET_BUTTON)
-        ).click()
+        self.click(ForgotPasswordPageLocators.RESET_BUTTON)
 
+    @retry_step
     def click_cancel(self):
         """Click the 'Cancel' button.
 
         This method waits for the cancel button to be clickable and then clicks it.
         """
 
-        WebDriverWait(self.driver, 10).until(
-            EC.element_to_be_clickable(ForgotPasswordPageLocators.CANCEL_BUTTON)
-        ).click()
+        self.click(ForgotPasswordPageLocators.CANCEL_BUTTON)
 
     def get_required_error_message(self):
         """Retrieve the required error message.
@@ -63,9 +65,7 @@ class ForgotPasswordPage:
                Returns:
                    str: The text of the required error message.
                """
-        return WebDriverWait(self.driver, 10).until(
-            EC.presence_of_element_located(ForgotPasswordPageLocators.REQUIRED_ERROR_MESSAGE)
-        ).text
+        return self.read_text(ForgotPasswordPageLocators.REQUIRED_ERROR_MESSAGE, kind="presence")
 
     def get_success_message(self):
         """Retrieve the success message after a successful reset request.
@@ -75,6 +75,4 @@ class ForgotPasswordPage:
                 Returns:
                     str: The text of the success message.
                 """
-        return WebDriverWait(self.driver, 10).until(
-            EC.visibility_of_element_located(ForgotPasswordPageLocators.SUCCESS_MESSAGE)
-        ).text
+        return self.read_text(ForgotPasswordPageLocators.SUCCESS_MESSAGE)
@@ -2,52 +2,74 @@
 pages/login_page.py
 
 This module contains the LoginPage class, which provides methods for interacting with the login page of the OrangeHRM application.
-The class includes functionality for logging in, as well as handling the 'Forgot Password' link.
+The class includes functionality for logging in, reusing a cached login session, as well as handling the 'Forgot Password' link.
 
 Purpose:
 - To encapsulate the actions that can be performed on the login page, facilitating test automation for login functionalities.
 """
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from locators.locators_test import LoginPageLocators
+from pages.base_page import BasePage
+from utils.session_cache import LOGIN_PATH
+from utils.step_retry import retry_step
 
 
-class LoginPage:
-    def __init__(self, driver):
+class LoginPage(BasePage):
+    def __init__(self, driver, session_cache=None, wait_policy=None, retry_policy=None):
         """Initialize the LoginPage with the given WebDriver instance.
 
                Args:
                    driver: A Selenium WebDriver instance used to interact with the web page.
+                   session_cache: An optional LoginSessionCache used by ensure_logged_in() to skip the login form.
+                   wait_policy: An optional WaitPolicy. Defaults to the suite-wide policy.
+                   retry_policy: An optional StepRetryPolicy. Defaults to the suite-wide policy.
                """
-        self.driver = driver
+        super().__init__(driver, wait_policy, retry_policy)
+        self.session_cache = session_cache
 
     def login(self, username, password):
         """Perform login action using the provided username and password.
 
-        This method waits for the username and password fields to be present, enters the credentials,
-        and then clicks the login button.
+        This method waits for the login form, then fills in the credentials and clicks the login button
+        with a single script (see BasePage.fill_form).
 
         Args:
             username: The username to be entered in the login field.
             password: The password to be entered in the password field.
         """
-        WebDriverWait(self.driver, 10).until(
-            EC.presence_of_element_located(LoginPageLocators.USERNAME_FIELD)
-        ).send_keys(username)
+        self.fill_form(
+            {LoginPageLocators.USERNAME_FIELD: username, LoginPageLocators.PASSWORD_FIELD: password},
+            submit=LoginPageLocators.LOGIN_BUTTON,
+        )
 
-        WebDriverWait(self.driver, 10).until(
-            EC.presence_of_element_located(LoginPageLocators.PASSWORD_FIELD)
-        ).send_keys(password)
+    def ensure_logged_in(self, username, password):
+        """Make sure the given user is logged in, preferring a cached session over the login form.
 
-        WebDriverWait(self.driver, 10).until(
-            EC.element_to_be_clickable(LoginPageLocators.LOGIN_BUTTON)
-        ).click()
+        If the session cache holds a valid session for the user, it is restored and the login form is skipped.
+        Otherwise this method logs in through the form, waits for the application to leave the login page,
+        and saves the new session in the cache for later tests.
 
+        Args:
+            username: The username to log in with.
+            password: The password to log in with.
+        """
+        if self.session_cache is not None and self.session_cache.restore(self.driver, username, self.wait_policy):
+            return
+
+        self.login(username, password)
+        if self.session_cache is None:
+            return
+
+        try:
+            self.wait_until(lambda driver: LOGIN_PATH not in driver.current_url)
+        except TimeoutException:
+            return  # The login failed, so there is no session worth caching
+        self.session_cache.save(self.driver, username)
+
+    @retry_step
     def click_forgot_password(self):
         """Click on the 'Forgot Password' link.
 
                This method waits for the 'Forgot Password' link to be clickable and then clicks it.
                """
-        WebDriverWait(self.driver, 10).until(
-            EC.element_to_be_clickable(LoginPageLocators.FORGOT_PASSWORD_LINK)
-        ).click()
+        self.click(LoginPageLocators.FORGOT_PASSWORD_LINK)
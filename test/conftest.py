@@ -0,0 +1,430 @@
+"""
+test/conftest.py
+
+Session-wide fixtures and hooks shared by the test modules.
+"""
+import os
+import re
+import shutil
+
+import pytest
+from selenium import webdriver
+from utils.browser_profiles import PROFILES, get_profile, page_load_summary, render_page_loads_html
+from utils.driver_pool import DriverPool
+from utils.excel_functions import ExcelResultRecorder
+from utils.fixture_server import FixtureServer
+from utils.live_report import LiveReport
+from utils.result_journal import ResultJournal, merge_journals
+from utils.run_context import is_worker, run_id, worker_id
+from utils.run_history import SUMMARY_SHEET, RunHistory, summarize, summary_rows
+from utils.scheduler import Scheduler
+from utils.screenshots import POLICIES, screenshot_service
+from utils.session_cache import LOGIN_PATH, LoginSessionCache
+from utils.step_retry import StepRetryPolicy, render_retries_html, retry_log, set_default_retry_policy
+from utils.test_plan import cases_for, load_test_plan, restamp_cache
+from utils.timing import load_spans, prune_runs, recent_runs, render_slowest_steps_html, slowest_steps, tracer
+from utils.wait_policy import BACKENDS, ENVIRONMENT_TIMEOUTS, ENVIRONMENT_VARIABLE, WaitPolicy, set_default_policy
+
+TEST_PLAN_FILE = "data/test_plan.xlsx"
+TEST_PLAN_SHEET = "Sheet1"
+JOURNAL_ROOT = "reports/journal"
+TRACE_ROOT = "reports/traces"
+HISTORY_FILE = "reports/history/run_history.jsonl"
+DEPENDENCY_FILE = "reports/history/test_dependencies.json"
+BASE_URL = "https://opensource-demo.orangehrmlive.com"
+
+_config = None
+_live_report = None
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--app-url", default=BASE_URL,
+        help="Base URL of the OrangeHRM application under test, or 'local' to serve the offline fixture pages "
+             f"from a local server (default: {BASE_URL}).",
+    )
+    parser.addoption(
+        "--env", choices=sorted(ENVIRONMENT_TIMEOUTS), default=None,
+        help="Environment whose wait timeouts the page objects use (default: $ORANGEHRM_ENV or 'default').",
+    )
+    parser.addoption(
+        "--wait-backend", choices=BACKENDS, default="event",
+        help="How the page objects wait for elements and URLs: 'event' resolves waits in the browser on DOM "
+             "mutations, falling back to polling where it cannot; 'poll' always polls (default: event).",
+    )
+    parser.addoption(
+        "--driver-pool-size", type=int, default=1,
+        help="Number of warm browsers each worker keeps alive and reuses across tests (default: 1).",
+    )
+    parser.addoption(
+        "--session-ttl", type=float, default=900,
+        help="Seconds a cached login session is reused before logging in through the form again; 0 disables it.",
+    )
+    parser.addoption(
+        "--screenshots", choices=POLICIES, default="always",
+        help="When tests take screenshots: always, on-failure or never (default: always).",
+    )
+    parser.addoption(
+        "--screenshot-retention", type=int, default=200,
+        help="Number of screenshots to keep in the screenshots directory; older ones are removed (default: 200).",
+    )
+    parser.addoption(
+        "--screenshot-max-mb", type=float, default=None,
+        help="Total size in MB of screenshots to keep; older ones are removed.",
+    )
+    parser.addoption(
+        "--screenshot-max-width", type=int, default=None,
+        help="Downscale screenshots wider than this many pixels (requires Pillow).",
+    )
+    parser.addoption(
+        "--browser-profile", choices=sorted(PROFILES), default="default",
+        help="How the browsers are launched: "
+             + "; ".join(f"{name}: {profile.description}" for name, profile in sorted(PROFILES.items()))
+             + " (default: default).",
+    )
+    parser.addoption(
+        "--no-trace", action="store_true", default=False,
+        help="Do not record step timings or write the JSON trace of the run.",
+    )
+    parser.addoption(
+        "--trace-retention", type=int, default=20, metavar="N",
+        help="Keep the traces of the newest N runs in reports/traces and compare page loads across them "
+             "(default: 20).",
+    )
+    parser.addoption(
+        "--no-history", action="store_true", default=False,
+        help=f"Do not append the results of the run to {HISTORY_FILE} or refresh the '{SUMMARY_SHEET}' sheet.",
+    )
+    parser.addoption(
+        "--step-retries", type=int, default=1,
+        help="How many times a page-object action that failed in a transient way (stale element, intercepted "
+             "click, timeout) is retried on the same browser; 0 disables step retries (default: 1).",
+    )
+    parser.addoption(
+        "--step-retry-budget", type=float, default=30,
+        help="Seconds after the start of a page-object action past which it is not retried any more "
+             "(default: 30).",
+    )
+    parser.addoption(
+        "--live-report", metavar="DIR", default=None,
+        help="Write a lightweight HTML report to DIR/index.html, one row as each test finishes, with the "
+             "screenshots as files and thumbnails that open the full image on click. DIR must be new, empty or "
+             "hold an earlier live report, whose files are replaced.",
+    )
+    parser.addoption(
+        "--live-report-zip", action="store_true", default=False,
+        help="Also pack the --live-report directory into DIR.zip for sharing.",
+    )
+    parser.addoption(
+        "--history-order", action="store_true", default=False,
+        help="Run recently failed tests first, then the slowest ones, according to the run history; tests "
+             "without history run first of all.",
+    )
+    parser.addoption(
+        "--changed-since", metavar="REF", default=None,
+        help="Run only the tests affected by the files changed since a git ref (committed, uncommitted or "
+             f"untracked), according to the page objects and locators each test touched ({DEPENDENCY_FILE}).",
+    )
+    parser.addoption(
+        "--changed-file", metavar="PATH[::CLASS]", action="append", default=[],
+        help="Run only the tests affected by a changed file, or one class of it, e.g. "
+             "locators/locators_test.py::ForgotPasswordPageLocators. May be repeated.",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "fresh_driver: run the test in a new browser instead of a pooled one."
+    )
+    config.addinivalue_line(
+        "markers", "screenshots(policy): override the screenshot policy (always, on-failure, never) for a test."
+    )
+    config.addinivalue_line(
+        "markers", "browser_profile(name): run the test in a new browser launched with this browser profile."
+    )
+    config.addinivalue_line(
+        "markers", "test_plan(case_id): the test plan case(s) that drive a test taking the plan_case argument; "
+                   "defaults to the ID in the test name, e.g. TC_04 for test_tc_04_*."
+    )
+    global _config, _live_report
+    _config = config
+    config.pluginmanager.register(Scheduler(config, HISTORY_FILE, DEPENDENCY_FILE), "scheduler")
+    # Fix the run ID before any xdist worker is started, so every worker inherits it
+    run_id()
+    set_default_policy(
+        WaitPolicy.for_environment(config.getoption("--env"), backend=config.getoption("--wait-backend"))
+    )
+    set_default_retry_policy(
+        StepRetryPolicy(retries=config.getoption("--step-retries"), budget=config.getoption("--step-retry-budget"))
+    )
+    tracer.enabled = not config.getoption("--no-trace")
+    max_mb = config.getoption("--screenshot-max-mb")
+    screenshot_service.configure(
+        policy=config.getoption("--screenshots"),
+        max_files=config.getoption("--screenshot-retention"),
+        max_bytes=int(max_mb * 1024 * 1024) if max_mb else None,
+        max_width=config.getoption("--screenshot-max-width"),
+    )
+    if config.getoption("--live-report") and not is_worker(config):
+        _live_report = LiveReport(config.getoption("--live-report"), title=f"OrangeHRM test run {run_id()}")
+        try:
+            _live_report.open(
+                run=run_id(), app_url=config.getoption("--app-url"),
+                browser_profile=config.getoption("--browser-profile"),
+                environment=config.getoption("--env") or os.environ.get(ENVIRONMENT_VARIABLE, "default"),
+            )
+        except FileExistsError as exc:
+            _live_report = None
+            raise pytest.UsageError(f"--live-report: {exc}")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item):
+    # Attribute every span, screenshot and step retry taken while the test runs to the test
+    tracer.current_test = item.nodeid
+    screenshot_service.current_test = item.nodeid
+    retry_log.current_test = item.nodeid
+    marker = item.get_closest_marker("screenshots")
+    screenshot_service.test_policy = marker.args[0] if marker else None
+    yield
+    tracer.current_test = None
+    screenshot_service.current_test = None
+    retry_log.current_test = None
+    screenshot_service.test_policy = None
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Take a screenshot of a failed test while its browser is still open, add the step retries of each phase
+    and the screenshots of the test to its reports, and mark the tests that record results in the test plan
+    for the run history."""
+    outcome = yield
+    report = outcome.get_result()
+    if retry_log.retries:
+        # A plain list survives the trip from an xdist worker to the controller
+        report.step_retries = [retry._asdict() for retry in retry_log.retries]
+        report.sections.append(("Step retries", "\n".join(
+            f"{retry.step}: attempt {retry.attempt + 1} after {retry.error} ({retry.elapsed:.3f}s)"
+            for retry in retry_log.retries
+        )))
+        retry_log.reset()
+    if "result_journal" in item.fixturenames:
+        report.history_worker = worker_id()
+    if report.when == "teardown" and item.config.getoption("--live-report"):
+        # Paths the screenshots are being written to, sent to the controller with the report under xdist; the
+        # live report copies them once they exist, so the teardown does not wait for the writes
+        report.screenshots = screenshot_service.queued_for(item.nodeid)
+    driver = item.funcargs.get("driver") if hasattr(item, "funcargs") else None
+    if report.when == "call" and report.failed and driver is not None:
+        screenshot_service.capture(driver, f"{item.name}_failure", failure=True)
+
+
+# History records of the test plan tests that ran in this session, by node ID; only filled in the controller
+_history_records = {}
+
+# Step retries of every test of the session, as sent with the reports; only filled in the controller
+_step_retries = []
+
+# Outcome, duration, messages and retries of the tests whose row the live report has not written yet
+_live_results = {}
+
+
+def _add_to_live_report(report):
+    result = _live_results.setdefault(
+        report.nodeid, {"outcome": "passed", "duration": 0.0, "messages": [], "retries": []}
+    )
+    result["duration"] += report.duration
+    result["retries"].extend(getattr(report, "step_retries", ()))
+    if report.failed:
+        result["outcome"] = "failed"
+        result["messages"].append(f"{report.when}: {report.longreprtext}")
+    elif report.skipped and result["outcome"] == "passed":
+        result["outcome"] = "skipped"
+        result["messages"].append(report.longreprtext)
+    if report.when == "teardown":
+        del _live_results[report.nodeid]
+        _live_report.add(
+            report.nodeid, result["outcome"], result["duration"], screenshots=getattr(report, "screenshots", ()),
+            message="\n\n".join(result["messages"]) or None, retries=result["retries"],
+        )
+
+
+def pytest_runtest_logreport(report):
+    """Collect the step retries and the live report row of every test, and the outcome and duration of the call
+    phase of every test plan test for the run history.
+
+    A test that errored or was skipped in setup never ran, so it is left out of the history rather than counted
+    as a failure; a run in which no test ran leaves the history and the workbook alone."""
+    _step_retries.extend(getattr(report, "step_retries", ()))
+    if _live_report is not None:
+        _add_to_live_report(report)
+    # Set by pytest_runtest_makereport in the process that ran the test, and sent along with xdist reports
+    worker = getattr(report, "history_worker", None)
+    if worker is None or report.when != "call" or _config is None or is_worker(_config) \
+            or _config.getoption("--no-history"):
+        return
+    case_id = re.search(r"\[(TC_[\d.]+)]", report.nodeid)
+    _history_records[report.nodeid] = {
+        "run_id": run_id(),
+        "test": report.nodeid,
+        "case_id": case_id.group(1) if case_id else None,
+        "outcome": report.outcome,
+        "duration": report.duration,
+        "worker": worker,
+        "environment": _config.getoption("--env") or os.environ.get(ENVIRONMENT_VARIABLE, "default"),
+        "browser_profile": _config.getoption("--browser-profile"),
+    }
+
+
+def pytest_sessionfinish(session):
+    """Merge the result journals of all workers into the test plan workbook, together with the run history
+    summary, and save this process's trace."""
+    screenshot_service.close()
+    if _live_report is not None:
+        _live_report.close()
+        print(f"\nLive report: {_live_report.index}")
+        if session.config.getoption("--live-report-zip"):
+            print(f"Live report archive: {_live_report.archive()}")
+    if not is_worker(session.config):
+        directory = os.path.join(JOURNAL_ROOT, run_id())
+        summary = None
+        if _history_records:
+            history = RunHistory(HISTORY_FILE)
+            history.append(_history_records.values())
+            summary = summarize(history.load())
+            _history_records.clear()
+        if os.path.isdir(directory) or summary is not None:
+            # Results only touch the Result column, so the compiled test plan stays valid across the merge
+            load_test_plan(TEST_PLAN_FILE, TEST_PLAN_SHEET)
+            with ExcelResultRecorder(TEST_PLAN_FILE) as recorder:
+                if os.path.isdir(directory):
+                    merge_journals(directory, recorder)
+                if summary is not None:
+                    recorder.replace_sheet(SUMMARY_SHEET, summary_rows(summary))
+            restamp_cache(TEST_PLAN_FILE, TEST_PLAN_SHEET)
+            if os.path.isdir(directory):
+                shutil.rmtree(directory)
+
+    if tracer.enabled and tracer.spans:
+        tracer.write_json(
+            os.path.join(TRACE_ROOT, run_id(), f"trace-{worker_id()}.json"), run_id=run_id(), worker=worker_id()
+        )
+    if not is_worker(session.config):
+        # The workers have written their traces by now
+        prune_runs(TRACE_ROOT, session.config.getoption("--trace-retention"))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_html_results_summary(prefix, summary, postfix, session):
+    """Add the slowest steps and the step retries of the run, across all workers, to the pytest-html report."""
+    if _step_retries:
+        postfix.append(render_retries_html(_step_retries))
+    directory = os.path.join(TRACE_ROOT, run_id())
+    if os.path.isdir(directory):
+        postfix.append(render_slowest_steps_html(slowest_steps(load_spans(directory))))
+
+    # Page loads of the newest runs, so runs with different profiles can be compared
+    runs = recent_runs(TRACE_ROOT, session.config.getoption("--trace-retention"))
+    spans = [span for run in runs for span in load_spans(run)]
+    page_loads = page_load_summary(spans)
+    if page_loads:
+        postfix.append(render_page_loads_html(page_loads))
+
+
+def pytest_generate_tests(metafunc):
+    """Parametrize tests taking a plan_case argument with their rows of the test plan."""
+    if "plan_case" not in metafunc.fixturenames:
+        return
+    marker = metafunc.definition.get_closest_marker("test_plan")
+    if marker:
+        case_prefix = marker.args[0]
+    else:
+        match = re.match(r"test_(tc_\d+)", metafunc.function.__name__)
+        if not match:
+            raise pytest.UsageError(f"{metafunc.function.__name__} needs a test_plan marker to find its cases")
+        case_prefix = match.group(1).upper()
+
+    cases = cases_for(load_test_plan(TEST_PLAN_FILE, TEST_PLAN_SHEET), case_prefix)
+    if not cases:
+        raise pytest.UsageError(f"No rows for {case_prefix} in {TEST_PLAN_FILE}")
+    metafunc.parametrize("plan_case", cases, ids=[case.case_id for case in cases])
+
+
+@pytest.fixture(scope="session")
+def result_recorder():
+    """Open the test plan workbook once per session for reading results."""
+    recorder = ExcelResultRecorder(TEST_PLAN_FILE)
+    yield recorder
+    recorder.close()
+
+
+@pytest.fixture(scope="session")
+def result_journal(result_recorder):
+    """Give this worker its own append-only result journal; the journals are merged at session finish."""
+    journal = ResultJournal(os.path.join(JOURNAL_ROOT, run_id()), reader=result_recorder)
+    yield journal
+    journal.close()
+
+
+@tracer.traced("browser", "create_driver")
+def create_driver(profile):
+    """Start a new Chrome browser with the given BrowserProfile, with its commands timed by the tracer."""
+    return profile.launch(lambda options: tracer.instrument_driver(webdriver.Chrome(options=options)))
+
+
+@pytest.fixture(scope="session")
+def browser_profile(request):
+    """Return the BrowserProfile selected with ``--browser-profile``."""
+    return get_profile(request.config.getoption("--browser-profile"))
+
+
+@pytest.fixture(scope="session")
+def base_url(request):
+    """Return the base URL of the application, starting the offline fixture server for ``--app-url local``."""
+    app_url = request.config.getoption("--app-url")
+    if app_url != "local":
+        yield app_url.rstrip("/")
+        return
+    with FixtureServer() as server:
+        yield server.base_url
+
+
+@pytest.fixture(scope="session")
+def login_url(base_url):
+    """Return the URL of the login page every test starts on."""
+    return base_url + LOGIN_PATH
+
+
+@pytest.fixture(scope="session")
+def driver_pool(request, login_url, browser_profile):
+    """Keep warm browsers alive for the whole session (or worker) and quit them at the end."""
+    size = request.config.getoption("--driver-pool-size")
+    with DriverPool(lambda: create_driver(browser_profile), login_url, size=size) as pool:
+        yield pool
+
+
+@pytest.fixture
+def driver(request, driver_pool, login_url, browser_profile):
+    """Provide a browser on the login page with clean cookies and storage.
+
+    Tests marked with ``@pytest.mark.fresh_driver`` get a new browser that is quit afterwards, as do tests marked
+    with ``@pytest.mark.browser_profile(name)`` for a profile other than the run's.
+    """
+    profile_marker = request.node.get_closest_marker("browser_profile")
+    profile = get_profile(profile_marker.args[0]) if profile_marker else browser_profile
+    if request.node.get_closest_marker("fresh_driver") or profile is not browser_profile:
+        fresh = create_driver(profile)
+        fresh.get(login_url)
+        yield fresh
+        fresh.quit()
+        return
+
+    pooled = driver_pool.acquire()
+    yield pooled
+    driver_pool.release(pooled)
+
+
+@pytest.fixture(scope="session")
+def session_cache(request, base_url):
+    """Cache authenticated sessions per user for the whole session (or worker)."""
+    return LoginSessionCache(base_url, ttl=request.config.getoption("--session-ttl"))
@@ -0,0 +1,49 @@
+"""
+test/test_benchmarks.py
+
+Unit tests for the baseline handling of benchmarks/run_benchmarks.py; the benchmarks themselves are run on demand.
+"""
+import json
+
+from benchmarks import run_benchmarks
+from benchmarks.run_benchmarks import Benchmark, Result, compare, load_baseline, machine_mismatch, measure, \
+    save_baseline
+
+
+def test_compare_flags_only_slowdowns_past_the_threshold():
+    baseline = {"fast": {"median": 1.0}, "slow": {"median": 1.0}, "faster": {"median": 1.0}}
+    results = [Result("fast", 1.2, 1.1, 5), Result("slow", 1.3, 1.2, 5), Result("faster", 0.5, 0.4, 5),
+               Result("new", 9.0, 9.0, 5)]
+
+    comparisons = {comparison.name: comparison for comparison in compare(results, baseline, threshold=0.25)}
+
+    assert sorted(comparisons) == ["fast", "faster", "slow"]
+    assert [name for name, comparison in comparisons.items() if comparison.regressed] == ["slow"]
+
+
+def test_save_baseline_keeps_benchmarks_that_were_not_run(tmp_path):
+    path = tmp_path / "baseline.json"
+    save_baseline([Result("a", 1.0, 0.9, 5), Result("b", 2.0, 1.9, 5)], path)
+    save_baseline([measure(Benchmark("a", lambda: None, 10, 3))], path)
+
+    baseline = load_baseline(path)
+    assert sorted(baseline) == ["a", "b"]
+    assert baseline["a"]["median"] < 1.0 and baseline["b"]["median"] == 2.0
+
+
+def test_a_baseline_from_another_machine_is_reported(tmp_path):
+    path = tmp_path / "baseline.json"
+    save_baseline([Result("a", 1.0, 0.9, 5)], path)
+    assert machine_mismatch(path) == {}
+
+    data = json.loads(path.read_text())
+    data["machine"]["processor"] = "arm64-elsewhere"
+    path.write_text(json.dumps(data))
+    assert machine_mismatch(path)["processor"][0] == "arm64-elsewhere"
+
+
+def test_workbooks_are_only_built_for_selected_benchmarks(tmp_path, monkeypatch):
+    built = []
+    monkeypatch.setattr(run_benchmarks, "build_workbook", lambda path, rows: built.append(rows))
+    assert list(run_benchmarks.excel_benchmarks(str(tmp_path), [1000, 100000], "locator")) == []
+    assert built == []
@@ -0,0 +1,74 @@
+"""
+test/test_browser_profiles.py
+
+Unit tests for utils/browser_profiles.py, using a stand-in driver instead of a real browser.
+"""
+import pytest
+from utils.browser_profiles import BrowserProfile, get_profile, page_load_summary
+from utils.timing import prune_runs, recent_runs
+
+
+class StubDriver:
+    def __init__(self):
+        self.commands = []
+
+    def maximize_window(self):
+        self.commands.append(("maximize_window",))
+
+    def set_window_size(self, width, height):
+        self.commands.append(("set_window_size", width, height))
+
+    def execute_cdp_cmd(self, command, params):
+        self.commands.append((command, params))
+
+    def get(self, url):
+        self.commands.append(("get", url))
+
+
+def test_lean_profile_options_and_runtime_settings():
+    profile = get_profile("lean")
+    capabilities = profile.chrome_options().to_capabilities()
+    assert capabilities["pageLoadStrategy"] == "eager"
+    assert "--headless=new" in capabilities["goog:chromeOptions"]["args"]
+    assert "--disable-background-networking" in capabilities["goog:chromeOptions"]["args"]
+
+    driver = profile.apply(StubDriver())
+    driver.get("http://hrm.local/")
+    assert driver.commands[0] == ("set_window_size", 1366, 768)
+    assert driver.commands[1] == ("Network.enable", {})
+    assert driver.commands[2][0] == "Network.setBlockedURLs" and "*.woff2" in driver.commands[2][1]["urls"]
+    assert driver.commands[3] == ("get", "http://hrm.local/")
+
+
+def test_default_profile_maximizes_and_blocks_nothing():
+    driver = get_profile("default").apply(StubDriver())
+    assert driver.commands == [("maximize_window",)]
+
+
+def test_unknown_profile_or_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        get_profile("turbo")
+    with pytest.raises(ValueError):
+        BrowserProfile("bad", page_load_strategy="lazy")
+
+
+def test_page_load_summary_reports_savings_against_default():
+    spans = [{"category": "page-load", "name": "default", "duration": duration} for duration in (2.0, 3.0, 4.0)]
+    spans += [{"category": "page-load", "name": "lean", "duration": duration} for duration in (1.0, 1.0)]
+    spans.append({"category": "webdriver", "name": "get", "duration": 9.0})
+
+    rows = {row["profile"]: row for row in page_load_summary(spans)}
+    assert rows["default"]["median"] == 3.0 and rows["default"]["saved"] == 0.0
+    assert rows["lean"]["count"] == 2 and rows["lean"]["saved"] == 2.0
+
+
+def test_only_the_traces_of_the_newest_runs_are_compared_and_kept(tmp_path):
+    for run in ("20241101_182052_1", "20241102_090000_7", "20241103_120000_3"):
+        (tmp_path / run).mkdir()
+        (tmp_path / run / "trace-main.json").write_text('{"spans": []}')
+
+    assert [path.rsplit("/", 1)[-1] for path in recent_runs(str(tmp_path), 2)] == \
+        ["20241102_090000_7", "20241103_120000_3"]
+    prune_runs(str(tmp_path), 2)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["20241102_090000_7", "20241103_120000_3"]
+    assert recent_runs(str(tmp_path / "missing"), 2) == []
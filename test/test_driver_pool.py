@@ -0,0 +1,75 @@
+"""
+test/test_driver_pool.py
+
+Unit tests for utils/driver_pool.py, using stand-in drivers instead of a real browser.
+"""
+import queue
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+from utils.driver_pool import RESET_STORAGE_SCRIPT, DriverPool
+
+
+class StubDriver:
+    def __init__(self):
+        self.calls = []
+        self.broken = False
+
+    def _call(self, *call):
+        if self.broken:
+            raise WebDriverException("session deleted")
+        self.calls.append(call)
+
+    def get(self, url):
+        self._call("get", url)
+
+    def delete_all_cookies(self):
+        self._call("delete_all_cookies")
+
+    def execute_script(self, script):
+        self._call("execute_script", script)
+
+    def quit(self):
+        self.calls.append(("quit",))
+
+
+def test_pool_reuses_and_resets_drivers():
+    pool = DriverPool(StubDriver, "http://hrm/login")
+    first = pool.acquire()
+    assert first.calls == [("get", "http://hrm/login")]
+    pool.release(first)
+
+    second = pool.acquire()
+    assert second is first
+    assert first.calls[1:] == [
+        ("delete_all_cookies",),
+        ("execute_script", RESET_STORAGE_SCRIPT),
+        ("get", "http://hrm/login"),
+    ]
+
+
+def test_pool_grows_up_to_its_size():
+    pool = DriverPool(StubDriver, "http://hrm/login", size=2)
+    first, second = pool.acquire(), pool.acquire()
+    assert first is not second
+    with pytest.raises(queue.Empty):
+        pool.acquire(timeout=0.01)
+
+
+def test_pool_recycles_unhealthy_drivers():
+    pool = DriverPool(StubDriver, "http://hrm/login")
+    driver = pool.acquire()
+    pool.release(driver)
+    driver.broken = True
+
+    replacement = pool.acquire()
+    assert replacement is not driver
+    assert driver.calls[-1] == ("quit",)
+
+    pool.close()
+    assert replacement.calls[-1] == ("quit",)
+
+
+def test_pool_size_must_be_positive():
+    with pytest.raises(ValueError):
+        DriverPool(StubDriver, "http://hrm/login", size=0)
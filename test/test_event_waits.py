@@ -0,0 +1,82 @@
+"""
+test/test_event_waits.py
+
+Unit tests for the event-driven waits of utils/event_waits.py and their polling fallback in WaitPolicy, using
+stand-in drivers instead of a real browser.
+"""
+import pytest
+from selenium.common.exceptions import JavascriptException, TimeoutException
+from selenium.webdriver.common.by import By
+from utils.event_waits import WAIT_FOR_CONDITION_SCRIPT
+from utils.wait_policy import WaitPolicy
+
+LOCATOR = (By.CSS_SELECTOR, "button[type='submit']")
+
+
+class ScriptedDriver:
+    """Answers each execute_async_script call with the next scripted outcome: a value or an exception."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def execute_async_script(self, script, *args):
+        assert script == WAIT_FOR_CONDITION_SCRIPT
+        self.calls.append(args)
+        outcome = self.outcomes.pop(0) if self.outcomes else None
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def test_event_wait_returns_the_element_with_one_script_call():
+    driver = ScriptedDriver("element")
+    policy = WaitPolicy(timeout=1)
+    assert policy.wait_for(driver, "clickable", LOCATOR, lambda d: pytest.fail("polled"), 1) == "element"
+    assert len(driver.calls) == 1 and driver.calls[0][:3] == ("clickable", "css", "button[type='submit']")
+    assert 900 < driver.calls[0][3] <= 1000
+
+
+def test_event_wait_subscribes_again_after_a_page_load():
+    unloaded = JavascriptException("javascript error: document unloaded while waiting for result")
+    driver = ScriptedDriver(unloaded, True)
+    assert WaitPolicy().wait_for(driver, "url", "/dashboard", lambda d: pytest.fail("polled"), 1) is True
+    assert len(driver.calls) == 2
+
+
+def test_event_wait_times_out_when_the_condition_never_holds():
+    driver = ScriptedDriver()
+    with pytest.raises(TimeoutException, match="never"):
+        WaitPolicy().wait_for(driver, "presence", LOCATOR, lambda d: False, 0, "never")
+    assert driver.calls[0][3] == 0
+
+
+def test_drivers_without_the_script_fall_back_to_polling():
+    driver = ScriptedDriver(JavascriptException("ReferenceError: MutationObserver is not defined"))
+    polled = []
+    condition = lambda d: polled.append(d) or len(polled) > 1
+    assert WaitPolicy(timeout=1, initial_poll=0.01).wait_for(driver, "visible", LOCATOR, condition, 1) is True
+    assert len(polled) == 2
+
+    # The driver is remembered as unsupported, so later waits poll straight away
+    WaitPolicy().wait_for(driver, "visible", LOCATOR, lambda d: True, 1)
+    assert len(driver.calls) == 1
+
+
+def test_script_errors_are_raised_without_giving_up_on_event_waits():
+    driver = ScriptedDriver(JavascriptException("SyntaxError: 'button[' is not a valid selector"), "element")
+    with pytest.raises(JavascriptException, match="valid selector"):
+        WaitPolicy().wait_for(driver, "visible", LOCATOR, lambda d: pytest.fail("polled"), 1)
+
+    # The next wait still runs in the browser
+    assert WaitPolicy().wait_for(driver, "visible", LOCATOR, lambda d: pytest.fail("polled"), 1) == "element"
+    assert not getattr(driver, "_event_waits_unsupported", False)
+
+
+def test_poll_backend_and_unsupported_locators_never_run_the_script():
+    driver = ScriptedDriver()
+    assert WaitPolicy(backend="poll").wait_for(driver, "visible", LOCATOR, lambda d: "polled", 1) == "polled"
+    assert WaitPolicy().wait_for(driver, "visible", (By.LINK_TEXT, "Admin"), lambda d: "polled", 1) == "polled"
+    assert driver.calls == []
+    with pytest.raises(ValueError):
+        WaitPolicy(backend="push")
@@ -0,0 +1,109 @@
+"""
+test/test_excel_functions.py
+
+Unit tests for the Excel helpers in utils/excel_functions.py. They run against a temporary workbook
+and need no browser.
+"""
+import os
+
+import pytest
+from openpyxl import Workbook, load_workbook
+from utils.excel_functions import ExcelFunctions, ExcelResultRecorder
+
+
+@pytest.fixture
+def workbook_file(tmp_path):
+    """Create a small two-sheet workbook shaped like data/test_plan.xlsx."""
+    path = tmp_path / "plan.xlsx"
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Sheet1"
+    sheet.append(["Test_case", "Tested by", "Scenario", "Type", "Expected", "Result"])
+    for index in range(1, 6):
+        sheet.append([f"TC_{index:02d}", "Tester", "Scenario", "Positive", "Expected", None])
+    workbook.create_sheet("Sheet2")["A1"] = "other"
+    workbook.save(path)
+    return str(path)
+
+
+def test_recorder_buffers_writes_until_flush(workbook_file):
+    recorder = ExcelResultRecorder(workbook_file)
+    recorder.write_data("Sheet1", 2, 6, "Pass")
+    recorder.write_data("Sheet2", 1, 2, "Fail")
+
+    # Buffered writes are visible through the recorder but not on disk yet
+    assert recorder.read_data("Sheet1", 2, 6) == "Pass"
+    assert load_workbook(workbook_file)["Sheet1"].cell(row=2, column=6).value is None
+    assert recorder.pending_count() == 2
+
+    recorder.flush()
+    workbook = load_workbook(workbook_file)
+    assert workbook["Sheet1"].cell(row=2, column=6).value == "Pass"
+    assert workbook["Sheet2"].cell(row=1, column=2).value == "Fail"
+    assert recorder.pending_count() == 0
+
+
+def test_recorder_read_cache_is_invalidated_by_mtime(workbook_file):
+    recorder = ExcelResultRecorder(workbook_file)
+    assert recorder.read_data("Sheet1", 2, 1) == "TC_01"
+
+    workbook = load_workbook(workbook_file)
+    workbook["Sheet1"].cell(row=2, column=1).value = "TC_99"
+    workbook.save(workbook_file)
+    stat = os.stat(workbook_file)
+    os.utime(workbook_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert recorder.read_data("Sheet1", 2, 1) == "TC_99"
+
+
+def test_recorder_flush_keeps_other_cells_and_leaves_no_temp_files(workbook_file):
+    with ExcelResultRecorder(workbook_file) as recorder:
+        for row in range(2, 7):
+            recorder.write_data("Sheet1", row, 6, "Pass")
+
+    sheet = load_workbook(workbook_file)["Sheet1"]
+    assert [sheet.cell(row=row, column=6).value for row in range(2, 7)] == ["Pass"] * 5
+    assert sheet.cell(row=3, column=1).value == "TC_02"
+    assert os.listdir(os.path.dirname(workbook_file)) == ["plan.xlsx"]
+
+
+def test_recorder_flush_keeps_the_file_mode(workbook_file):
+    os.chmod(workbook_file, 0o644)
+    with ExcelResultRecorder(workbook_file) as recorder:
+        recorder.write_data("Sheet1", 2, 6, "Pass")
+    assert os.stat(workbook_file).st_mode & 0o777 == 0o644
+
+
+def test_excel_functions_routes_through_recorder(workbook_file):
+    recorder = ExcelResultRecorder(workbook_file)
+    excel = ExcelFunctions(workbook_file, "Sheet1", recorder=recorder)
+    excel.write_data(4, 6, "Fail")
+
+    assert excel.read_data(4, 6) == "Fail"
+    assert ExcelFunctions(workbook_file, "Sheet1").read_data(4, 6) is None
+    recorder.close()
+    assert ExcelFunctions(workbook_file, "Sheet1").read_data(4, 6) == "Fail"
+
+
+def test_test_plan_cases_are_cached_until_the_cases_change(tmp_path, monkeypatch):
+    from utils import test_plan
+
+    workbook_file = tmp_path / "plan.xlsx"
+    workbook = Workbook()
+    workbook.active.title = "Sheet1"
+    workbook.active.append(["Test_case", "Tested by", "Scenario", "Type", "Expected", "Result", "Test data"])
+    workbook.active.append(["TC_01", "Tester", "Scenario", "Positive", "Expected", None, '{"username": "Admin"}'])
+    workbook.active.append([None] * 7)
+    workbook.active.append(["TC_01.2", "Tester", "Scenario", "Negative", "Expected", None, None])
+    workbook.save(workbook_file)
+
+    cases = test_plan.load_test_plan(str(workbook_file))
+    assert [(case.case_id, case.row, case.result_column) for case in cases] == [("TC_01", 2, 6), ("TC_01.2", 4, 6)]
+    assert cases[0].data == {"username": "Admin"}
+    assert test_plan.cases_for(cases, "TC_01") == cases
+
+    # Recording a result and restamping keeps the cache valid, so the workbook is not parsed again
+    ExcelFunctions(str(workbook_file), "Sheet1").write_result(cases[0], "Pass")
+    test_plan.restamp_cache(str(workbook_file))
+    monkeypatch.setattr(test_plan, "iter_plan_cases", lambda *args: pytest.fail("the workbook was parsed again"))
+    assert test_plan.load_test_plan(str(workbook_file)) == cases
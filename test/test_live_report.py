@@ -0,0 +1,115 @@
+"""
+test/test_live_report.py
+
+Unit tests for the streamed HTML report in utils/live_report.py.
+"""
+import zipfile
+
+import pytest
+from PIL import Image
+from utils.live_report import MANIFEST, LiveReport
+
+
+@pytest.fixture
+def screenshot(tmp_path):
+    path = tmp_path / "shots" / "TC_03_cliked cancel_20241101_182112.png"
+    path.parent.mkdir()
+    Image.new("RGB", (64, 40), "white").save(path)
+    return str(path)
+
+
+@pytest.fixture
+def report(tmp_path):
+    report = LiveReport(str(tmp_path / "live"), title="Run <1>")
+    report.open(run="1")
+    yield report
+    report.close()
+
+
+def read(path):
+    with open(path, encoding="utf-8") as report_file:
+        return report_file.read()
+
+
+def test_rows_are_written_as_tests_finish(report, screenshot, tmp_path):
+    report.add("test_a[TC_03]", "passed", 1.234, screenshots=[screenshot, str(tmp_path / "removed.png")])
+    report.add("test_b", "failed", 0.5, message="assert 'Required' == '<missing>'",
+               retries=[{"step": "AdminPage.navigate_to_admin", "attempt": 1, "error": "NavigationTimeout: slow"}])
+
+    # Readable before the run ends
+    streamed = read(report.index)
+    assert streamed.count("<tr class=") == 2
+    assert 'href="screenshots/TC_03_cliked%20cancel_20241101_182112.png"' in streamed
+    assert "&#x27;&lt;missing&gt;&#x27;" in streamed and "Run &lt;1&gt;" in streamed
+    assert "Retried AdminPage.navigate_to_admin (attempt 2)" in streamed
+    assert "base64" not in streamed
+
+    report.close()
+    finished = read(report.index)
+    assert "1 passed, 1 failed, 0 skipped" in finished and finished.endswith("</html>\n")
+    shot = tmp_path / "live" / "screenshots" / "TC_03_cliked cancel_20241101_182112.png"
+    assert shot.read_bytes() == open(screenshot, "rb").read()
+
+
+def test_screenshots_still_being_written_are_copied_once_they_exist(report, tmp_path):
+    queued = tmp_path / "shots" / "TC_01_empty_username.png"
+    report.add("test_a", "passed", 0.1, screenshots=[str(queued), str(tmp_path / "removed.png")])
+    # Linked right away, so adding the row does not wait for the screenshot writes
+    assert 'href="screenshots/TC_01_empty_username.png"' in read(report.index)
+
+    queued.parent.mkdir()
+    Image.new("RGB", (64, 40), "white").save(queued)
+    report.close()
+    assert (tmp_path / "live" / "screenshots" / "TC_01_empty_username.png").exists()
+    assert (tmp_path / "live" / "thumbnails" / "TC_01_empty_username.jpg").exists()
+    with zipfile.ZipFile(report.archive()) as archive:
+        assert not any("removed" in name for name in archive.namelist())
+
+
+def test_archive_packs_the_report_into_one_file(report, screenshot):
+    report.add("test_a", "passed", 0.1, screenshots=[screenshot])
+    report.close()
+
+    with zipfile.ZipFile(report.archive()) as archive:
+        names = archive.namelist()
+        assert "index.html" in names
+        assert "screenshots/TC_03_cliked cancel_20241101_182112.png" in names
+        assert "thumbnails/TC_03_cliked cancel_20241101_182112.jpg" in names
+        assert MANIFEST not in names
+        assert archive.getinfo("index.html").compress_type == zipfile.ZIP_DEFLATED
+
+
+def test_thumbnails_are_generated(tmp_path):
+    source = tmp_path / "TC_06.png"
+    Image.new("RGB", (1920, 1080), "white").save(source)
+
+    report = LiveReport(str(tmp_path / "live"))
+    report.open()
+    report.add("test_tc_06", "passed", 0.1, screenshots=[str(source)])
+    report.close()
+
+    assert 'src="thumbnails/TC_06.jpg"' in read(report.index)
+    with Image.open(tmp_path / "live" / "thumbnails" / "TC_06.jpg") as thumbnail:
+        assert thumbnail.size == (320, 180)
+
+
+def test_only_the_files_of_an_earlier_report_are_replaced(tmp_path, screenshot):
+    directory = tmp_path / "reports"
+    directory.mkdir()
+    (directory / "report.html").write_text("pytest-html")
+    with pytest.raises(FileExistsError):
+        LiveReport(str(directory)).open()
+    assert (directory / "report.html").read_text() == "pytest-html"
+
+    report = LiveReport(str(tmp_path / "live"))
+    report.open()
+    report.add("test_a", "passed", 0.1, screenshots=[screenshot])
+    report.close()
+    (tmp_path / "live" / "notes.txt").write_text("mine")
+
+    report = LiveReport(str(tmp_path / "live"))
+    report.open()
+    report.close()
+    assert sorted(path.name for path in (tmp_path / "live").rglob("*")) == [
+        MANIFEST, "index.html", "notes.txt", "screenshots", "thumbnails",
+    ]
@@ -0,0 +1,43 @@
+"""
+test/test_locator_registry.py
+
+Offline checks of the locators in locators/locators_test.py against the fixture pages, and unit tests for the
+XPath to CSS translation of locators/registry.py.
+"""
+import pytest
+from locators.locators_test import AdminPageLocators
+from locators.registry import LocatorRegistry, problems, xpath_literal, xpath_to_css
+from selenium.webdriver.common.by import By
+from utils.fake_driver import page_states
+
+
+def test_every_locator_matches_one_element_and_its_css_form_is_equivalent():
+    snapshots = {name: driver.page_source for name, driver in page_states().items()}
+    reports = LocatorRegistry().validate(snapshots, rounds=1)
+
+    assert reports
+    assert problems(reports) == []
+
+
+@pytest.mark.parametrize("xpath, css", [
+    ("//input[@placeholder='Username']", "input[placeholder='Username']"),
+    ("//button[contains(@class, 'reset')]", "button[class*='reset']"),
+    ("//nav[@role='navigation' and @aria-label]//ul/li", "nav[role='navigation'][aria-label] ul > li"),
+    ("//*[@id='app']", "[id='app']"),
+    ("//button[normalize-space()='Login']", None),
+    ("//span[text()='Admin']", None),
+    ("//ul/li[9]", None),
+    ("/html/body/div", None),
+])
+def test_xpath_to_css(xpath, css):
+    assert xpath_to_css(xpath) == css
+
+
+def test_templates_quote_values_and_reuse_built_locators():
+    assert xpath_literal("Leave") == "'Leave'"
+    assert xpath_literal("Employee's") == '"Employee\'s"'
+    assert xpath_literal("""a'b"c""") == """concat('a', "'", 'b"c')"""
+
+    locator = AdminPageLocators.TOP_MENU_OPTION("Leave")
+    assert locator == (By.XPATH, "//nav[@aria-label='Topbar Menu']//li[normalize-space()='Leave']")
+    assert AdminPageLocators.TOP_MENU_OPTION("Leave") is locator
@@ -2,49 +2,46 @@
 test/test_main.py
 """
 import pytest
-from selenium import webdriver
+from locators.locators_test import AdminPageLocators
 from pages.login_page import LoginPage
 from pages.forgot_password_page import ForgotPasswordPage
 from pages.admin_page import AdminPage
 from selenium.webdriver.common.by import By  # Import By
 from utils.excel_functions import ExcelFunctions
-from datetime import datetime
-import os
+from utils.screenshots import screenshot_service
+from utils.timing import tracer
+@tracer.traced("screenshot")
 def capture_screenshot(driver, prefix):
-    """Captures a screenshot with a timestamp."""
-    screenshot_dir = "screenshots"
-    os.makedirs(screenshot_dir, exist_ok=True)  # Create screenshots directory if it doesn't exist
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')  # Generate a timestamp for uniqueness
-    screenshot_path = os.path.join(screenshot_dir, f"{prefix}_{timestamp}.png")  # Define screenshot path
-    driver.save_screenshot(screenshot_path)  # Save screenshot
-    print(f"Screenshot saved at: {screenshot_path}")  # Log the screenshot path
+    """Captures a screenshot with a timestamp; it is written in the background, subject to the screenshot policy."""
+    screenshot_path = screenshot_service.capture(driver, prefix)
+    if screenshot_path:
+        print(f"Screenshot queued at: {screenshot_path}")  # Log the screenshot path
 
 class TestOrangeHRM:
     @pytest.fixture(autouse=True)
-    def setup_teardown(self):
-        # Initialize the WebDriver
-        self.driver = webdriver.Chrome()
-        self.driver.maximize_window()  # Open the browser in full window mode
-        self.driver.get("https://opensource-demo.orangehrmlive.com/web/index.php/auth/login")
+    def setup_teardown(self, request, driver, login_url, result_journal, session_cache):
+        # Use a warm browser from the pool, already on the login page with a clean state
+        self.driver = driver
+        self.login_url = login_url
 
         # Initialize page objects and other dependencies
-        self.login_page = LoginPage(self.driver)
+        self.login_page = LoginPage(self.driver, session_cache=session_cache)
         self.forgot_password_page = ForgotPasswordPage(self.driver)
         self.admin_page = AdminPage(self.driver)
-        self.excel = ExcelFunctions("data/test_plan.xlsx", "Sheet1")
+        self.excel = ExcelFunctions("data/test_plan.xlsx", "Sheet1", recorder=result_journal)
+        result_journal.start_test(request.node.nodeid)
 
         yield  # This will run the test
 
-        # Teardown: close the browser after tests
-        self.driver.quit()
-
-    def test_tc_01_empty_username(self):
+    def test_tc_01_empty_username(self, plan_case):
         """Tests the behavior when attempting to reset password with an empty username."""
 
         # Click on Forgot Password link
         self.login_page.click_forgot_password()
 
         # Click on Reset button without entering username
+        if plan_case.data.get("username"):
+            self.forgot_password_page.enter_username(plan_case.data["username"])
         self.forgot_password_page.click_reset()
 
         # Verify "Required" error message
@@ -53,30 +50,29 @@ class TestOrangeHRM:
 
         # Take screenshot if test fails
         if error_message != "Required":
-            self.excel.write_data(2, 6, "Fail")
+            self.excel.write_result(plan_case, "Fail")
         else:
-            capture_screenshot(self.driver, "TC_01_empty_username")
-            self.excel.write_data(2, 6, "Pass")
+            capture_screenshot(self.driver, f"{plan_case.case_id}_empty_username")
+            self.excel.write_result(plan_case, "Pass")
 
-    def test_tc_02_valid_username(self):
+    def test_tc_02_valid_username(self, plan_case):
         """Tests the behavior when a valid username is provided for password reset."""
 
         # Click on Forgot Password link
         self.login_page.click_forgot_password()
 
         # Enter valid username and click Reset button
-        self.forgot_password_page.enter_username("Admin")
-        self.forgot_password_page.click_reset()
+        self.forgot_password_page.request_reset(plan_case.data["username"])
 
         # Verify success message
         success_message = self.forgot_password_page.get_success_message()
         assert success_message == "Reset Password link sent successfully"
-        capture_screenshot(self.driver, "TC_02_valid_username")
+        capture_screenshot(self.driver, f"{plan_case.case_id}_valid_username")
 
         # Record test result
-        self.excel.write_data(3, 6, "Pass" if success_message == "Reset Password link sent successfully" else "Fail")
+        self.excel.write_result(plan_case, "Pass" if success_message == "Reset Password link sent successfully" else "Fail")
 
-    def test_tc_03_cancel_button(self):
+    def test_tc_03_cancel_button(self, plan_case):
         """Tests the cancel functionality in the forgot password workflow."""
 
         # Click on Forgot Password link
@@ -84,171 +80,132 @@ class TestOrangeHRM:
 
         # Click on Cancel button
         self.forgot_password_page.click_cancel()
-        capture_screenshot(self.driver, "TC_03_cliked cancel")
+        capture_screenshot(self.driver, f"{plan_case.case_id}_cliked cancel")
 
-        # Verify redirection to the main login page
-        assert self.driver.current_url == "https://opensource-demo.orangehrmlive.com/web/index.php/auth/login"
-        self.excel.write_data(4, 6,
-                              "Pass" if self.driver.current_url == "https://opensource-demo.orangehrmlive.com/web/index.php/auth/login" else "Fail")
+        # Verify redirection to the main login page, once the navigation has been committed: with the "none"
+        # page load strategy of the minimal browser profile the URL can still be the previous page's
+        self.login_page.wait_for_url_contains("/auth/login")
+        assert self.driver.current_url == self.login_url
+        self.excel.write_result(plan_case, "Pass" if self.driver.current_url == self.login_url else "Fail")
 
-    def test_tc_04_validate_admin_title_positive(self):
+    def test_tc_04_validate_admin_title_positive(self, plan_case):
         """Tests if the title of the Admin page is correct upon login."""
 
         # Login with valid credentials and navigate to Admin module
-        self.login_page.login("Admin", "admin123")
+        self.login_page.ensure_logged_in(plan_case.data["username"], plan_case.data["password"])
         self.admin_page.navigate_to_admin()
         actual_title = self.admin_page.get_title()
-        expected_title = "OrangeHRM"
+        expected_title = plan_case.data["expected_title"]
 
         # Validate and record the result
         if actual_title == expected_title:
-            self.excel.write_data(5, 6, "Pass")
+            self.excel.write_result(plan_case, "Pass")
         else:
-            capture_screenshot(self.driver, "TC_04_valid_title")
-            self.excel.write_data(5, 6, "Fail")
+            capture_screenshot(self.driver, f"{plan_case.case_id}_valid_title")
+            self.excel.write_result(plan_case, "Fail")
         assert actual_title == expected_title
 
-    def test_tc_05_validate_admin_title_negative(self):
+    def test_tc_05_validate_admin_title_negative(self, plan_case):
         """Tests that the Admin page title does not match an incorrect value."""
 
         # Login with valid credentials and navigate to Admin module
-        self.login_page.login("Admin", "admin123")
+        self.login_page.ensure_logged_in(plan_case.data["username"], plan_case.data["password"])
         self.admin_page.navigate_to_admin()
         actual_title = self.admin_page.get_title()
-        expected_title = "orangehrm"  # Incorrect title for negative test
+        expected_title = plan_case.data["unexpected_title"]  # Incorrect title for negative test
 
         # Validate and record the result
         if actual_title != expected_title:
-            self.excel.write_data(6, 6, "Pass")
+            self.excel.write_result(plan_case, "Pass")
         else:
-            capture_screenshot(self.driver, "TC_05_invalid_title")
-            self.excel.write_data(6, 6, "Fail")
+            capture_screenshot(self.driver, f"{plan_case.case_id}_invalid_title")
+            self.excel.write_result(plan_case, "Fail")
         assert actual_title != expected_title
 
-    def test_tc_06_validate_visible_options(self):
+    def test_tc_06_validate_visible_options(self, plan_case):
         """Verifies that all expected options are visible in the Admin module."""
 
-        self.login_page.login("Admin", "admin123")
+        self.login_page.ensure_logged_in(plan_case.data["username"], plan_case.data["password"])
         self.admin_page.navigate_to_admin()
 
-        # List of expected visible options
-        expected_options = [
-            "User Management",
-            "Job",
-            "Organization",
-            "Qualifications",
-            "Nationalities",
-            "Corporate Branding",
-            "Configuration"
-        ]
-
-        actual_options = []
-
-        # Loop through each expected option and use explicit waits to check visibility
-        for option in expected_options:
-            # Define an XPath for each expected option
-            option_xpath = f"//nav/ul/li[span[contains(text(), '{option}')]] | //nav/ul/li[a[contains(text(), '{option}')]]"
-
-            # Use get_element_text to fetch the text if the element is visible
-            option_text = self.admin_page.get_element_text(option_xpath)
-            if option_text:  # Only add to the list if text is found
-                actual_options.append(option_text.strip())
+        # List of expected visible options, from the test plan
+        expected_options = plan_case.data["expected_options"]
+
+        # Read the visible top menu items once and compare them with the expected options
+        actual_options = self.admin_page.get_visible_options(expected_options, selector="nav > ul > li").visible
 
         print("Actual options:", actual_options)  # Debugging output
         print("Expected options:", expected_options)  # Debugging output
         if actual_options == expected_options:
-            self.excel.write_data(7, 6, "Pass")  # Update row 5, column 6 for test case 6
+            self.excel.write_result(plan_case, "Pass")
 
         else:
-            self.excel.write_data(7, 6, "Fail")  # Update row 5, column 6 for test case 6
+            self.excel.write_result(plan_case, "Fail")
             assert actual_options == expected_options, f"Expected options '{expected_options}' but found '{actual_options}'"
         # Check if the actual options match the expected options
-        capture_screenshot(self.driver, "TC_06_admin menu_options")
+        capture_screenshot(self.driver, f"{plan_case.case_id}_admin menu_options")
         assert actual_options == expected_options, f"Expected options '{expected_options}' but found '{actual_options}'"
 
-    def test_tc_07_validate_leave_option(self):
+    def test_tc_07_validate_leave_option(self, plan_case, record_property):
         """Verifies that the Leave option is not visible in the Admin module."""
 
-        self.login_page.login("Admin", "admin123")
+        self.login_page.ensure_logged_in(plan_case.data["username"], plan_case.data["password"])
         self.admin_page.navigate_to_admin()
-        # Check that the "Leave" option is not visible
-        leave_xpath = "/html/body/div/div/div/header/div[2]/nav/ul/li[9]/span"  # Adjust the index if needed
-        leave_visible = self.admin_page.get_element_text(leave_xpath)
-        if not leave_visible:
-            self.excel.write_data(8, 6, "Pass")  # Update row 6, column 6 for test case 7
+        # Check that the "Leave" option is not visible once the page has settled
+        leave_option = AdminPageLocators.TOP_MENU_OPTION(plan_case.data["absent_option"])
+        leave_check = self.admin_page.check_absence(leave_option)
+        record_property("absence_check_seconds", round(leave_check.elapsed, 3))
+        if leave_check.absent:
+            self.excel.write_result(plan_case, "Pass")
         else:
-            self.excel.write_data(8, 6, "Fail")  # Update row 6, column 6 for test case 7
-            capture_screenshot(self.driver, "TC_07_leave_option_visible")
+            self.excel.write_result(plan_case, "Fail")
+            capture_screenshot(self.driver, f"{plan_case.case_id}_leave_option_visible")
 
-        assert not self.admin_page.get_element_text(leave_xpath), "Leave option should not be visible"
+        assert leave_check.absent, f"{plan_case.data['absent_option']} option should not be visible"
 
-    def test_tc_08_validate_visible_options(self):
+    def test_tc_08_validate_visible_options(self, plan_case):
         """Verifies that all expected options are visible in the side menu of the Admin module."""
 
-        self.login_page.login("Admin", "admin123")
+        self.login_page.ensure_logged_in(plan_case.data["username"], plan_case.data["password"])
         self.admin_page.navigate_to_admin()
 
-        # List of expected visible options
-        expected_side_menu = [
-            "Admin",
-            "PIM",
-            "Leave",
-            "Time",
-            "Recruitment",
-            "My Info",
-            "Performance",
-            "Dashboard",
-            "Directory",
-            "Maintenance",
-            "Buzz"
-        ]
+        # List of expected visible options, from the test plan
+        expected_side_menu = plan_case.data["expected_options"]
 
         actual_side_menu = self.admin_page.validate_visible_options(expected_side_menu)
         print("Actual visible options:", actual_side_menu)
 
         # Check if the actual options match the expected options
         if sorted(actual_side_menu) == sorted(expected_side_menu):
-            self.excel.write_data(9, 6, "Pass")
+            self.excel.write_result(plan_case, "Pass")
         else:
-            self.excel.write_data(9, 6, "Fail")
-        capture_screenshot(self.driver, "TC_08_visible_side_menu")
+            self.excel.write_result(plan_case, "Fail")
+        capture_screenshot(self.driver, f"{plan_case.case_id}_visible_side_menu")
         assert sorted(actual_side_menu) == sorted(expected_side_menu), f"Expected options '{expected_side_menu}' but found '{actual_side_menu}'"
 
 
-    def test_tc_09_validate_invisible_options(self):
+    def test_tc_09_validate_invisible_options(self, plan_case):
         """Verifies that a nonexistent option is not visible in the Admin module."""
 
-        self.login_page.login("Admin", "admin123")
+        self.login_page.ensure_logged_in(plan_case.data["username"], plan_case.data["password"])
         self.admin_page.navigate_to_admin()
 
-        # List of expected visible options including an option that should not be visible
-        expected_menu = [
-            "Admin",
-            "PIM",
-            "Leave",
-            "Time",
-            "Recruitment",
-            "My Info",
-            "Performance",
-            "Dashboard",
-            "Directory",
-            "Maintenance",
-            "Buzz",
-            "Nonexistent Option"  # This option does not exist, simulating a negative case
-        ]
+        # List of expected visible options including an option that should not be visible, from the test plan
+        expected_menu = plan_case.data["expected_options"]
+        invisible_option = plan_case.data["invisible_option"]  # This option does not exist, simulating a negative case
 
         # Call the method to validate visible options
         actual_menu = self.admin_page.validate_visible_options(expected_menu)
         print("Actual visible options:", actual_menu)
 
-        # Define the expected negative condition: "Nonexistent Option" should not be in the actual options
-        assert "Nonexistent Option" not in actual_menu, (
-            f"Expected 'Nonexistent Option' to be invisible, but it was found in: {actual_menu}"
+        # Define the expected negative condition: the invisible option should not be in the actual options
+        assert invisible_option not in actual_menu, (
+            f"Expected '{invisible_option}' to be invisible, but it was found in: {actual_menu}"
         )
 
         # Log result in Excel for this negative test case
-        if "Nonexistent Option" not in actual_menu:
-            self.excel.write_data(10, 6, "Pass")  # Update row number accordingly
+        if invisible_option not in actual_menu:
+            self.excel.write_result(plan_case, "Pass")
         else:
-            self.excel.write_data(10, 6, "Fail")
-            capture_screenshot(self.driver, "TC_09_invisible_option")
+            self.excel.write_result(plan_case, "Fail")
+            capture_screenshot(self.driver, f"{plan_case.case_id}_invisible_option")
@@ -0,0 +1,240 @@
+"""
+test/test_page_objects.py
+
+Fast unit tests for the page objects, run against the in-memory FakeDriver and the offline fixture pages
+in data/fixture_site instead of a real browser.
+"""
+import shutil
+import time
+
+import pytest
+from locators.locators_test import LoginPageLocators
+from pages.admin_page import AdminPage
+from pages.base_page import FILL_FORM_SCRIPT
+from pages.forgot_password_page import ForgotPasswordPage
+from pages.login_page import LoginPage
+from selenium.common.exceptions import InvalidSelectorException, StaleElementReferenceException, TimeoutException, \
+    WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.command import Command
+from utils.element_cache import track_navigation
+from utils.excel_functions import ExcelFunctions, ExcelResultRecorder
+from utils.fake_driver import FakeDriver, FakeElement
+from utils.result_journal import ResultJournal, merge_journals
+from utils.session_cache import LOGIN_PATH, LoginSessionCache
+from utils.wait_policy import WaitPolicy
+
+# Waits only run out in negative cases, so keep them short
+FAST_POLICY = WaitPolicy(timeout=0.2, initial_poll=0.01)
+
+TOP_MENU = ["User Management", "Job", "Organization", "Qualifications", "Nationalities", "Corporate Branding",
+            "Configuration"]
+SIDE_MENU = ["Admin", "PIM", "Leave", "Time", "Recruitment", "My Info", "Performance", "Dashboard", "Directory",
+             "Maintenance", "Buzz"]
+
+
+@pytest.fixture
+def driver():
+    driver = FakeDriver()
+    driver.get(LOGIN_PATH)
+    return driver
+
+
+@pytest.fixture
+def login_page(driver):
+    return LoginPage(driver, wait_policy=FAST_POLICY)
+
+
+@pytest.fixture
+def forgot_password_page(driver):
+    return ForgotPasswordPage(driver, wait_policy=FAST_POLICY)
+
+
+@pytest.fixture
+def admin_page(driver, login_page):
+    login_page.login("Admin", "admin123")
+    page = AdminPage(driver, wait_policy=FAST_POLICY)
+    page.navigate_to_admin()
+    return page
+
+
+def test_forgot_password_with_empty_username_shows_required(login_page, forgot_password_page):
+    login_page.click_forgot_password()
+    forgot_password_page.click_reset()
+    assert forgot_password_page.get_required_error_message() == "Required"
+
+
+def test_forgot_password_with_username_shows_success(login_page, forgot_password_page):
+    login_page.click_forgot_password()
+    forgot_password_page.enter_username("Admin")
+    forgot_password_page.click_reset()
+    assert forgot_password_page.get_success_message() == "Reset Password link sent successfully"
+
+
+def test_cancel_returns_to_login_page(driver, login_page, forgot_password_page):
+    login_page.click_forgot_password()
+    forgot_password_page.click_cancel()
+    assert driver.current_url == driver.base_url + LOGIN_PATH
+
+
+def test_admin_page_title_and_menus(admin_page, driver):
+    assert driver.current_url.endswith("/web/index.php/admin/viewSystemUsers")
+    assert admin_page.get_title() == "OrangeHRM"
+    assert admin_page.get_visible_options(TOP_MENU, selector="nav > ul > li").visible == TOP_MENU
+    visibility = admin_page.get_visible_options(SIDE_MENU + ["Nonexistent Option"])
+    assert visibility.visible == SIDE_MENU
+    assert visibility.missing == ["Nonexistent Option"]
+
+
+def test_absence_checks(admin_page):
+    assert admin_page.is_element_absent("/html/body/div/div/div/header/div[2]/nav/ul/li[9]/span")
+    assert admin_page.assert_absent("//span[text()='Leave' and ancestor::header]").settled
+    with pytest.raises(AssertionError):
+        admin_page.assert_absent("//span[text()='Admin']")
+
+
+def test_admin_pages_require_a_session(driver):
+    driver.get("/web/index.php/admin/viewSystemUsers")
+    assert driver.current_url.endswith(LOGIN_PATH)
+    with pytest.raises(TimeoutException):
+        AdminPage(driver, wait_policy=FAST_POLICY).navigate_to_admin()
+
+
+def test_failed_waits_on_the_fake_driver_do_not_sleep(driver):
+    # The in-memory DOM cannot change during a wait, so even a long timeout fails at once
+    started = time.monotonic()
+    with pytest.raises(TimeoutException):
+        WaitPolicy(timeout=10).wait_for(driver, "visible", (By.CSS_SELECTOR, "#missing"), lambda d: False, 10)
+    assert time.monotonic() - started < 1
+
+
+def test_unsupported_locator_strategies_are_invalid_selectors(driver):
+    # Raised as a browser would, so code handling WebDriverException handles it too
+    with pytest.raises(InvalidSelectorException):
+        driver.find_elements(By.LINK_TEXT, "Forgot your password?")
+
+
+def test_get_element_text_logs_a_missing_element(login_page, caplog):
+    assert login_page.get_element_text((By.CSS_SELECTOR, "#missing")) is None
+    assert "No visible element at ('css selector', '#missing')" in caplog.text
+
+
+def test_elements_go_stale_after_navigation(driver, login_page):
+    field = driver.find_element(By.XPATH, "//input[@name='username']")
+    login_page.click_forgot_password()
+    with pytest.raises(StaleElementReferenceException):
+        field.send_keys("Admin")
+
+
+def test_elements_are_reused_on_the_same_page_and_found_again_after_navigation(driver, login_page):
+    login_page.type_text(LoginPageLocators.USERNAME_FIELD, "Ad")
+    login_page.type_text(LoginPageLocators.USERNAME_FIELD, "min")
+    assert login_page.elements.hits == 1
+    assert driver.find_element(By.NAME, "username").get_attribute("value") == "Admin"
+
+    login_page.click_forgot_password()
+    forgot_password_page = ForgotPasswordPage(driver, wait_policy=FAST_POLICY)
+    forgot_password_page.enter_username("Admin")
+    assert forgot_password_page.elements.hits == 0
+
+
+def test_a_stale_cached_element_is_looked_up_again_once(driver, login_page):
+    stale = driver.find_element(By.NAME, "username")
+    driver.refresh()
+    # Simulate a re-render without navigation: the cached element belongs to the current generation but is stale
+    login_page.elements.put(LoginPageLocators.USERNAME_FIELD, "presence", stale)
+    login_page.type_text(LoginPageLocators.USERNAME_FIELD, "Admin")
+    assert driver.find_element(By.NAME, "username").get_attribute("value") == "Admin"
+
+
+def test_fill_form_types_into_fields_the_script_cannot_fill(driver, login_page):
+    # The fake script, like the browser one, rejects read-only fields
+    driver.find_element(By.NAME, "password").node.set("readonly", "readonly")
+    login_page.fill_form(
+        {LoginPageLocators.USERNAME_FIELD: "Admin", LoginPageLocators.PASSWORD_FIELD: "admin123"},
+        submit=LoginPageLocators.LOGIN_BUTTON,
+    )
+    assert driver.current_url.endswith("/web/index.php/dashboard/index")
+
+
+def test_request_reset_fills_and_submits_in_one_step(login_page, forgot_password_page):
+    login_page.click_forgot_password()
+    forgot_password_page.request_reset("Admin")
+    assert forgot_password_page.get_success_message() == "Reset Password link sent successfully"
+
+
+def test_navigation_commands_change_the_generation():
+    class CommandDriver:
+        def execute(self, driver_command, params=None):
+            return {"value": None}
+
+    driver = track_navigation(CommandDriver())
+    driver.execute(Command.FIND_ELEMENT)
+    assert driver.navigation_generation == 0
+    driver.execute(Command.GET, {"url": "http://hrm.local"})
+    driver.execute(Command.CLICK_ELEMENT)
+    assert track_navigation(driver).navigation_generation == 2
+
+
+def test_session_cache_skips_the_login_form(driver, login_page, monkeypatch):
+    cache = LoginSessionCache(driver.base_url)
+    login_page.session_cache = cache
+    login_page.ensure_logged_in("Admin", "admin123")
+    assert cache.get("Admin") is not None
+
+    second = FakeDriver()
+    second.get(LOGIN_PATH)
+    typed = []
+    monkeypatch.setitem(second.script_handlers, FILL_FORM_SCRIPT.strip(), lambda *args: typed.append(args))
+    monkeypatch.setattr(FakeElement, "send_keys", lambda element, *values: typed.append(values))
+    LoginPage(second, session_cache=cache, wait_policy=FAST_POLICY).ensure_logged_in("Admin", "admin123")
+    assert second.current_url.endswith("/web/index.php/dashboard/index")
+    assert typed == []
+
+
+def test_an_expired_session_is_cleared_from_the_browser(driver, login_page):
+    cache = LoginSessionCache(driver.base_url)
+    login_page.login("Admin", "admin123")
+    # Without its session cookie the saved session is rejected like one the server has expired
+    driver.delete_all_cookies()
+    driver.local_storage["token"] = "expired"
+    cache.save(driver, "Admin")
+
+    second = FakeDriver()
+    second.get(LOGIN_PATH)
+    assert not cache.restore(second, "Admin")
+    assert cache.get("Admin") is None
+    assert second.local_storage == {} and second.cookies == {}
+    assert second.current_url.endswith(LOGIN_PATH)
+
+
+def test_a_failed_restore_on_a_dead_driver_does_not_raise(driver, login_page, monkeypatch):
+    cache = LoginSessionCache(driver.base_url)
+    login_page.login("Admin", "admin123")
+    cache.save(driver, "Admin")
+
+    def gone(*args, **kwargs):
+        raise WebDriverException("browser closed")
+
+    second = FakeDriver()
+    second.get(LOGIN_PATH)
+    for command in ("add_cookie", "delete_all_cookies", "execute_script", "get"):
+        monkeypatch.setattr(second, command, gone)
+    assert not cache.restore(second, "Admin")
+    assert cache.get("Admin") is None
+
+
+def test_results_flow_into_the_test_plan(tmp_path, admin_page):
+    workbook_file = tmp_path / "test_plan.xlsx"
+    shutil.copy("data/test_plan.xlsx", workbook_file)
+    directory = str(tmp_path / "journal")
+    with ResultJournal(directory, worker="gw0") as journal:
+        excel = ExcelFunctions(str(workbook_file), "Sheet1", recorder=journal)
+        excel.write_data(5, 6, "Pass" if admin_page.get_title() == "OrangeHRM" else "Fail")
+        excel.write_data(6, 6, "Fail")
+
+    with ExcelResultRecorder(str(workbook_file)) as recorder:
+        merge_journals(directory, recorder)
+    excel = ExcelFunctions(str(workbook_file), "Sheet1")
+    assert excel.read_data(5, 1) == "TC_04"
+    assert (excel.read_data(5, 6), excel.read_data(6, 6)) == ("Pass", "Fail")
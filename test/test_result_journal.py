@@ -0,0 +1,94 @@
+"""
+test/test_result_journal.py
+
+Unit tests for the per-worker result journals in utils/result_journal.py.
+"""
+import json
+
+import pytest
+from openpyxl import Workbook, load_workbook
+from utils.excel_functions import ExcelFunctions, ExcelResultRecorder
+from utils.result_journal import ResultJournal, merge_journals
+
+
+@pytest.fixture
+def workbook_file(tmp_path):
+    path = tmp_path / "plan.xlsx"
+    workbook = Workbook()
+    workbook.active.title = "Sheet1"
+    workbook.save(path)
+    return str(path)
+
+
+def test_each_worker_appends_to_its_own_journal(tmp_path):
+    directory = tmp_path / "journal"
+    with ResultJournal(str(directory), worker="gw0") as first, ResultJournal(str(directory), worker="gw1") as second:
+        first.start_test("test_a")
+        first.write_data("Sheet1", 2, 6, "Pass")
+        second.write_data("Sheet1", 3, 6, "Fail", duration=1.5)
+
+    assert sorted(path.name for path in directory.iterdir()) == ["journal-gw0.jsonl", "journal-gw1.jsonl"]
+    record = json.loads((directory / "journal-gw1.jsonl").read_text())
+    assert record["row"] == 3 and record["value"] == "Fail" and record["duration"] == 1.5
+    assert json.loads((directory / "journal-gw0.jsonl").read_text())["test"] == "test_a"
+
+
+def test_merge_writes_every_record_in_one_save(tmp_path, workbook_file):
+    directory = str(tmp_path / "journal")
+    for worker in ("gw0", "gw1", "gw2"):
+        with ResultJournal(directory, worker=worker) as journal:
+            excel = ExcelFunctions(workbook_file, "Sheet1", recorder=journal)
+            for row in range(2, 1002):
+                if row % 3 == int(worker[-1]):
+                    excel.write_data(row, 6, worker)
+
+    with ExcelResultRecorder(workbook_file) as recorder:
+        assert merge_journals(directory, recorder) == 1000
+
+    sheet = load_workbook(workbook_file)["Sheet1"]
+    assert sheet.cell(row=2, column=6).value == "gw2"
+    assert sheet.cell(row=1001, column=6).value == "gw2"
+    assert sheet.cell(row=1000, column=6).value == "gw1"
+
+
+def test_merge_is_deterministic_for_duplicate_rows(tmp_path, workbook_file):
+    directory = tmp_path / "journal"
+    directory.mkdir()
+    records = {
+        "gw0": [{"sheet": "Sheet1", "row": 2, "col": 6, "value": "Fail", "timestamp": 10.0, "worker": "gw0", "seq": 0}],
+        "gw1": [{"sheet": "Sheet1", "row": 2, "col": 6, "value": "Pass", "timestamp": 10.0, "worker": "gw1", "seq": 0},
+                {"sheet": "Sheet1", "row": 3, "col": 6, "value": "Pass", "timestamp": 12.0, "worker": "gw1", "seq": 1}],
+        "gw2": [{"sheet": "Sheet1", "row": 3, "col": 6, "value": "Fail", "timestamp": 11.0, "worker": "gw2", "seq": 0},
+                # Within a worker the later record wins, whatever the clock says
+                {"sheet": "Sheet1", "row": 4, "col": 6, "value": "Fail", "timestamp": 20.0, "worker": "gw2", "seq": 1},
+                {"sheet": "Sheet1", "row": 4, "col": 6, "value": "Pass", "timestamp": 5.0, "worker": "gw2", "seq": 2},
+                {"sheet": "Sheet1", "row": 5, "col": 6, "value": "Pass", "timestamp": 1.0, "worker": "gw2", "seq": 3}],
+        "gw3": [{"sheet": "Sheet1", "row": 5, "col": 6, "value": "Pass", "timestamp": 9.0, "worker": "gw3", "seq": 0}],
+    }
+    for worker, lines in records.items():
+        text = "".join(json.dumps(record) + "\n" for record in lines)
+        # A truncated trailing line, as left by a crashed worker, must be ignored
+        (directory / f"journal-{worker}.jsonl").write_text(text + '{"sheet": "She')
+
+    with ExcelResultRecorder(workbook_file) as recorder:
+        merge_journals(str(directory), recorder)
+
+    # Between workers a failure wins over a pass, whichever was recorded last
+    sheet = load_workbook(workbook_file)["Sheet1"]
+    assert sheet.cell(row=2, column=6).value == "Fail"
+    assert sheet.cell(row=3, column=6).value == "Fail"
+    assert sheet.cell(row=4, column=6).value == "Pass"
+    assert sheet.cell(row=5, column=6).value == "Pass"
+
+
+def test_merge_orders_workers_by_number(tmp_path, workbook_file):
+    directory = tmp_path / "journal"
+    directory.mkdir()
+    for worker, value in (("main", "Skip"), ("gw9", "Pass"), ("gw10", "Blocked")):
+        record = {"sheet": "Sheet1", "row": 2, "col": 6, "value": value, "timestamp": 1.0, "worker": worker, "seq": 0}
+        (directory / f"journal-{worker}.jsonl").write_text(json.dumps(record) + "\n")
+
+    with ExcelResultRecorder(workbook_file) as recorder:
+        merge_journals(str(directory), recorder)
+
+    assert load_workbook(workbook_file)["Sheet1"].cell(row=2, column=6).value == "Blocked"
@@ -0,0 +1,70 @@
+"""
+test/test_run_history.py
+
+Unit tests for the run-history store and its analytics in utils/run_history.py.
+"""
+import pandas as pd
+import pytest
+from openpyxl import Workbook, load_workbook
+from utils.excel_functions import ExcelResultRecorder
+from utils.run_history import SUMMARY_HEADERS, RunHistory, summarize, summary_rows
+
+
+def record(test, outcome, duration, timestamp, run="run"):
+    return {"run_id": f"{run}-{timestamp}", "test": test, "outcome": outcome, "duration": duration,
+            "worker": "gw0", "environment": "default", "timestamp": timestamp}
+
+
+def test_history_is_appended_across_runs_and_skips_torn_lines(tmp_path):
+    history = RunHistory(str(tmp_path / "history" / "run_history.jsonl"))
+    history.append([record("test_a", "passed", 1.0, 1), record("test_b", "failed", 2.0, 2)])
+    with open(history.path, "a", encoding="utf-8") as history_file:
+        history_file.write('{"run_id": "cut sho')
+    history.append([])
+
+    loaded = history.load()
+    assert list(loaded["test"]) == ["test_a", "test_b"]
+    assert list(loaded["duration"]) == [1.0, 2.0]
+
+
+def test_summary_computes_flake_rate_percentiles_and_trend():
+    outcomes = ["passed", "failed", "passed", "failed", "passed"]
+    history = pd.DataFrame(
+        [record("test_flaky", outcome, 1.0, index) for index, outcome in enumerate(outcomes)]
+        + [record("test_broken", "failed", 2.0, index) for index in range(5)]
+        + [record("test_slowing", "passed", 1.0 + index, index) for index in range(5)]
+        + [record("test_skipped", "skipped", 0.0, 0)]
+    )
+
+    summary = summarize(history, recent=2).set_index("test")
+
+    assert "test_skipped" not in summary.index
+    assert summary.loc["test_flaky", "flake_rate"] == 1.0
+    assert summary.loc["test_flaky", "recent_fail_rate"] == 0.5
+    assert summary.loc["test_broken", "flake_rate"] == 0.0
+    assert summary.loc["test_broken", "fail_rate"] == 1.0
+    assert summary.loc["test_slowing", "duration_trend"] == pytest.approx(1.0)
+    assert summary.loc["test_slowing", "p50_duration"] == 3.0
+    assert summary.loc["test_slowing", "p95_duration"] == pytest.approx(4.8)
+    assert summary.index[0] == "test_flaky"
+
+
+def test_summary_replaces_its_sheet_in_one_save(tmp_path):
+    path = str(tmp_path / "plan.xlsx")
+    workbook = Workbook()
+    workbook.active.title = "Sheet1"
+    workbook.create_sheet("Run history").append(["stale"] * 20)
+    workbook.create_sheet("Notes")
+    workbook.save(path)
+
+    rows = summary_rows(summarize(pd.DataFrame([record("test_a", "passed", 1.25, 0)])))
+    with ExcelResultRecorder(path) as recorder:
+        recorder.write_data("Sheet1", 2, 6, "Pass")
+        recorder.replace_sheet("Run history", rows)
+
+    saved = load_workbook(path)
+    assert saved.sheetnames == ["Sheet1", "Run history", "Notes"]
+    values = list(saved["Run history"].iter_rows(values_only=True))
+    assert values[0] == SUMMARY_HEADERS
+    assert values[1][:3] == ("test_a", 1, 0)
+    assert len(values) == 2 and saved["Sheet1"].cell(row=2, column=6).value == "Pass"
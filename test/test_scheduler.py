@@ -0,0 +1,122 @@
+"""
+test/test_scheduler.py
+
+Unit tests for the dependency recording in utils/dependencies.py and the test ordering and impact selection
+in utils/scheduler.py.
+"""
+import subprocess
+
+import pandas as pd
+import pytest
+from locators.locators_test import AdminPageLocators, ForgotPasswordPageLocators
+from pages.forgot_password_page import ForgotPasswordPage
+from utils.dependencies import dependencies, locator_dependency
+from utils.fake_driver import page_states
+from utils.scheduler import DependencyMap, affected_tests, changes_from_lines, git_changed_lines, history_order, \
+    symbols_at
+
+MAIN = "test/test_main.py::TestOrangeHRM::"
+FORGOT = ["locators/locators_test.py::ForgotPasswordPageLocators", "pages/forgot_password_page.py::ForgotPasswordPage",
+          "pages/login_page.py::LoginPage"]
+ADMIN = ["locators/locators_test.py::AdminPageLocators", "pages/admin_page.py::AdminPage",
+         "pages/login_page.py::LoginPage"]
+
+
+@pytest.fixture
+def dependency_map(tmp_path):
+    dependency_map = DependencyMap(str(tmp_path / "dependencies.json"))
+    dependency_map.record(MAIN + "test_tc_01_empty_username[TC_01]", FORGOT, passed=True)
+    dependency_map.record(MAIN + "test_tc_04_validate_admin_title_positive[TC_04]", ADMIN, passed=True)
+    return dependency_map
+
+
+def main_tests(*names):
+    return [(MAIN + f"{name}[TC_{name[8:10]}]", "test/test_main.py", f"TestOrangeHRM.{name}") for name in names]
+
+
+def test_page_objects_and_locators_are_recorded_per_test():
+    page = ForgotPasswordPage(page_states()["forgot_password"])
+
+    # The scheduler plugin is recording this test; record a test of our own and put its recording back after
+    saved = dependencies.current_test, dependencies.touched
+    dependencies.start("test_x")
+    try:
+        page.enter_username("Admin")
+        touched = dependencies.stop()
+    finally:
+        dependencies.current_test, dependencies.touched = saved
+    assert touched == FORGOT[:2]
+    assert locator_dependency(AdminPageLocators.SIDE_MENU_OPTION("Leave")) == \
+        "locators/locators_test.py::AdminPageLocators"
+    assert locator_dependency(ForgotPasswordPageLocators.CANCEL_BUTTON) == \
+        "locators/locators_test.py::ForgotPasswordPageLocators"
+
+
+def test_changed_lines_map_to_the_innermost_class_or_function():
+    source = "import os\n\nclass A:\n    X = 1\n\n    @staticmethod\n    def f():\n        return 1\n"
+    assert symbols_at(source, [4]) == {"A"}
+    assert symbols_at(source, [6, 8]) == {"A.f"}
+    assert symbols_at(source, [1]) == {None}
+
+
+def test_selection_follows_the_recorded_dependencies(dependency_map):
+    tests = main_tests("test_tc_01_empty_username", "test_tc_04_validate_admin_title_positive")
+
+    selected, unknown = affected_tests(tests, dependency_map, {"pages/forgot_password_page.py": None})
+    assert selected == [tests[0][0]] and not unknown
+
+    changes = {"locators/locators_test.py": {"AdminPageLocators"}}
+    assert affected_tests(tests, dependency_map, changes)[0] == [tests[1][0]]
+
+    changes = {"test/test_main.py": {"TestOrangeHRM.test_tc_04_validate_admin_title_positive"}}
+    assert affected_tests(tests, dependency_map, changes)[0] == [tests[1][0]]
+
+    changes = {"test/test_main.py": {"TestOrangeHRM.setup_teardown"}, "README.md": None}
+    assert affected_tests(tests, dependency_map, changes)[0] == [nodeid for nodeid, _, _ in tests]
+
+    selected, unknown = affected_tests(tests, dependency_map, {"pages/base_page.py": {"BasePage.click"}})
+    assert len(selected) == 2 and unknown == ["pages/base_page.py"]
+
+
+def test_tests_without_recorded_dependencies_are_always_selected(dependency_map):
+    registry_test = "test/test_locator_registry.py::test_declared_locators_match_the_offline_pages"
+    dependency_map.record(registry_test, [], passed=True)
+    tests = main_tests("test_tc_04_validate_admin_title_positive") + [
+        (registry_test, "test/test_locator_registry.py", "test_declared_locators_match_the_offline_pages"),
+    ]
+
+    changes = {"locators/locators_test.py": {"LoginPageLocators"}}
+    assert affected_tests(tests, dependency_map, changes) == ([registry_test], [])
+
+
+def test_failed_runs_only_add_dependencies(dependency_map):
+    nodeid = MAIN + "test_tc_01_empty_username[TC_01]"
+    dependency_map.record(nodeid, FORGOT[:1], passed=False)
+    assert dependency_map.tests[nodeid] == FORGOT
+    dependency_map.save()
+    assert DependencyMap(dependency_map.path).tests == dependency_map.tests
+
+
+def test_history_order_puts_new_tests_then_recent_failures_then_slow_tests_first():
+    records = [
+        {"test": test, "outcome": outcome, "duration": duration, "timestamp": index, "run_id": str(index)}
+        for index, (test, outcome, duration) in enumerate([
+            ("fast", "passed", 1.0), ("slow", "passed", 9.0), ("flaky", "failed", 2.0), ("flaky", "passed", 2.0),
+        ])
+    ]
+    assert history_order(["fast", "slow", "new", "flaky"], pd.DataFrame(records)) == ["new", "flaky", "slow", "fast"]
+
+
+def test_git_changes_are_read_as_changed_symbols(tmp_path):
+    def git(*args):
+        subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True)
+
+    (tmp_path / "page.py").write_text("class A:\n    x = 1\n\n\nclass B:\n    y = 2\n")
+    git("init", "-q")
+    git("add", "page.py")
+    git("-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "base")
+    (tmp_path / "page.py").write_text("class A:\n    x = 1\n\n\nclass B:\n    y = 3\n")
+    (tmp_path / "new.py").write_text("")
+
+    changes = changes_from_lines(str(tmp_path), git_changed_lines(str(tmp_path), "HEAD"))
+    assert changes == {"page.py": {"B"}, "new.py": None}
@@ -0,0 +1,126 @@
+"""
+test/test_screenshots.py
+
+Unit tests for the background screenshot pipeline in utils/screenshots.py.
+"""
+import base64
+import os
+import threading
+
+import pytest
+from utils.screenshots import ScreenshotService
+
+
+class StubDriver:
+    def __init__(self):
+        self.frame = b"frame-0"
+
+    def get_screenshot_as_base64(self):
+        return base64.b64encode(self.frame).decode()
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = ScreenshotService(directory=str(tmp_path / "shots"), max_files=None)
+    yield service
+    service.close()
+
+
+def test_identical_frames_are_written_once(service):
+    driver = StubDriver()
+    first = service.capture(driver, "TC_01")
+    assert service.capture(driver, "TC_02") == first
+    driver.frame = b"frame-1"
+    service.capture(driver, "TC_03")
+
+    written = service.wait()
+    assert len(written) == 2
+    assert sorted(os.path.basename(path).split("_2")[0] for path in written) == ["TC_01", "TC_03"]
+    assert os.path.exists(first)
+
+
+def test_different_frames_with_the_same_prefix_get_their_own_files(service):
+    driver = StubDriver()
+    first = service.capture(driver, "TC_06")
+    driver.frame = b"frame-1"
+    second = service.capture(driver, "TC_06")
+
+    assert first != second
+    assert sorted(service.wait()) == sorted([first, second])
+    assert all(os.path.exists(path) for path in (first, second))
+
+
+def test_policy_decides_which_screenshots_are_taken(service):
+    driver = StubDriver()
+    service.configure(policy="on-failure")
+    assert service.capture(driver, "TC_01") is None
+    assert service.capture(driver, "TC_01_failure", failure=True) is not None
+
+    service.configure(policy="always")
+    service.test_policy = "never"
+    assert service.capture(driver, "TC_02", failure=True) is None
+
+    with pytest.raises(ValueError):
+        service.configure(policy="sometimes")
+
+
+def test_retention_keeps_the_newest_screenshots(service):
+    service.configure(max_files=3)
+    driver = StubDriver()
+    for index in range(5):
+        driver.frame = f"frame-{index}".encode()
+        service.capture(driver, f"TC_{index:02d}")
+        service.wait()
+
+    remaining = sorted(os.listdir(service.directory))
+    assert len(remaining) == 3
+    assert remaining[0].startswith("TC_02")
+
+
+def test_retention_leaves_files_it_did_not_write(service):
+    os.makedirs(service.directory)
+    baseline = os.path.join(service.directory, "TC_00_baseline.png")
+    with open(baseline, "wb") as baseline_file:
+        baseline_file.write(b"baseline")
+    os.utime(baseline, (0, 0))
+    service.configure(max_files=1)
+    driver = StubDriver()
+    for index in range(3):
+        driver.frame = f"frame-{index}".encode()
+        service.capture(driver, f"TC_{index + 1:02d}")
+        service.wait()
+
+    assert sorted(name.split("_2")[0] for name in os.listdir(service.directory)) == ["TC_00_baseline.png", "TC_03"]
+
+    # A frame identical to a removed screenshot is written again
+    driver.frame = b"frame-0"
+    again = service.capture(driver, "TC_04")
+    service.wait()
+    assert os.path.exists(again)
+
+
+def test_duplicate_frames_point_at_the_stored_file(service):
+    driver = StubDriver()
+    service.current_test = "test_a"
+    first = service.capture(driver, "TC_01")
+    service.wait()
+    service.current_test = "test_b"
+    service.capture(driver, "TC_02")
+
+    assert service.screenshots_for("test_b") == [first]
+    assert service.screenshots_for("test_a") == [first]
+
+
+def test_queued_screenshots_are_listed_before_they_are_written(service, monkeypatch):
+    release = threading.Event()
+    write = service._write
+    monkeypatch.setattr(service, "_write", lambda *args: release.wait() and write(*args))
+    service.current_test = "test_a"
+    path = service.capture(StubDriver(), "TC_01")
+
+    assert service.queued_for("test_a") == [path]
+    assert not os.path.exists(path)
+    release.set()
+    service.wait()
+    # Written under a temporary name first, so only the complete file is left
+    assert os.listdir(service.directory) == [os.path.basename(path)]
@@ -0,0 +1,113 @@
+"""
+test/test_session_cache.py
+
+Unit tests for utils/session_cache.py, using a stand-in driver instead of a real browser.
+"""
+from selenium.common.exceptions import StaleElementReferenceException
+from utils.session_cache import LANDING_PATH, LOGIN_PATH, LoginSessionCache
+from utils.wait_policy import WaitPolicy
+
+BASE_URL = "http://hrm.local"
+
+
+class StubElement:
+    def __init__(self, driver):
+        self.driver = driver
+        self.page = driver.page
+
+    def is_enabled(self):
+        self.driver.commit_navigation()
+        if self.page != self.driver.page:
+            raise StaleElementReferenceException("The page was replaced")
+        return True
+
+
+class StubDriver:
+    def __init__(self, server_accepts_session=True, page_load_strategy="normal"):
+        self.current_url = BASE_URL + LOGIN_PATH
+        self.cookies = []
+        self.server_accepts_session = server_accepts_session
+        self.page_load_strategy = page_load_strategy
+        self.page = 0
+        self.pending_url = None
+
+    def get_cookies(self):
+        return [{"name": "orangehrm", "value": "abc"}]
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+    def delete_all_cookies(self):
+        self.cookies = []
+
+    def execute_script(self, script, *args):
+        return {"local": {}, "session": {}}
+
+    def find_element(self, by, value):
+        return StubElement(self)
+
+    def get(self, url):
+        authenticated = self.cookies and self.server_accepts_session
+        self.pending_url = url if authenticated or url.endswith(LOGIN_PATH) else BASE_URL + LOGIN_PATH
+        # With the "none" strategy get() returns before the navigation is committed
+        if self.page_load_strategy != "none":
+            self.commit_navigation()
+
+    def commit_navigation(self):
+        if self.pending_url is not None:
+            self.current_url, self.pending_url = self.pending_url, None
+            self.page += 1
+
+
+class Clock:
+    now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_restore_opens_landing_page_with_saved_cookies():
+    cache = LoginSessionCache(BASE_URL)
+    assert not cache.restore(StubDriver(), "Admin")
+
+    cache.save(StubDriver(), "Admin")
+    driver = StubDriver()
+    assert cache.restore(driver, "Admin")
+    assert driver.current_url == BASE_URL + LANDING_PATH
+    assert driver.cookies == [{"name": "orangehrm", "value": "abc"}]
+
+
+def test_restore_waits_for_the_landing_page_when_navigation_returns_early():
+    cache = LoginSessionCache(BASE_URL)
+    cache.save(StubDriver(), "Admin")
+    driver = StubDriver(page_load_strategy="none")
+    assert cache.restore(driver, "Admin", WaitPolicy(timeout=1, initial_poll=0.01))
+    assert driver.current_url == BASE_URL + LANDING_PATH
+
+
+def test_entries_are_kept_per_user_and_expire_after_ttl():
+    clock = Clock()
+    cache = LoginSessionCache(BASE_URL, ttl=60, clock=clock)
+    cache.save(StubDriver(), "Admin")
+    assert cache.get("Admin") is not None
+    assert cache.get("Other") is None
+
+    clock.now = 60
+    assert cache.get("Admin") is None
+
+
+def test_session_rejected_by_server_is_dropped():
+    cache = LoginSessionCache(BASE_URL)
+    cache.save(StubDriver(), "Admin")
+
+    driver = StubDriver(server_accepts_session=False)
+    assert not cache.restore(driver, "Admin")
+    assert driver.current_url == BASE_URL + LOGIN_PATH
+    assert driver.cookies == []
+    assert cache.get("Admin") is None
+
+
+def test_zero_ttl_disables_the_cache():
+    cache = LoginSessionCache(BASE_URL, ttl=0)
+    cache.save(StubDriver(), "Admin")
+    assert cache.get("Admin") is None
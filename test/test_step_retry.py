@@ -0,0 +1,105 @@
+"""
+test/test_step_retry.py
+
+Unit tests for the step-level retries in utils/step_retry.py, run against the in-memory FakeDriver.
+"""
+import pytest
+from locators.locators_test import AdminPageLocators
+from pages.admin_page import AdminPage
+from pages.base_page import BasePage
+from selenium.common.exceptions import (
+    ElementClickInterceptedException, InvalidSessionIdException, StaleElementReferenceException, TimeoutException,
+)
+from utils.fake_driver import page_states
+from utils.step_retry import NavigationTimeout, StepRetryPolicy, retry_log, retry_step
+from utils.wait_policy import WaitPolicy
+
+FAST_POLICY = WaitPolicy(timeout=0.2, initial_poll=0.01)
+
+
+class FlakyPage(BasePage):
+    def __init__(self, driver, failures, retry_policy=None):
+        super().__init__(driver, FAST_POLICY, retry_policy)
+        self.failures = list(failures)
+        self.calls = 0
+
+    @retry_step
+    def act(self):
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        return "done"
+
+    @retry_step(retryable=(AssertionError,))
+    def check(self):
+        return self.act.__wrapped__(self)
+
+
+@pytest.fixture(autouse=True)
+def clean_retry_log():
+    retry_log.reset()
+
+
+@pytest.fixture
+def driver():
+    return page_states()["dashboard"]
+
+
+def test_transient_failures_are_retried_on_the_same_page_and_recorded(driver):
+    page = FlakyPage(driver, [StaleElementReferenceException("gone")], StepRetryPolicy(retries=1, delay=0))
+    page.elements.put(AdminPageLocators.ADMIN_TAB, "clickable", object())
+
+    assert page.act() == "done"
+    assert page.calls == 2
+    assert page.elements.get(AdminPageLocators.ADMIN_TAB) is None
+    assert [(retry.step, retry.attempt) for retry in retry_log.retries] == [("FlakyPage.act", 1)]
+    assert retry_log.retries[0].error == "StaleElementReferenceException: gone"
+
+
+def test_retries_stop_at_the_policy_limits(driver):
+    failures = [ElementClickInterceptedException("overlay"), NavigationTimeout("slow")]
+    page = FlakyPage(driver, failures, StepRetryPolicy(retries=1, delay=0))
+    with pytest.raises(NavigationTimeout):
+        page.act()
+    assert page.calls == 2
+
+    page = FlakyPage(driver, [NavigationTimeout("slow")], StepRetryPolicy(retries=3, budget=0, delay=0))
+    with pytest.raises(NavigationTimeout):
+        page.act()
+    assert page.calls == 1 and len(retry_log.retries) == 1
+
+
+def test_only_retryable_failures_are_retried(driver):
+    page = FlakyPage(driver, [InvalidSessionIdException("closed")], StepRetryPolicy(retries=2, delay=0))
+    with pytest.raises(InvalidSessionIdException):
+        page.act()
+    assert page.calls == 1 and not retry_log.retries
+
+    # A missing element fails after one wait; only navigation timeouts are retried
+    page = FlakyPage(driver, [TimeoutException("missing")], StepRetryPolicy(retries=2, delay=0))
+    with pytest.raises(TimeoutException):
+        page.act()
+    assert page.calls == 1 and not retry_log.retries
+
+    # A step can name its own retryable failures
+    page = FlakyPage(driver, [AssertionError("not yet")], StepRetryPolicy(retries=1, delay=0))
+    assert page.check() == "done"
+    assert retry_log.retries[0].step == "FlakyPage.check"
+
+
+def test_slow_navigation_is_retried_without_a_new_browser(driver):
+    page = AdminPage(driver, FAST_POLICY, StepRetryPolicy(retries=1, delay=0))
+    click = driver._click
+    clicks = []
+
+    # The first click on the Admin tab is lost, so the URL wait times out once
+    def lossy_click(node):
+        clicks.append(node)
+        return click(node) if len(clicks) > 1 else None
+
+    driver._click = lossy_click
+    page.navigate_to_admin()
+
+    assert len(clicks) == 2
+    assert [retry.step for retry in retry_log.retries] == ["AdminPage.navigate_to_admin"]
+    assert retry_log.retries[0].error.startswith("NavigationTimeout")
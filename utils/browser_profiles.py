@@ -0,0 +1,210 @@
+"""
+utils/browser_profiles.py
+
+This module provides the BrowserProfile class, a named set of Chrome launch settings: headless mode, the page
+load strategy, resources blocked through the DevTools Network domain (images, fonts, analytics), a fixed
+viewport instead of a maximized window, and disabled background services. It also times every page load per
+profile, so the time a lean profile saves over the default one can be read from the traces.
+
+Purpose:
+- To let tests and the command line choose how much of the browser's work a run pays for.
+"""
+import html
+import statistics
+
+from selenium import webdriver
+from utils.timing import tracer
+
+IMAGE_PATTERNS = ("*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico")
+FONT_PATTERNS = ("*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*fonts.googleapis.com*", "*fonts.gstatic.com*")
+ANALYTICS_PATTERNS = (
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*hotjar.com*", "*facebook.net*",
+    "*clarity.ms*", "*segment.io*",
+)
+
+# Chrome switches that stop work the tests never need: updates, sync, translation, safe browsing lookups, ...
+BACKGROUND_SERVICE_ARGUMENTS = (
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-extensions",
+    "--disable-sync",
+    "--disable-client-side-phishing-detection",
+    "--disable-features=Translate,OptimizationHints,MediaRouter,AutofillServerCommunication",
+    "--metrics-recording-only",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--mute-audio",
+)
+
+PAGE_LOAD_STRATEGIES = ("normal", "eager", "none")
+
+
+class BrowserProfile:
+    def __init__(self, name, headless=False, page_load_strategy="normal", blocked_urls=(), window_size=None,
+                 disable_background_services=False, description=""):
+        """Initialize a browser profile.
+
+                Args:
+                    name (str): The name the profile is selected by.
+                    headless (bool): Whether Chrome runs without a window.
+                    page_load_strategy (str): "normal" waits for the load event, "eager" for DOMContentLoaded,
+                        "none" only for the navigation to start.
+                    blocked_urls (tuple): URL patterns (with * wildcards) the browser does not fetch.
+                    window_size (tuple, optional): A fixed (width, height) viewport. Without one the window is
+                        maximized.
+                    disable_background_services (bool): Whether to turn off Chrome's background services.
+                    description (str): A short description for the command-line help.
+        """
+        if page_load_strategy not in PAGE_LOAD_STRATEGIES:
+            raise ValueError(f"Unknown page load strategy '{page_load_strategy}', expected one of "
+                             f"{PAGE_LOAD_STRATEGIES}")
+        self.name = name
+        self.headless = headless
+        self.page_load_strategy = page_load_strategy
+        self.blocked_urls = tuple(blocked_urls)
+        self.window_size = window_size
+        self.disable_background_services = disable_background_services
+        self.description = description
+
+    def __repr__(self):
+        return f"BrowserProfile({self.name!r})"
+
+    def chrome_options(self):
+        """Return the Chrome options of the profile."""
+        options = webdriver.ChromeOptions()
+        options.page_load_strategy = self.page_load_strategy
+        if self.headless:
+            options.add_argument("--headless=new")
+        if self.window_size:
+            options.add_argument(f"--window-size={self.window_size[0]},{self.window_size[1]}")
+        if self.disable_background_services:
+            for argument in BACKGROUND_SERVICE_ARGUMENTS:
+                options.add_argument(argument)
+        return options
+
+    def apply(self, driver):
+        """Apply the settings that need a running browser: the window size and the blocked URLs.
+
+                Page loads through driver.get are timed as "page-load" spans named after the profile.
+
+                Args:
+                    driver: A Selenium WebDriver instance started with this profile's options.
+
+                Returns:
+                    The same driver.
+        """
+        if self.window_size:
+            driver.set_window_size(*self.window_size)
+        else:
+            driver.maximize_window()
+
+        if self.blocked_urls:
+            # Only Chromium-based drivers speak the DevTools protocol; others load everything
+            execute_cdp_cmd = getattr(driver, "execute_cdp_cmd", None)
+            if execute_cdp_cmd is None:
+                print(f"Browser profile '{self.name}': the driver cannot block resources, loading them all")
+            else:
+                execute_cdp_cmd("Network.enable", {})
+                execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(self.blocked_urls)})
+
+        get = driver.get
+
+        def timed_get(url):
+            with tracer.span("page-load", self.name):
+                return get(url)
+
+        driver.get = timed_get
+        driver.browser_profile = self.name
+        return driver
+
+    def launch(self, factory=webdriver.Chrome):
+        """Start a browser with this profile.
+
+                Args:
+                    factory: A callable taking an options keyword and returning a WebDriver.
+
+                Returns:
+                    The started WebDriver, with apply() done.
+        """
+        return self.apply(factory(options=self.chrome_options()))
+
+
+PROFILES = {
+    profile.name: profile
+    for profile in (
+        BrowserProfile(
+            "default",
+            description="a headed, maximized Chrome that loads every resource and waits for the load event",
+        ),
+        BrowserProfile(
+            "lean", headless=True, page_load_strategy="eager",
+            blocked_urls=IMAGE_PATTERNS + FONT_PATTERNS + ANALYTICS_PATTERNS, window_size=(1366, 768),
+            disable_background_services=True,
+            description="headless, 1366x768, returns at DOMContentLoaded, skips images, fonts and analytics",
+        ),
+        BrowserProfile(
+            "minimal", headless=True, page_load_strategy="none",
+            blocked_urls=IMAGE_PATTERNS + FONT_PATTERNS + ANALYTICS_PATTERNS, window_size=(1366, 768),
+            disable_background_services=True,
+            description="like lean, but navigation returns at once and the explicit waits do all the waiting",
+        ),
+    )
+}
+
+
+def get_profile(name):
+    """Return the profile registered under a name.
+
+    Raises:
+        ValueError: If no profile has that name.
+    """
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown browser profile '{name}', expected one of {sorted(PROFILES)}") from None
+
+
+def page_load_summary(spans, reference="default"):
+    """Summarize the "page-load" spans per browser profile.
+
+    Args:
+        spans: Span dictionaries as stored in trace files, e.g. from several runs with different profiles.
+        reference (str): The profile the savings are computed against.
+
+    Returns:
+        list: Dictionaries with the profile, count, median and mean load time, and the median time saved
+        per page load compared to the reference profile (None if the reference was not recorded).
+    """
+    loads = {}
+    for span in spans:
+        if span["category"] == "page-load":
+            loads.setdefault(span["name"], []).append(span["duration"])
+
+    reference_median = statistics.median(loads[reference]) if reference in loads else None
+    rows = []
+    for profile, durations in sorted(loads.items()):
+        median = statistics.median(durations)
+        rows.append({
+            "profile": profile,
+            "count": len(durations),
+            "median": median,
+            "mean": statistics.fmean(durations),
+            "saved": reference_median - median if reference_median is not None else None,
+        })
+    return rows
+
+
+def render_page_loads_html(rows):
+    """Render the rows of page_load_summary() as an HTML table for the pytest-html report."""
+    cells = "".join(
+        f"<tr><td>{html.escape(row['profile'])}</td><td>{row['count']}</td><td>{row['median']:.3f}</td>"
+        f"<td>{row['mean']:.3f}</td><td>{'' if row['saved'] is None else format(row['saved'], '.3f')}</td></tr>"
+        for row in rows
+    )
+    return (
+        "<h2>Page loads by browser profile</h2>"
+        "<table id=\"page-loads\"><thead><tr><th>Profile</th><th>Loads</th><th>Median (s)</th>"
+        "<th>Mean (s)</th><th>Saved vs default (s)</th></tr></thead>"
+        f"<tbody>{cells}</tbody></table>"
+    )
@@ -0,0 +1,103 @@
+"""
+utils/dependencies.py
+
+This module provides the DependencyRecorder class, which notes the page objects and locator classes each test
+actually touches while it runs. Dependencies are named "<file>::<class>", e.g.
+"pages/forgot_password_page.py::ForgotPasswordPage" or "locators/locators_test.py::ForgotPasswordPageLocators",
+so they can be matched against the files and classes a change touches.
+
+Purpose:
+- To build the map from tests to the code they depend on automatically, instead of maintaining it by hand.
+"""
+import functools
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class DependencyRecorder:
+    def __init__(self):
+        """Initialize the DependencyRecorder. Nothing is recorded until start() names the running test."""
+        self.current_test = None
+        self.touched = set()
+
+    def start(self, test):
+        """Start recording the dependencies of a test."""
+        self.current_test = test
+        self.touched = set()
+
+    def stop(self):
+        """Stop recording and return the sorted dependencies of the test."""
+        touched = sorted(self.touched)
+        self.current_test = None
+        self.touched = set()
+        return touched
+
+    def touch(self, dependency):
+        """Note that the running test depends on something, e.g. "pages/login_page.py::LoginPage"."""
+        if self.current_test is not None and dependency is not None:
+            self.touched.add(dependency)
+
+    def touch_locator(self, locator):
+        """Note that the running test uses a locator, by the class in locators_test.py that declares it."""
+        if self.current_test is not None:
+            self.touch(locator_dependency(locator))
+
+    def touching(self, dependency, function):
+        """Wrap a function so every call notes the dependency.
+
+                Args:
+                    dependency (str): The dependency name, e.g. from class_dependency().
+                    function: The function to wrap.
+        """
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if self.current_test is not None:
+                self.touched.add(dependency)
+            return function(*args, **kwargs)
+        return wrapper
+
+
+dependencies = DependencyRecorder()
+
+
+def source_path(module_name):
+    """Return the file of a loaded module relative to the project root, with forward slashes."""
+    return os.path.relpath(sys.modules[module_name].__file__, ROOT).replace(os.sep, "/")
+
+
+def class_dependency(cls):
+    """Return the dependency name of a class, e.g. "pages/login_page.py::LoginPage"."""
+    return f"{source_path(cls.__module__)}::{cls.__qualname__}"
+
+
+@functools.lru_cache(maxsize=1)
+def _locator_owners():
+    from locators.registry import LocatorTemplate, declared_locators
+
+    exact, templates = {}, []
+    path = source_path("locators.locators_test")
+    for name, value in declared_locators().items():
+        owner = f"{path}::{name.split('.')[0]}"
+        if isinstance(value, LocatorTemplate):
+            prefix, _, suffix = value.pattern.partition("{}")
+            templates.append((value.by, prefix, suffix, owner))
+        else:
+            exact[value] = owner
+    return exact, templates
+
+
+@functools.lru_cache(maxsize=512)
+def locator_dependency(locator):
+    """Return the dependency name of the locator class declaring a locator, or None for undeclared locators.
+
+    Locators built by a LocatorTemplate belong to the class declaring the template.
+    """
+    exact, templates = _locator_owners()
+    if locator in exact:
+        return exact[locator]
+    for by, prefix, suffix, owner in templates:
+        if locator[0] == by and locator[1].startswith(prefix) and locator[1].endswith(suffix):
+            return owner
+    return None
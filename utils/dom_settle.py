@@ -0,0 +1,88 @@
+"""
+utils/dom_settle.py
+
+This module decides when a page has settled (the document is ready and the DOM has stopped changing) and
+uses that to check for the absence of elements without waiting out a full explicit-wait timeout.
+
+Purpose:
+- To make negative checks ("this element is not on the page") as fast as the page itself.
+"""
+import time
+from collections import namedtuple
+
+from selenium.common.exceptions import StaleElementReferenceException, WebDriverException
+
+DEFAULT_QUIET_MS = 200
+
+# Resolves true once the document is complete and no DOM mutation happened for quietMs, or false at timeoutMs
+WAIT_FOR_SETTLED_SCRIPT = """
+var quietMs = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+var observer = null, quietTimer = null, deadline = null;
+function finish(settled) {
+    if (observer) { observer.disconnect(); }
+    clearTimeout(quietTimer);
+    clearTimeout(deadline);
+    done(settled);
+}
+function arm() {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(function () { finish(true); }, quietMs);
+}
+function observe() {
+    observer = new MutationObserver(arm);
+    observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    arm();
+}
+deadline = setTimeout(function () { finish(false); }, timeoutMs);
+if (document.readyState === 'complete') {
+    observe();
+} else {
+    window.addEventListener('load', observe, {once: true});
+}
+"""
+
+AbsenceCheck = namedtuple("AbsenceCheck", ["absent", "elapsed", "settled"])
+
+
+def wait_for_settled(driver, quiet_ms=DEFAULT_QUIET_MS, timeout=10):
+    """Wait until the document is ready and the DOM has been quiet for quiet_ms milliseconds.
+
+    Args:
+        driver: A Selenium WebDriver instance.
+        quiet_ms (int): The length of the mutation-free window, in milliseconds.
+        timeout (float): The maximum number of seconds to wait.
+
+    Returns:
+        bool: True if the page settled, False if it was still changing when the timeout expired.
+    """
+    try:
+        return bool(driver.execute_async_script(WAIT_FOR_SETTLED_SCRIPT, quiet_ms, int(timeout * 1000)))
+    except WebDriverException:
+        return False
+
+
+def check_absence(driver, locator, quiet_ms=DEFAULT_QUIET_MS, timeout=10):
+    """Decide whether an element is absent once the page has settled.
+
+    An element counts as absent if no element matches the locator or none of the matches is displayed.
+
+    Args:
+        driver: A Selenium WebDriver instance.
+        locator: A (By, value) tuple identifying the element.
+        quiet_ms (int): The length of the mutation-free window, in milliseconds.
+        timeout (float): The maximum number of seconds to wait for the page to settle.
+
+    Returns:
+        AbsenceCheck: Whether the element is absent, the seconds the check took, and whether the page settled.
+    """
+    started = time.perf_counter()
+    settled = wait_for_settled(driver, quiet_ms, timeout)
+    absent = True
+    for element in driver.find_elements(*locator):
+        try:
+            if element.is_displayed():
+                absent = False
+                break
+        except StaleElementReferenceException:
+            continue
+    return AbsenceCheck(absent, time.perf_counter() - started, settled)
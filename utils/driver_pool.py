@@ -0,0 +1,142 @@
+"""
+utils/driver_pool.py
+
+This module provides the DriverPool class, which keeps warm WebDriver sessions alive for a whole test session
+(or one pytest worker) and hands them out to tests, resetting the browser state between tests.
+
+Purpose:
+- To pay the browser startup cost once per pool slot instead of once per test.
+"""
+import queue
+import threading
+
+from selenium.common.exceptions import WebDriverException
+
+RESET_STORAGE_SCRIPT = "window.localStorage.clear(); window.sessionStorage.clear();"
+
+
+class DriverPool:
+    def __init__(self, factory, start_url, size=1):
+        """Initialize the DriverPool.
+
+                Args:
+                    factory: A callable returning a new WebDriver instance.
+                    start_url (str): The URL every driver is on when it is handed out.
+                    size (int): The maximum number of browsers the pool keeps alive.
+        """
+        if size < 1:
+            raise ValueError(f"Driver pool size must be at least 1, got {size}")
+        self.factory = factory
+        self.start_url = start_url
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._drivers = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def acquire(self, timeout=None):
+        """Hand out a driver on the start URL with a clean state.
+
+                An idle driver is reused if there is one; otherwise a new browser is started while the pool is
+                below its size, or the call blocks until a driver is released. A driver that fails its reset is
+                treated as unhealthy and replaced by a new one.
+
+                Args:
+                    timeout (float, optional): The maximum number of seconds to wait for a free driver.
+
+                Returns:
+                    A WebDriver instance that must be given back with release().
+        """
+        try:
+            driver = self._idle.get_nowait()
+        except queue.Empty:
+            driver = self._create_if_below_size()
+            if driver is not None:
+                return driver
+            driver = self._idle.get(timeout=timeout)
+
+        if self._reset(driver):
+            return driver
+        self._discard(driver)
+        return self._create()
+
+    def release(self, driver, healthy=True):
+        """Give a driver back to the pool.
+
+                Args:
+                    driver: A driver previously returned by acquire().
+                    healthy (bool): Pass False to quit the driver instead of reusing it, e.g. after the browser
+                        session crashed.
+        """
+        if healthy:
+            self._idle.put(driver)
+        else:
+            self._discard(driver)
+
+    def close(self):
+        """Quit every browser owned by the pool."""
+        with self._lock:
+            drivers, self._drivers = self._drivers, []
+        while not self._idle.empty():
+            self._idle.get_nowait()
+        for driver in drivers:
+            self._quit(driver)
+
+    def _create_if_below_size(self):
+        with self._lock:
+            if len(self._drivers) >= self.size:
+                return None
+            # Reserve the slot before the (slow) browser startup, outside the lock
+            self._drivers.append(None)
+        try:
+            driver = self._start()
+        except BaseException:
+            with self._lock:
+                self._drivers.remove(None)
+            raise
+        with self._lock:
+            self._drivers[self._drivers.index(None)] = driver
+        return driver
+
+    def _create(self):
+        driver = self._start()
+        with self._lock:
+            self._drivers.append(driver)
+        return driver
+
+    def _start(self):
+        driver = self.factory()
+        driver.get(self.start_url)
+        return driver
+
+    def _reset(self, driver):
+        """Clear cookies, local storage and session storage, then load the start URL.
+
+                Returns:
+                    bool: True if the reset succeeded, False if the browser session is no longer usable.
+        """
+        try:
+            driver.delete_all_cookies()
+            driver.execute_script(RESET_STORAGE_SCRIPT)
+            driver.get(self.start_url)
+            return True
+        except WebDriverException:
+            return False
+
+    def _discard(self, driver):
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+        self._quit(driver)
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
@@ -0,0 +1,101 @@
+"""
+utils/element_cache.py
+
+This module provides the ElementCache class, which keeps the elements a page object has found, keyed by
+locator, for as long as the browser stays on the same page. Pages are told apart by a navigation generation:
+a counter on the driver that changes whenever a command may have loaded a new document (navigation, reload,
+history, clicks). Drivers that do not keep one get it from track_navigation(), which counts those commands.
+
+Purpose:
+- To let repeated interactions with an element on a stable page skip the lookup round trip.
+"""
+from selenium.webdriver.remote.command import Command
+
+# Commands after which the browser may show a different document; a click can follow a link or submit a form
+NAVIGATION_COMMANDS = frozenset({
+    Command.GET,
+    Command.REFRESH,
+    Command.GO_BACK,
+    Command.GO_FORWARD,
+    Command.CLICK_ELEMENT,
+})
+
+# How much a lookup established about the element; a cached element satisfies requests up to its level
+LEVELS = {"presence": 0, "visible": 1, "clickable": 2}
+
+
+def track_navigation(driver):
+    """Give a driver a navigation_generation counter that changes on every command in NAVIGATION_COMMANDS.
+
+    Drivers that already keep a counter, like FakeDriver, and drivers without an execute method are returned
+    unchanged. Tracking a driver twice has no further effect.
+
+    Returns:
+        The same driver.
+    """
+    if hasattr(driver, "navigation_generation") or not hasattr(driver, "execute"):
+        return driver
+    execute = driver.execute
+    driver.navigation_generation = 0
+
+    def tracked_execute(driver_command, params=None):
+        try:
+            return execute(driver_command, params)
+        finally:
+            # Counted after the command, so elements found while it ran are not mistaken for the new page's
+            if driver_command in NAVIGATION_COMMANDS:
+                driver.navigation_generation += 1
+
+    driver.execute = tracked_execute
+    return driver
+
+
+def navigation_generation(driver):
+    """Return the driver's navigation generation, or None if it does not keep one."""
+    return getattr(driver, "navigation_generation", None)
+
+
+class ElementCache:
+    def __init__(self, driver):
+        """Initialize the ElementCache.
+
+                Args:
+                    driver: The WebDriver the elements belong to. Without a navigation generation nothing is
+                        ever served from the cache, since there is no telling when the page changed.
+        """
+        self.driver = driver
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+
+    def get(self, locator, kind="presence"):
+        """Return the cached element for a locator if it was found on the current page with at least this level.
+
+                Args:
+                    locator: A (By, value) tuple.
+                    kind (str): "presence", "visible" or "clickable".
+
+                Returns:
+                    The element, or None on a miss.
+        """
+        generation = navigation_generation(self.driver)
+        entry = self._entries.get(locator)
+        if generation is not None and entry is not None and entry[0] == generation \
+                and LEVELS[entry[1]] >= LEVELS[kind]:
+            self.hits += 1
+            return entry[2]
+        self.misses += 1
+        return None
+
+    def put(self, locator, kind, element):
+        """Cache an element found on the current page, and the level of the lookup that found it."""
+        generation = navigation_generation(self.driver)
+        if generation is not None:
+            self._entries[locator] = (generation, kind, element)
+
+    def invalidate(self, locator=None):
+        """Forget the element of a locator, or all elements."""
+        if locator is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(locator, None)
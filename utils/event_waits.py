@@ -0,0 +1,140 @@
+"""
+utils/event_waits.py
+
+This module waits for element and URL conditions inside the browser instead of polling them from Python: one
+asynchronous script checks the condition, then re-checks it on every DOM mutation and history event, and
+returns as soon as it holds. A full page load ends the script early; the wait then subscribes again on the new
+document. Drivers that cannot run the script fall back to polling.
+
+Purpose:
+- To notice a condition the moment it becomes true, with one driver command per wait instead of one per poll.
+"""
+import time
+
+from selenium.common.exceptions import JavascriptException, TimeoutException, UnknownMethodException
+from selenium.webdriver.common.by import By
+
+CONDITIONS = ("presence", "visible", "clickable", "url")
+
+# Longest single script call, in seconds; kept well below the session's script timeout (30 s by default)
+MAX_SCRIPT_WAIT = 5
+
+# Resolves with the element (or true for "url") once the condition holds, or with null at timeoutMs
+WAIT_FOR_CONDITION_SCRIPT = """
+var kind = arguments[0], using = arguments[1], value = arguments[2], timeoutMs = arguments[3];
+var done = arguments[arguments.length - 1];
+function find() {
+    if (using === 'css') { return document.querySelector(value); }
+    return document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+function displayed(el) {
+    return el.getClientRects().length > 0 && window.getComputedStyle(el).visibility !== 'hidden';
+}
+function check() {
+    if (kind === 'url') { return window.location.href.indexOf(value) !== -1 ? true : null; }
+    var el = find();
+    if (!el || kind === 'presence') { return el; }
+    if (!displayed(el)) { return null; }
+    return kind === 'visible' || !el.disabled ? el : null;
+}
+var result = check();
+if (result) { done(result); return; }
+var finished = false, observer = null, timer = null;
+function finish(value) {
+    if (finished) { return; }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    window.removeEventListener('popstate', onChange);
+    window.removeEventListener('hashchange', onChange);
+    done(value);
+}
+function onChange() {
+    var value = check();
+    if (value) { finish(value); }
+}
+observer = new MutationObserver(onChange);
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+window.addEventListener('popstate', onChange);
+window.addEventListener('hashchange', onChange);
+timer = setTimeout(function () { finish(check()); }, timeoutMs);
+"""
+
+_STRATEGIES = {By.CSS_SELECTOR: "css", By.XPATH: "xpath"}
+
+
+class EventWaitUnsupported(Exception):
+    """Raised when the driver cannot run the condition script, so the caller has to poll instead."""
+
+
+def supports(kind, target):
+    """Return whether a condition can be waited for in the browser (element locators need CSS or XPath)."""
+    if kind not in CONDITIONS:
+        return False
+    return kind == "url" or target[0] in _STRATEGIES
+
+
+# Script errors meaning the browser cannot run the wait at all, as opposed to a broken locator or page script
+_UNSUPPORTED_MARKERS = ("mutationobserver", "not supported", "unsupported", "not implemented", "unknown command")
+
+
+def _message(exc):
+    return str(getattr(exc, "msg", "") or exc).lower()
+
+
+def _is_unload(exc):
+    # Chrome: "document unloaded while waiting for result"; Firefox: "Document was unloaded"
+    return "unload" in _message(exc)
+
+
+def _is_unsupported(exc):
+    return isinstance(exc, UnknownMethodException) or any(marker in _message(exc) for marker in _UNSUPPORTED_MARKERS)
+
+
+def wait_for_condition(driver, kind, target, timeout, message=""):
+    """Wait for a condition by subscribing to DOM mutations and history events in the browser.
+
+    Args:
+        driver: A Selenium WebDriver instance.
+        kind (str): "presence", "visible" or "clickable" for an element, or "url" for the current URL.
+        target: A (By, value) locator using CSS or XPath, or the URL fragment for "url".
+        timeout (float): The maximum number of seconds to wait.
+        message (str): The message of the TimeoutException raised when the wait expires.
+
+    Returns:
+        The element, or True for "url".
+
+    Raises:
+        TimeoutException: If the condition does not hold before the timeout.
+        EventWaitUnsupported: If the driver cannot run the script; nothing has been waited for yet.
+        JavascriptException: If the script fails for another reason, such as an invalid selector or XPath.
+    """
+    if getattr(driver, "_event_waits_unsupported", False) or not hasattr(driver, "execute_async_script"):
+        raise EventWaitUnsupported()
+    using, value = ("url", target) if kind == "url" else (_STRATEGIES[target[0]], target[1])
+
+    end_time = time.monotonic() + timeout
+    attempts = 0
+    # Seconds the script reported waiting in vain; a driver that knows the outcome early returns null at once
+    waited = 0.0
+    while True:
+        remaining = end_time - time.monotonic()
+        chunk_ms = int(max(0.0, min(remaining, MAX_SCRIPT_WAIT)) * 1000)
+        attempts += 1
+        try:
+            result = driver.execute_async_script(WAIT_FOR_CONDITION_SCRIPT, kind, using, value, chunk_ms)
+            if result:
+                return result
+            waited += chunk_ms / 1000
+        except (JavascriptException, UnknownMethodException) as exc:
+            if _is_unsupported(exc) and attempts == 1:
+                # The browser (or driver stand-in) cannot run the script at all; remember it for this driver
+                driver._event_waits_unsupported = True
+                raise EventWaitUnsupported() from exc
+            if not _is_unload(exc):
+                raise
+            # A page load replaced the document the script observed; subscribe again on the new one
+        except TimeoutException:
+            pass  # The script outlived the session's script timeout; start the next chunk
+        if time.monotonic() >= end_time or waited >= timeout:
+            raise TimeoutException(message)
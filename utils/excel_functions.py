@@ -2,29 +2,212 @@
 utils/excel_functions.py
 
 This module provides the ExcelFunctions class, which includes methods for reading from and writing to an
-Excel spreadsheet using the OpenPyXL library.
+Excel spreadsheet using the OpenPyXL library, and the ExcelResultRecorder class, which buffers those reads
+and writes for a whole test session.
 
 Purpose:
 - To encapsulate common Excel file operations, such as reading and writing data in a specified worksheet.
+- To avoid loading and saving the whole workbook for every cell when recording test results.
 """
+import os
+import shutil
+import tempfile
+
 from openpyxl import load_workbook
+from utils.timing import tracer
+
+
+class ExcelResultRecorder:
+    def __init__(self, file_name):
+        """Initialize the ExcelResultRecorder for the given Excel file.
+
+                The workbook is opened lazily: reads are served from a read-only snapshot of each sheet, and
+                writes are buffered in memory until flush() saves them all at once.
+
+                Args:
+                    file_name (str): The name of the Excel file to operate on.
+        """
+        self.file = file_name
+        self._pending = {}
+        self._replacements = {}
+        self._read_cache = {}
+        self._read_mtime = None
+        self._workbook = None
+        self._workbook_mtime = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _mtime(self):
+        return os.stat(self.file).st_mtime_ns
+
+    def _sheet_values(self, sheet_name):
+        """Return the cached cell values of a sheet, reloading them if the file changed on disk.
+
+                Returns:
+                    dict: A mapping of (row, col) to the non-empty cell values of the sheet.
+        """
+        mtime = self._mtime()
+        if mtime != self._read_mtime:
+            self._read_cache = {}
+            self._read_mtime = mtime
+
+        if sheet_name not in self._read_cache:
+            workbook = load_workbook(self.file, read_only=True)
+            try:
+                values = {}
+                for row_index, row in enumerate(workbook[sheet_name].iter_rows(values_only=True), start=1):
+                    for col_index, value in enumerate(row, start=1):
+                        if value is not None:
+                            values[(row_index, col_index)] = value
+            finally:
+                workbook.close()
+            self._read_cache[sheet_name] = values
+        return self._read_cache[sheet_name]
+
+    def _writable_workbook(self):
+        """Return the writable workbook, loading it again only if the file changed since it was loaded."""
+        mtime = self._mtime()
+        if self._workbook is None or mtime != self._workbook_mtime:
+            self._workbook = load_workbook(self.file)
+            self._workbook_mtime = mtime
+        return self._workbook
+
+    def read_data(self, sheet_name, row, col):
+        """Read data from a specific cell, including writes that have not been flushed yet.
+
+               Args:
+                   sheet_name (str): The name of the worksheet within the Excel file.
+                   row (int): The row number of the cell to read (1-indexed).
+                   col (int): The column number of the cell to read (1-indexed).
+
+               Returns:
+                   The value of the specified cell, or None if the cell is empty.
+        """
+        pending = self._pending.get(sheet_name, {})
+        if (row, col) in pending:
+            return pending[(row, col)]
+        return self._sheet_values(sheet_name).get((row, col))
+
+    def write_data(self, sheet_name, row, col, data):
+        """Buffer a write to a specific cell. The workbook is not touched until flush() is called.
+
+                Args:
+                    sheet_name (str): The name of the worksheet within the Excel file.
+                    row (int): The row number of the cell to write to (1-indexed).
+                    col (int): The column number of the cell to write to (1-indexed).
+                    data: The data to be written to the specified cell.
+        """
+        self._pending.setdefault(sheet_name, {})[(row, col)] = data
+
+    def replace_sheet(self, sheet_name, rows):
+        """Buffer the replacement of a whole sheet, which is created if the workbook does not have it yet.
+
+                The sheet is rebuilt from the rows in one pass at flush(), instead of one buffered write per cell.
+
+                Args:
+                    sheet_name (str): The name of the worksheet to replace.
+                    rows: The rows of the new sheet, each a sequence of cell values.
+        """
+        self._pending.pop(sheet_name, None)
+        self._replacements[sheet_name] = [list(row) for row in rows]
+
+    def pending_count(self):
+        """Return the number of buffered cell writes that have not been flushed yet."""
+        return sum(len(cells) for cells in self._pending.values())
+
+    @tracer.traced("excel", "ExcelResultRecorder.flush")
+    def flush(self):
+        """Save all buffered writes to the workbook in one atomic save.
+
+                The workbook is written to a temporary file next to the original, which then replaces the
+                original, so an interrupted save never leaves a truncated workbook behind.
+        """
+        if not self._pending and not self._replacements:
+            return
+
+        workbook = self._writable_workbook()
+        for sheet_name, rows in self._replacements.items():
+            if sheet_name in workbook.sheetnames:
+                index = workbook.sheetnames.index(sheet_name)
+                workbook.remove(workbook[sheet_name])
+                sheet = workbook.create_sheet(sheet_name, index)
+            else:
+                sheet = workbook.create_sheet(sheet_name)
+            for row in rows:
+                sheet.append(row)
+        for sheet_name, cells in self._pending.items():
+            sheet = workbook[sheet_name]
+            for (row, col), value in cells.items():
+                sheet.cell(row=row, column=col).value = value
+
+        directory = os.path.dirname(os.path.abspath(self.file))
+        fd, temp_path = tempfile.mkstemp(suffix=".xlsx", dir=directory)
+        os.close(fd)
+        try:
+            workbook.save(temp_path)
+            # mkstemp creates the file readable by its owner only; keep the workbook's permissions
+            if os.path.exists(self.file):
+                shutil.copymode(self.file, temp_path)
+            os.replace(temp_path, self.file)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            # The in-memory workbook now holds writes that never reached the disk
+            self._workbook = None
+            raise
+
+        mtime = self._mtime()
+        self._workbook_mtime = mtime
+        if self._read_mtime is not None:
+            # Keep the read cache valid by applying the flushed cells instead of reparsing the file
+            for sheet_name, cells in self._pending.items():
+                if sheet_name in self._read_cache:
+                    cached = self._read_cache[sheet_name]
+                    for key, value in cells.items():
+                        if value is None:
+                            cached.pop(key, None)
+                        else:
+                            cached[key] = value
+            for sheet_name in self._replacements:
+                self._read_cache.pop(sheet_name, None)
+            self._read_mtime = mtime
+        self._pending.clear()
+        self._replacements.clear()
+
+    def close(self):
+        """Flush any buffered writes and release the cached workbooks."""
+        try:
+            self.flush()
+        finally:
+            self._workbook = None
+            self._read_cache = {}
+            self._read_mtime = None
+
 
 class ExcelFunctions:
-    def __init__(self, file_name, sheet_name):
+    def __init__(self, file_name, sheet_name, recorder=None):
         """Initialize the ExcelFunctions with the given Excel file and sheet name.
 
                 Args:
                     file_name (str): The name of the Excel file to operate on.
                     sheet_name (str): The name of the worksheet within the Excel file.
+                    recorder (ExcelResultRecorder, optional): A session-scoped recorder to route reads and
+                        writes through. Without one, every call loads and saves the workbook directly.
         """
         self.file = file_name
         self.sheet = sheet_name
+        self.recorder = recorder
 
     def read_data(self, row, col):
         """Read data from a specific cell in the Excel sheet.
 
                This method loads the workbook, accesses the specified sheet, and retrieves the value from the cell
-               located at the provided row and column indices.
+               located at the provided row and column indices. When a recorder is set, the value is served
+               from its cache instead.
 
                Args:
                    row (int): The row number of the cell to read (1-indexed).
@@ -33,6 +216,8 @@ class ExcelFunctions:
                Returns:
                    The value of the specified cell, or None if the cell is empty.
         """
+        if self.recorder is not None:
+            return self.recorder.read_data(self.sheet, row, col)
         workbook = load_workbook(self.file)
         sheet = workbook[self.sheet]
         return sheet.cell(row=row, column=col).value
@@ -41,14 +226,30 @@ class ExcelFunctions:
         """Write data to a specific cell in the Excel sheet.
 
                 This method loads the workbook, accesses the specified sheet, writes the provided data to the cell
-                located at the given row and column indices, and then saves the workbook.
+                located at the given row and column indices, and then saves the workbook. When a recorder is set,
+                the write is buffered and saved when the recorder is flushed.
 
                 Args:
                     row (int): The row number of the cell to write to (1-indexed).
                     col (int): The column number of the cell to write to (1-indexed).
                     data: The data to be written to the specified cell.
         """
-        workbook = load_workbook(self.file)
-        sheet = workbook[self.sheet]
-        sheet.cell(row=row, column=col).value = data
-        workbook.save(self.file)
+        if self.recorder is not None:
+            self.recorder.write_data(self.sheet, row, col, data)
+            return
+        with tracer.span("excel", "ExcelFunctions.write_data"):
+            workbook = load_workbook(self.file)
+            sheet = workbook[self.sheet]
+            sheet.cell(row=row, column=col).value = data
+            workbook.save(self.file)
+
+    def write_result(self, case, data):
+        """Write the result of a test plan case to its row of the Result column.
+
+                Args:
+                    case (PlanCase): The case, as loaded from the test plan by utils/test_plan.py.
+                    data: The result to record, e.g. "Pass" or "Fail".
+        """
+        if case.result_column is None:
+            raise ValueError(f"The test plan has no Result column to record {case.case_id} in")
+        self.write_data(case.row, case.result_column, data)
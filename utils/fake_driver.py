@@ -0,0 +1,463 @@
+"""
+utils/fake_driver.py
+
+This module provides the FakeDriver class, an in-memory stand-in for a Selenium WebDriver. It loads the HTML
+fixture pages of data/fixture_site into an lxml DOM and implements the part of the WebDriver API the page
+objects use: element lookup, clicks, typing, text, title, current URL, cookies, screenshots and the scripts
+the framework runs, plus the navigation rules of the fixture pages.
+
+Purpose:
+- To test page objects and the result recording flow in milliseconds, without a browser process.
+"""
+import base64
+import functools
+import hashlib
+import re
+import struct
+import zlib
+from urllib.parse import urljoin, urlsplit
+
+import lxml.html
+from lxml.cssselect import CSSSelector
+from selenium.common.exceptions import (
+    InvalidSelectorException,
+    JavascriptException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+)
+from selenium.webdriver.common.by import By
+
+from utils.fixture_server import REDIRECTS, ROUTES, SESSION_COOKIE, SITE_DIRECTORY
+
+FAKE_BASE_URL = "http://orangehrm.fake"
+
+ERROR_CLASS = "oxd-text oxd-text--span oxd-input-field-error-message oxd-input-group__message"
+
+INVISIBLE_TAGS = {"head", "script", "style", "template", "title", "meta", "link"}
+
+# Characters in this range are WebDriver key codes (ENTER, TAB, ...), not text
+KEY_CODES = re.compile("[\ue000-\uf8ff]")
+
+
+def _normalize(text):
+    return " ".join(text.split())
+
+
+def _minimal_png(seed):
+    """Return an 8x8 PNG whose pixels are derived from the seed, so different pages give different frames."""
+    digest = hashlib.sha256(seed).digest() * 6
+    rows = b"".join(b"\x00" + digest[row * 24:(row + 1) * 24] for row in range(8))
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", 8, 8, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b"")
+
+
+def _xpath_for(by, value):
+    if by == By.XPATH:
+        return value
+    if by == By.ID:
+        return f"//*[@id='{value}']"
+    if by == By.NAME:
+        return f"//*[@name='{value}']"
+    if by == By.TAG_NAME:
+        return f"//{value}"
+    if by == By.CLASS_NAME:
+        return f"//*[contains(concat(' ', normalize-space(@class), ' '), ' {value} ')]"
+    return None
+
+
+@functools.lru_cache(maxsize=512)
+def _css_selector(selector):
+    return CSSSelector(selector)
+
+
+def _find_all(node, by, value, relative=False):
+    if by == By.CSS_SELECTOR:
+        return _css_selector(value)(node)
+    xpath = _xpath_for(by, value)
+    if xpath is None:
+        raise InvalidSelectorException(f"FakeDriver does not support locating elements by {by}")
+    if relative and by != By.XPATH:
+        xpath = "." + xpath
+    return [match for match in node.xpath(xpath) if isinstance(match, lxml.html.HtmlElement)]
+
+
+class FakeElement:
+    def __init__(self, driver, element):
+        self._driver = driver
+        self._element = element
+        self._generation = driver.navigation_generation
+
+    def __eq__(self, other):
+        return isinstance(other, FakeElement) and other._element is self._element
+
+    def __hash__(self):
+        return hash(self._element)
+
+    def __repr__(self):
+        return f"<FakeElement {self._element.tag} at {self._driver.current_url}>"
+
+    @property
+    def node(self):
+        """The underlying lxml element, checked for staleness like a real element reference."""
+        if self._generation != self._driver.navigation_generation:
+            raise StaleElementReferenceException("The element belongs to a page that is no longer loaded")
+        return self._element
+
+    @property
+    def tag_name(self):
+        return self.node.tag
+
+    @property
+    def text(self):
+        if not self.is_displayed():
+            return ""
+        return _normalize(self.node.text_content())
+
+    def get_attribute(self, name):
+        if name == "value" and self.node.tag in ("input", "textarea"):
+            return self.node.get("value", "")
+        return self.node.get(name)
+
+    def get_dom_attribute(self, name):
+        return self.node.get(name)
+
+    def is_displayed(self):
+        node = self.node
+        if node.tag == "input" and node.get("type") == "hidden":
+            return False
+        while node is not None:
+            style = (node.get("style") or "").replace(" ", "")
+            if node.tag in INVISIBLE_TAGS or node.get("hidden") is not None or "display:none" in style:
+                return False
+            node = node.getparent()
+        return True
+
+    def is_enabled(self):
+        return self.node.get("disabled") is None
+
+    def is_selected(self):
+        return self.node.get("checked") is not None or self.node.get("selected") is not None
+
+    def send_keys(self, *values):
+        node = self.node
+        typed = KEY_CODES.sub("", "".join(str(value) for value in values))
+        node.set("value", node.get("value", "") + typed)
+
+    def clear(self):
+        self.node.set("value", "")
+
+    def click(self):
+        self._driver._click(self.node)
+
+    def find_element(self, by=By.ID, value=None):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"Unable to locate element: {value}")
+        return elements[0]
+
+    def find_elements(self, by=By.ID, value=None):
+        return [FakeElement(self._driver, match) for match in _find_all(self.node, by, value, relative=True)]
+
+
+class FakeDriver:
+    def __init__(self, base_url=FAKE_BASE_URL, site_directory=SITE_DIRECTORY, routes=None, redirects=None,
+                 click_rules=None):
+        """Initialize the FakeDriver.
+
+                Args:
+                    base_url (str): The origin the fake pages are served from.
+                    site_directory (str): The directory holding the HTML pages.
+                    routes (dict, optional): URL path -> (page file, needs session). Defaults to the routes of
+                        the fixture server.
+                    redirects (dict, optional): URL path -> URL path. Defaults to the redirects of the fixture server.
+                    click_rules (dict, optional): XPath -> URL path. Clicking an element matched by (or inside an
+                        element matched by) the XPath opens the path, for pages without data-navigate attributes.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.site_directory = site_directory
+        self.routes = ROUTES if routes is None else routes
+        self.redirects = REDIRECTS if redirects is None else redirects
+        self.click_rules = dict(click_rules or {})
+        self.current_url = "about:blank"
+        self.navigation_generation = 0
+        self.cookies = {}
+        self.local_storage = {}
+        self.session_storage = {}
+        self.history = []
+        self.script_handlers = default_script_handlers()
+        self._document = lxml.html.document_fromstring("<html><head><title></title></head><body></body></html>")
+        self._pages = {}
+
+    # Navigation
+
+    def get(self, url):
+        """Load a page, following the fixture redirects and the login check of authenticated pages."""
+        self._load(urljoin(self.current_url if self.current_url != "about:blank" else self.base_url + "/", url))
+
+    def back(self):
+        if len(self.history) > 1:
+            self.history.pop()
+            self._load(self.history.pop())
+
+    def refresh(self):
+        self._load(self.current_url, record=False)
+
+    def _load(self, url, record=True):
+        parts = urlsplit(url)
+        path = parts.path.rstrip("/") or "/"
+        for _ in range(10):
+            if path in self.redirects:
+                path = self.redirects[path]
+                continue
+            page, needs_session = self.routes.get(path, (None, False))
+            if needs_session and SESSION_COOKIE not in self.cookies:
+                path = "/web/index.php/auth/login"
+                continue
+            break
+        if page is None:
+            raise ValueError(f"FakeDriver has no page for {url}")
+
+        self._document = lxml.html.document_fromstring(self._page_source(page))
+        self.current_url = f"{parts.scheme}://{parts.netloc}{path}"
+        self.navigation_generation += 1
+        if record:
+            self.history.append(self.current_url)
+
+    def _page_source(self, page):
+        if page not in self._pages:
+            with open(f"{self.site_directory}/{page}", encoding="utf-8") as page_file:
+                self._pages[page] = page_file.read()
+        return self._pages[page]
+
+    def _click(self, node):
+        for xpath, target in self.click_rules.items():
+            matches = self._document.xpath(xpath)
+            if any(ancestor in matches for ancestor in node.iterancestors()) or node in matches:
+                return self.get(target)
+
+        trigger = next((el for el in [node, *node.iterancestors()] if el.get("data-navigate") is not None), None)
+        if trigger is not None:
+            if self._missing_required_fields(trigger):
+                return None
+            if trigger.get("data-login") is not None:
+                self.cookies[SESSION_COOKIE] = {"name": SESSION_COOKIE, "value": "fixture-session", "path": "/"}
+            return self.get(trigger.get("data-navigate"))
+
+        link = next((el for el in [node, *node.iterancestors()] if el.tag == "a" and el.get("href")), None)
+        if link is not None and not link.get("href").startswith("#"):
+            return self.get(link.get("href"))
+        return None
+
+    def _missing_required_fields(self, trigger):
+        """Apply the data-required rule of fixture.js: add a "Required" message to each empty field's group."""
+        missing = []
+        for name in (trigger.get("data-required") or "").split():
+            field = self._document.xpath(f"//input[@name='{name}']")[0]
+            group = next(el for el in field.iterancestors() if "oxd-input-group" in (el.get("class") or "").split())
+            errors = group.xpath(".//*[contains(@class, 'oxd-input-field-error-message')]")
+            if field.get("value", "").strip():
+                for error in errors:
+                    error.drop_tree()
+                continue
+            if not errors:
+                error = lxml.html.Element("span")
+                error.set("class", ERROR_CLASS)
+                error.text = "Required"
+                group.append(error)
+            missing.append(name)
+        return missing
+
+    # Page state
+
+    @property
+    def title(self):
+        titles = self._document.xpath("//title")
+        return _normalize(titles[0].text_content()) if titles else ""
+
+    @property
+    def page_source(self):
+        return lxml.html.tostring(self._document, encoding="unicode")
+
+    def find_element(self, by=By.ID, value=None):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"Unable to locate element: {value}")
+        return elements[0]
+
+    def find_elements(self, by=By.ID, value=None):
+        return [FakeElement(self, match) for match in _find_all(self._document, by, value)]
+
+    # Cookies
+
+    def get_cookies(self):
+        return [dict(cookie) for cookie in self.cookies.values()]
+
+    def get_cookie(self, name):
+        return self.cookies.get(name)
+
+    def add_cookie(self, cookie):
+        self.cookies[cookie["name"]] = dict(cookie)
+
+    def delete_cookie(self, name):
+        self.cookies.pop(name, None)
+
+    def delete_all_cookies(self):
+        self.cookies = {}
+
+    # Scripts
+
+    def execute_script(self, script, *args):
+        """Run a script the framework uses by calling its registered Python equivalent.
+
+                Raises:
+                    JavascriptException: If no equivalent is registered, like a browser would for a broken script.
+        """
+        handler = self.script_handlers.get(script.strip())
+        if handler is None:
+            raise JavascriptException(f"FakeDriver cannot run script: {script.strip()[:60]}")
+        return handler(self, *args)
+
+    def execute_async_script(self, script, *args):
+        return self.execute_script(script, *args)
+
+    def register_script(self, script, handler):
+        """Register the Python equivalent of a script, called as handler(driver, *args)."""
+        self.script_handlers[script.strip()] = handler
+
+    def css_select(self, selector):
+        """Return the elements matching a CSS selector on the current page."""
+        return [FakeElement(self, match) for match in _css_selector(selector)(self._document)]
+
+    # Screenshots and window
+
+    def get_screenshot_as_png(self):
+        return _minimal_png(f"{self.current_url}\n{self.page_source}".encode())
+
+    def get_screenshot_as_base64(self):
+        return base64.b64encode(self.get_screenshot_as_png()).decode("ascii")
+
+    def save_screenshot(self, filename):
+        with open(filename, "wb") as screenshot_file:
+            screenshot_file.write(self.get_screenshot_as_png())
+        return True
+
+    def maximize_window(self):
+        pass
+
+    def set_window_size(self, width, height):
+        pass
+
+    def quit(self):
+        self._document = None
+
+
+def _visible_menu_texts(driver, selector):
+    return [text for text in (el.text for el in driver.css_select(selector)) if text]
+
+
+def _wait_for_settled(driver, quiet_ms, timeout_ms):
+    return True  # The in-memory DOM only changes when the test changes it
+
+
+def _wait_for_condition(driver, kind, using, value, timeout_ms):
+    def check():
+        if kind == "url":
+            return True if value in driver.current_url else None
+        elements = driver.find_elements(By.CSS_SELECTOR if using == "css" else By.XPATH, value)
+        if not elements or kind == "presence":
+            return elements[0] if elements else None
+        if not elements[0].is_displayed():
+            return None
+        return elements[0] if kind == "visible" or elements[0].is_enabled() else None
+
+    # Nothing changes the in-memory DOM while the script waits, so the outcome at the timeout is known now
+    return check()
+
+
+def _fill_form(driver, fields, submit):
+    def first(using, value):
+        matches = driver.find_elements(By.CSS_SELECTOR if using == "css" else By.XPATH, value)
+        return matches[0] if matches else None
+
+    rejected = []
+    for index, (using, value, text) in enumerate(fields):
+        element = first(using, value)
+        if element is None or element.tag_name not in ("input", "textarea") or not element.is_enabled() \
+                or element.get_attribute("readonly") is not None:
+            rejected.append(index)
+            continue
+        element.node.set("value", text)
+
+    submitted = False
+    if submit and not rejected:
+        button = first(*submit)
+        if button is not None and button.is_enabled():
+            button.click()
+            submitted = True
+    return {"rejected": rejected, "submitted": submitted}
+
+
+def _reset_storage(driver):
+    driver.local_storage.clear()
+    driver.session_storage.clear()
+
+
+def _storage_snapshot(driver):
+    return {"local": dict(driver.local_storage), "session": dict(driver.session_storage)}
+
+
+def _storage_restore(driver, snapshot):
+    driver.local_storage.update(snapshot["local"])
+    driver.session_storage.update(snapshot["session"])
+
+
+def default_script_handlers():
+    """Return the Python equivalents of the scripts the page objects and utilities run in the browser."""
+    from pages.admin_page import VISIBLE_MENU_TEXT_SCRIPT
+    from pages.base_page import FILL_FORM_SCRIPT
+    from utils.dom_settle import WAIT_FOR_SETTLED_SCRIPT
+    from utils.driver_pool import RESET_STORAGE_SCRIPT
+    from utils.event_waits import WAIT_FOR_CONDITION_SCRIPT
+    from utils.session_cache import STORAGE_RESTORE_SCRIPT, STORAGE_SNAPSHOT_SCRIPT
+
+    handlers = {
+        VISIBLE_MENU_TEXT_SCRIPT: _visible_menu_texts,
+        WAIT_FOR_SETTLED_SCRIPT: _wait_for_settled,
+        WAIT_FOR_CONDITION_SCRIPT: _wait_for_condition,
+        FILL_FORM_SCRIPT: _fill_form,
+        RESET_STORAGE_SCRIPT: _reset_storage,
+        STORAGE_SNAPSHOT_SCRIPT: _storage_snapshot,
+        STORAGE_RESTORE_SCRIPT: _storage_restore,
+        "return document.readyState": lambda driver: "complete",
+    }
+    return {script.strip(): handler for script, handler in handlers.items()}
+
+
+def page_states():
+    """Return a FakeDriver on each state of the fixture pages the locators are used on, by state name.
+
+    Besides one state per page, "forgot_password_required" is the forgot password page after submitting it
+    empty, which shows the "Required" message.
+    """
+    def on(path, session=False):
+        driver = FakeDriver()
+        if session:
+            driver.add_cookie({"name": SESSION_COOKIE, "value": "fixture-session", "path": "/"})
+        driver.get(path)
+        return driver
+
+    states = {
+        "login": on("/web/index.php/auth/login"),
+        "forgot_password": on("/web/index.php/auth/requestPasswordResetCode"),
+        "reset_success": on("/web/index.php/auth/sendPasswordReset"),
+        "dashboard": on("/web/index.php/dashboard/index", session=True),
+        "admin": on("/web/index.php/admin/viewSystemUsers", session=True),
+    }
+    required = on("/web/index.php/auth/requestPasswordResetCode")
+    required.find_element(By.CSS_SELECTOR, "[data-required]").click()
+    states["forgot_password_required"] = required
+    return states
@@ -0,0 +1,114 @@
+"""
+utils/fixture_server.py
+
+This module provides the FixtureServer class, a threaded local HTTP server that serves static copies of the
+OrangeHRM pages under test (login, forgot password, reset success, dashboard and Admin > User Management)
+from data/fixture_site, so the suite can run offline and at local speed.
+
+Purpose:
+- To stand in for https://opensource-demo.orangehrmlive.com with the same URLs and the DOM structure the
+  locators and page objects depend on.
+"""
+import os
+import threading
+from http.cookies import SimpleCookie
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+SITE_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "fixture_site")
+
+SESSION_COOKIE = "orangehrm"
+
+# URL path -> (page file, whether the page needs a logged-in session)
+ROUTES = {
+    "/web/index.php/auth/login": ("login.html", False),
+    "/web/index.php/auth/requestPasswordResetCode": ("forgot_password.html", False),
+    "/web/index.php/auth/sendPasswordReset": ("reset_success.html", False),
+    "/web/index.php/dashboard/index": ("dashboard.html", True),
+    "/web/index.php/admin/viewSystemUsers": ("admin.html", True),
+}
+
+REDIRECTS = {
+    "/": "/web/index.php/auth/login",
+    "/web/index.php": "/web/index.php/auth/login",
+    "/web/index.php/admin/viewAdminModule": "/web/index.php/admin/viewSystemUsers",
+}
+
+
+class FixtureRequestHandler(SimpleHTTPRequestHandler):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=SITE_DIRECTORY, **kwargs)
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0].rstrip("/") or "/"
+        if path in REDIRECTS:
+            return self._redirect(REDIRECTS[path])
+        if path in ROUTES:
+            page, needs_session = ROUTES[path]
+            if needs_session and not self._has_session():
+                return self._redirect("/web/index.php/auth/login")
+            self.path = "/" + page
+        return super().do_GET()
+
+    def end_headers(self):
+        # Pages must be fetched again after a login or logout, as on the real site
+        self.send_header("Cache-Control", "no-store")
+        super().end_headers()
+
+    def _has_session(self):
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        return SESSION_COOKIE in cookie
+
+    def _redirect(self, location):
+        self.send_response(302)
+        self.send_header("Location", location)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass  # Keep the test output clean
+
+
+class FixtureServer:
+    def __init__(self, host="127.0.0.1", port=0):
+        """Initialize the FixtureServer.
+
+                Args:
+                    host (str): The interface to listen on.
+                    port (int): The port to listen on; 0 picks a free port.
+        """
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def base_url(self):
+        """The base URL of the running server, e.g. "http://127.0.0.1:54321"."""
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """Start serving in a background thread.
+
+                Returns:
+                    FixtureServer: The server itself, for use as a context manager.
+        """
+        self._server = ThreadingHTTPServer((self.host, self.port), FixtureRequestHandler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fixture-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the server and wait for its thread to finish."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+            self._thread = None
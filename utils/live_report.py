@@ -0,0 +1,262 @@
+"""
+utils/live_report.py
+
+This module provides the LiveReport class, a lightweight HTML report written as a directory: one row is
+appended to index.html as each test finishes, and screenshots are copied next to it as files, shown as small
+thumbnails that open the full image on click, instead of being embedded as base64. The directory can be packed
+into a single zip file for sharing.
+
+Purpose:
+- To keep the report small and quick to open however many screenshots a run takes, and readable while the
+  run is still going.
+"""
+import html
+import os
+import shutil
+import time
+import zipfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+from PIL import Image
+
+THUMBNAIL_SIZE = (320, 200)
+
+# Lists the files the report wrote, so opening it again only removes those
+MANIFEST = ".live-report"
+
+OUTCOMES = ("passed", "failed", "skipped")
+
+STYLE = """
+body { font-family: Helvetica, Arial, sans-serif; font-size: 12px; color: #333; }
+h1 { font-size: 20px; }
+table { border-collapse: collapse; width: 100%; }
+th, td { border: 1px solid #e6e6e6; padding: 4px 6px; text-align: left; vertical-align: top; }
+tr.passed td.outcome { color: #2e7d32; }
+tr.failed td.outcome { color: #c62828; font-weight: bold; }
+tr.skipped td.outcome { color: #ef6c00; }
+img.thumbnail { max-width: 160px; max-height: 100px; border: 1px solid #ccc; margin: 2px; }
+pre { white-space: pre-wrap; max-height: 300px; overflow: auto; }
+"""
+
+
+def make_thumbnail(source, target, size=THUMBNAIL_SIZE):
+    """Write a JPEG thumbnail of an image, keeping its aspect ratio."""
+    with Image.open(source) as image:
+        image.thumbnail(size)
+        image.convert("RGB").save(target, format="JPEG", quality=70, optimize=True)
+
+
+def _copy(source, target):
+    """Hard-link a file where the file system allows it, otherwise copy it."""
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+class LiveReport:
+    def __init__(self, directory, title="Test report", thumbnail_size=THUMBNAIL_SIZE, workers=2):
+        """Initialize the LiveReport.
+
+                Args:
+                    directory (str): The report directory; it must be new, empty or hold an earlier live report.
+                    title (str): The title of the report.
+                    thumbnail_size (tuple): The largest (width, height) of a thumbnail.
+                    workers (int): The number of background threads generating thumbnails.
+        """
+        self.directory = directory
+        self.title = title
+        self.thumbnail_size = thumbnail_size
+        self.workers = workers
+        self.index = os.path.join(directory, "index.html")
+        self.counts = Counter()
+        self._file = None
+        self._manifest = None
+        self._written = []
+        self._started = None
+        self._executor = None
+        self._futures = []
+        self._pending = {}
+
+    def _remove_previous(self):
+        """Remove the files of an earlier live report from the directory, and nothing else.
+
+                Raises:
+                    FileExistsError: If the directory holds files but no live report manifest.
+        """
+        manifest = os.path.join(self.directory, MANIFEST)
+        if not os.path.exists(manifest):
+            if os.path.isdir(self.directory) and os.listdir(self.directory):
+                raise FileExistsError(
+                    f"{self.directory} is not empty and holds no live report; choose a new or empty directory"
+                )
+            return
+        with open(manifest, encoding="utf-8") as manifest_file:
+            names = [line.rstrip("\n") for line in manifest_file if line.strip()]
+        for name in names:
+            path = os.path.normpath(os.path.join(self.directory, name))
+            # Only files inside the report directory, whatever the manifest says
+            if os.path.relpath(path, self.directory).startswith(os.pardir + os.sep):
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        os.remove(manifest)
+        for folder in ("screenshots", "thumbnails"):
+            try:
+                os.rmdir(os.path.join(self.directory, folder))
+            except OSError:
+                pass  # Missing, or holds files the report did not write
+
+    def _record(self, name):
+        """Add a file of the report, relative to its directory, to the manifest."""
+        self._written.append(name)
+        self._manifest.write(name + "\n")
+
+    def open(self, **metadata):
+        """Remove the files of an earlier live report in the directory and write the head of index.html.
+
+                Args:
+                    **metadata: Facts about the run shown above the results, such as the run ID.
+
+                Raises:
+                    FileExistsError: If the directory holds other files and no earlier live report.
+        """
+        self._remove_previous()
+        os.makedirs(os.path.join(self.directory, "screenshots"), exist_ok=True)
+        os.makedirs(os.path.join(self.directory, "thumbnails"), exist_ok=True)
+        self._manifest = open(os.path.join(self.directory, MANIFEST), "w", encoding="utf-8", buffering=1)
+        self._written = []
+        self._record("index.html")
+        self._started = time.time()
+        facts = "".join(
+            f"<tr><th>{html.escape(str(name))}</th><td>{html.escape(str(value))}</td></tr>"
+            for name, value in metadata.items()
+        )
+        # Line buffered, so every row reaches the disk as soon as it is written
+        self._file = open(self.index, "w", encoding="utf-8", buffering=1)
+        self._file.write(
+            f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"/><title>{html.escape(self.title)}</title>"
+            f"<style>{STYLE}</style></head><body>\n<h1>{html.escape(self.title)}</h1>\n"
+            f"<table id=\"metadata\">{facts}</table>\n<h2>Results</h2>\n"
+            "<table id=\"results\"><thead><tr><th>Result</th><th>Test</th><th>Duration (s)</th>"
+            "<th>Screenshots</th><th>Details</th></tr></thead><tbody>\n"
+        )
+
+    def _store(self, source, name):
+        """Copy a screenshot into the report and queue its thumbnail."""
+        target = os.path.join(self.directory, "screenshots", name)
+        _copy(source, target)
+        thumbnail_name = os.path.splitext(name)[0] + ".jpg"
+        self._record(f"screenshots/{name}")
+        self._record(f"thumbnails/{thumbnail_name}")
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="thumbnail")
+        self._futures.append(self._executor.submit(
+            make_thumbnail, target, os.path.join(self.directory, "thumbnails", thumbnail_name), self.thumbnail_size,
+        ))
+
+    def _store_pending(self):
+        """Copy the screenshots that were still being written when their row was added, if they exist by now."""
+        for name, source in list(self._pending.items()):
+            if os.path.exists(source):
+                del self._pending[name]
+                self._store(source, name)
+
+    def _screenshot_cell(self, paths):
+        links = []
+        for path in paths:
+            name = os.path.basename(path)
+            target = os.path.join(self.directory, "screenshots", name)
+            if not os.path.exists(target) and name not in self._pending:
+                if os.path.exists(path):
+                    self._store(path, name)
+                else:
+                    self._pending[name] = path  # Still being written; copied by a later row or by close()
+            full = f"screenshots/{quote(name)}"
+            thumbnail = f"thumbnails/{quote(os.path.splitext(name)[0] + '.jpg')}"
+            links.append(
+                f"<a href=\"{full}\" target=\"_blank\"><img class=\"thumbnail\" src=\"{thumbnail}\" "
+                f"loading=\"lazy\" alt=\"{html.escape(name)}\"/></a>"
+            )
+        return "".join(links)
+
+    def add(self, test, outcome, duration, screenshots=(), message=None, retries=()):
+        """Append the row of a finished test to the report.
+
+                Args:
+                    test (str): The test's node ID.
+                    outcome (str): "passed", "failed" or "skipped".
+                    duration (float): The test's duration in seconds, over all phases.
+                    screenshots: The paths of the test's screenshots; they are copied into the report as soon as
+                        they exist, so screenshots still being written are linked now and copied later.
+                    message (str, optional): The failure or skip message.
+                    retries: The step retries of the test, as dictionaries with step, attempt and error keys.
+        """
+        self.counts[outcome] += 1
+        self._store_pending()
+        details = "".join(
+            f"<div>Retried {html.escape(retry['step'])} (attempt {retry['attempt'] + 1}) after "
+            f"{html.escape(retry['error'])}</div>"
+            for retry in retries
+        )
+        if message:
+            details += f"<details{' open' if outcome == 'failed' else ''}><summary>{outcome}</summary>" \
+                       f"<pre>{html.escape(message)}</pre></details>"
+        self._file.write(
+            f"<tr class=\"{outcome}\"><td class=\"outcome\">{outcome}</td><td>{html.escape(test)}</td>"
+            f"<td>{duration:.2f}</td><td>{self._screenshot_cell(screenshots)}</td><td>{details}</td></tr>\n"
+        )
+
+    def close(self):
+        """Copy the screenshots written since their rows were added, write the totals and close index.html.
+
+                Screenshots that still do not exist, e.g. removed by the screenshot retention, are left out. Waits
+                for the thumbnails to be generated.
+        """
+        if self._file is None:
+            return
+        self._store_pending()
+        self._pending = {}
+        totals = ", ".join(f"{self.counts[outcome]} {outcome}" for outcome in OUTCOMES)
+        self._file.write(
+            f"</tbody></table>\n<p id=\"totals\">{totals} in {time.time() - self._started:.1f} s</p>\n"
+            "</body></html>\n"
+        )
+        self._file.close()
+        self._file = None
+        self._manifest.close()
+        self._manifest = None
+        if self._executor is not None:
+            for future in self._futures:
+                try:
+                    future.result()
+                except OSError as exc:
+                    print(f"Could not create a thumbnail: {exc}")
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            self._futures = []
+
+    def archive(self, path=None):
+        """Pack the files of the report into a single zip file.
+
+                Screenshots and thumbnails are stored as they are, since they are compressed already.
+
+                Args:
+                    path (str, optional): The zip file to write. Defaults to the directory name plus ".zip".
+
+                Returns:
+                    str: The path of the zip file.
+        """
+        path = path or self.directory.rstrip("/\\") + ".zip"
+        with zipfile.ZipFile(path, "w") as archive:
+            for name in self._written:
+                full_path = os.path.join(self.directory, name)
+                if not os.path.exists(full_path):
+                    continue  # A thumbnail that could not be created
+                compression = zipfile.ZIP_DEFLATED if name.endswith(".html") else zipfile.ZIP_STORED
+                archive.write(full_path, name, compress_type=compression)
+        return path
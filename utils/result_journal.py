@@ -0,0 +1,165 @@
+"""
+utils/result_journal.py
+
+This module provides the ResultJournal class, an append-only, per-worker log of test results, and the
+merge_journals function, which folds the journals of all workers into the Excel workbook in one pass.
+
+Purpose:
+- To let several pytest worker processes record Pass/Fail results without sharing (or locking) the workbook.
+"""
+import glob
+import json
+import os
+import time
+
+from utils.run_context import worker_id
+from utils.timing import tracer
+
+JOURNAL_PATTERN = "journal-*.jsonl"
+
+
+class ResultJournal:
+    def __init__(self, directory, worker=None, reader=None):
+        """Open the journal of one worker for appending.
+
+                Args:
+                    directory (str): The directory shared by the journals of all workers of a run.
+                    worker (str, optional): The worker ID. Defaults to the ID of the current process.
+                    reader (ExcelResultRecorder, optional): Used to answer read_data() for cells this
+                        journal has not written.
+        """
+        self.worker = worker or worker_id()
+        self.reader = reader
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"journal-{self.worker}.jsonl")
+        # Line buffering writes every record with a single append, so a crash loses at most one line
+        self._file = open(self.path, "a", encoding="utf-8", buffering=1)
+        self._sequence = 0
+        self._written = {}
+        self._test = None
+        self._test_started = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def start_test(self, test_id=None):
+        """Mark the start of a test, so the records it writes carry the test ID and its duration so far.
+
+                Args:
+                    test_id (str, optional): The pytest node ID of the test.
+        """
+        self._test = test_id
+        self._test_started = time.perf_counter()
+
+    def read_data(self, sheet_name, row, col):
+        """Read a cell, preferring the value this journal last wrote to it.
+
+               Returns:
+                   The value of the specified cell, or None if it is unknown.
+        """
+        key = (sheet_name, row, col)
+        if key in self._written:
+            return self._written[key]
+        if self.reader is not None:
+            return self.reader.read_data(sheet_name, row, col)
+        return None
+
+    @tracer.traced("excel", "ResultJournal.write_data")
+    def write_data(self, sheet_name, row, col, data, duration=None):
+        """Append a result record to the journal.
+
+                Args:
+                    sheet_name (str): The name of the worksheet the result belongs to.
+                    row (int): The row number of the cell (1-indexed).
+                    col (int): The column number of the cell (1-indexed).
+                    data: The value to record, e.g. "Pass" or "Fail".
+                    duration (float, optional): The test duration in seconds. Defaults to the time since
+                        start_test() was called.
+        """
+        if duration is None and self._test_started is not None:
+            duration = time.perf_counter() - self._test_started
+        record = {
+            "sheet": sheet_name,
+            "row": row,
+            "col": col,
+            "value": data,
+            "timestamp": time.time(),
+            "duration": duration,
+            "worker": self.worker,
+            "seq": self._sequence,
+            "test": self._test,
+        }
+        self._file.write(json.dumps(record, default=str) + "\n")
+        self._sequence += 1
+        self._written[(sheet_name, row, col)] = data
+
+    def close(self):
+        """Close the journal file."""
+        if not self._file.closed:
+            self._file.close()
+
+
+def read_journals(directory):
+    """Yield the records of every journal in the directory.
+
+    A partially written last line (e.g. from a worker that crashed mid-write) is skipped.
+
+    Args:
+        directory (str): The directory holding the journal files.
+
+    Yields:
+        dict: One result record per journal line.
+    """
+    for path in sorted(glob.glob(os.path.join(directory, JOURNAL_PATTERN))):
+        with open(path, encoding="utf-8") as journal:
+            for line in journal:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+
+def _worker_number(worker):
+    """Return the number of an xdist worker ID, e.g. 10 for "gw10", or -1 for the controller ("main")."""
+    return int(worker[2:]) if worker.startswith("gw") and worker[2:].isdigit() else -1
+
+
+def _merge_rank(record):
+    # A failure reported by any worker is never hidden by another worker's pass
+    return record["value"] == "Fail", _worker_number(record["worker"])
+
+
+@tracer.traced("excel")
+def merge_journals(directory, recorder):
+    """Fold all journals of a run into the workbook with a single save.
+
+    When several records target the same cell, the result does not depend on clocks or scheduling: within a
+    worker's journal the last record wins, and between workers a "Fail" wins over any other value, then the
+    value of the worker with the highest number ("gw10" over "gw9", any worker over the controller).
+
+    Args:
+        directory (str): The directory holding the journal files.
+        recorder (ExcelResultRecorder): The recorder of the workbook to merge into.
+
+    Returns:
+        int: The number of cells written.
+    """
+    per_worker = {}
+    for record in read_journals(directory):
+        key = (record["sheet"], record["row"], record["col"], record["worker"])
+        if key not in per_worker or record["seq"] > per_worker[key]["seq"]:
+            per_worker[key] = record
+
+    latest = {}
+    for (sheet_name, row, col, _), record in per_worker.items():
+        key = (sheet_name, row, col)
+        if key not in latest or _merge_rank(record) > _merge_rank(latest[key]):
+            latest[key] = record
+
+    for (sheet_name, row, col), record in sorted(latest.items()):
+        recorder.write_data(sheet_name, row, col, record["value"])
+    recorder.flush()
+    return len(latest)
@@ -0,0 +1,39 @@
+"""
+utils/run_context.py
+
+This module identifies the current test run and the worker process executing it, so that files written by
+parallel workers (result journals, traces, history) can be grouped per run and kept apart per worker.
+
+Purpose:
+- To give every process of one pytest run the same run ID and a distinct worker ID.
+"""
+import os
+from datetime import datetime
+
+RUN_ID_ENV = "ORANGEHRM_RUN_ID"
+
+
+def run_id():
+    """Return the ID of the current test run, creating it on first use.
+
+    The ID is stored in the environment, so worker processes started after the controller called this
+    function inherit the same value.
+
+    Returns:
+        str: The run ID, e.g. "20241101_182052_4242".
+    """
+    value = os.environ.get(RUN_ID_ENV)
+    if not value:
+        value = f"{datetime.now():%Y%m%d_%H%M%S}_{os.getpid()}"
+        os.environ[RUN_ID_ENV] = value
+    return value
+
+
+def worker_id():
+    """Return the ID of the current worker process ("gw0", "gw1", ... under pytest-xdist, "main" otherwise)."""
+    return os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+
+def is_worker(config):
+    """Check whether the given pytest config belongs to an xdist worker rather than the controller."""
+    return hasattr(config, "workerinput")
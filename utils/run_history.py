@@ -0,0 +1,149 @@
+"""
+utils/run_history.py
+
+This module provides the RunHistory class, an append-only JSON-lines store with one record per test per run
+(outcome, duration, worker and environment), and the summarize function, which computes per-test flake rate,
+p50/p95 duration and trends over the whole history with vectorized pandas operations.
+
+Purpose:
+- To keep the results of every run instead of only the last one, and to show which tests are flaky or slowing
+  down.
+"""
+import json
+import os
+import time
+
+import pandas as pd
+
+SUMMARY_SHEET = "Run history"
+
+RECORD_FIELDS = (
+    "run_id", "test", "case_id", "outcome", "duration", "worker", "environment", "browser_profile", "timestamp",
+)
+
+SUMMARY_COLUMNS = (
+    "test", "runs", "failures", "fail_rate", "flake_rate", "p50_duration", "p95_duration", "duration_trend",
+    "recent_fail_rate", "last_outcome", "last_run", "environment",
+)
+
+SUMMARY_HEADERS = (
+    "Test", "Runs", "Failures", "Fail rate", "Flake rate", "p50 duration (s)", "p95 duration (s)",
+    "Duration trend (s/run)", "Recent fail rate", "Last outcome", "Last run", "Environment",
+)
+
+
+class RunHistory:
+    def __init__(self, path):
+        """Initialize the RunHistory.
+
+                Args:
+                    path (str): The JSON-lines file the records are appended to.
+        """
+        self.path = path
+
+    def append(self, records):
+        """Append test records to the history in one write.
+
+                Args:
+                    records: Dictionaries with the RECORD_FIELDS; a missing timestamp is set to now.
+        """
+        now = time.time()
+        lines = "".join(
+            json.dumps({field: record.get(field, now if field == "timestamp" else None) for field in RECORD_FIELDS})
+            + "\n"
+            for record in records
+        )
+        if not lines:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as history_file:
+            history_file.write(lines)
+
+    def load(self):
+        """Load the whole history as a DataFrame with one row per record, oldest first.
+
+                Lines that cannot be parsed, such as a line cut short by a crash, are skipped.
+        """
+        if not os.path.exists(self.path):
+            return pd.DataFrame(columns=RECORD_FIELDS)
+        try:
+            history = pd.read_json(self.path, lines=True, dtype=False)
+        except ValueError:
+            records = []
+            with open(self.path, encoding="utf-8") as history_file:
+                for line in history_file:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue
+            history = pd.DataFrame.from_records(records)
+        history = history.reindex(columns=RECORD_FIELDS)
+        history["duration"] = pd.to_numeric(history["duration"], errors="coerce").fillna(0.0)
+        return history.sort_values("timestamp", kind="stable", ignore_index=True)
+
+
+def summarize(history, recent=10):
+    """Compute per-test statistics over a run history, without a Python loop over tests or runs.
+
+    Skipped tests are left out. The flake rate is the share of consecutive runs of a test whose outcome
+    differs (pass then fail, or fail then pass); a test that always fails is broken, not flaky. The duration
+    trend is the least-squares slope of the duration over the test's runs, in seconds per run.
+
+    Args:
+        history (DataFrame): Records as returned by RunHistory.load().
+        recent (int): The number of latest runs the recent fail rate is computed over.
+
+    Returns:
+        DataFrame: One row per test with the SUMMARY_COLUMNS, most flaky first.
+    """
+    history = history.reindex(columns=RECORD_FIELDS)
+    history = history[history["outcome"].isin(["passed", "failed"])]
+    if history.empty:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+
+    history = history.sort_values("timestamp", kind="stable")
+    grouped = history.groupby("test", sort=False)
+    failed = history["outcome"].eq("failed").astype(float)
+    run_index = grouped.cumcount().astype(float)
+    duration = history["duration"].astype(float)
+    frame = history.assign(
+        failed=failed,
+        flip=failed.groupby(history["test"]).diff().abs(),
+        x=run_index,
+        xx=run_index * run_index,
+        xy=run_index * duration,
+        recent_failed=failed.where(grouped.cumcount(ascending=False) < recent),
+    )
+
+    stats = frame.groupby("test").agg(
+        runs=("failed", "size"),
+        failures=("failed", "sum"),
+        fail_rate=("failed", "mean"),
+        flips=("flip", "sum"),
+        mean_x=("x", "mean"),
+        mean_xx=("xx", "mean"),
+        mean_xy=("xy", "mean"),
+        mean_duration=("duration", "mean"),
+        recent_fail_rate=("recent_failed", "mean"),
+        last_outcome=("outcome", "last"),
+        last_run=("run_id", "last"),
+        environment=("environment", "last"),
+    )
+    quantiles = frame.groupby("test")["duration"].quantile([0.5, 0.95]).unstack()
+
+    variance = stats["mean_xx"] - stats["mean_x"] ** 2
+    covariance = stats["mean_xy"] - stats["mean_x"] * stats["mean_duration"]
+    stats["duration_trend"] = (covariance / variance.where(variance > 0)).fillna(0.0)
+    stats["flake_rate"] = (stats["flips"] / (stats["runs"] - 1).where(stats["runs"] > 1)).fillna(0.0)
+    stats["p50_duration"] = quantiles[0.5]
+    stats["p95_duration"] = quantiles[0.95]
+    stats["failures"] = stats["failures"].astype(int)
+
+    summary = stats.reset_index().reindex(columns=SUMMARY_COLUMNS)
+    return summary.sort_values(["flake_rate", "fail_rate", "p95_duration"], ascending=False, ignore_index=True)
+
+
+def summary_rows(summary, digits=3):
+    """Return the summary as worksheet rows, headers first, with the floats rounded."""
+    rounded = summary.round(digits).astype(object).where(summary.notna(), None)
+    return [list(SUMMARY_HEADERS)] + rounded.values.tolist()
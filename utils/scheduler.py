@@ -0,0 +1,339 @@
+"""
+utils/scheduler.py
+
+This module provides the Scheduler pytest plugin, which orders and selects the collected tests. Ordered by
+history, recent failures and the slowest tests start first, so parallel workers do not end the run waiting on
+one long test started last. Selected by impact, only the tests depending on changed files run: the plugin
+records which page objects and locator classes each test touched (see utils/dependencies.py) in a dependency
+map, and matches them against the files, classes and functions a change touches.
+
+Purpose:
+- To shorten the wall time of a run, and to run only what a change can break.
+"""
+import ast
+import fnmatch
+import json
+import os
+import re
+import subprocess
+
+import pytest
+from utils.dependencies import dependencies
+from utils.run_context import is_worker
+from utils.run_history import RunHistory, summarize
+
+# Changed files outside the dependency map that cannot affect a test; any other unmapped change selects all tests
+IMPACT_FREE_PATTERNS = (
+    "*.md", "*.docx", "*.png", ".gitignore", ".idea/*", "benchmarks/*", "reports/*", "screenshots/*",
+)
+
+_HUNK = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+class DependencyMap:
+    def __init__(self, path):
+        """Initialize the DependencyMap.
+
+                Args:
+                    path (str): The JSON file mapping test node IDs to the dependencies they touched.
+        """
+        self.path = path
+        self.tests = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as map_file:
+                self.tests = json.load(map_file)
+
+    def record(self, test, touched, passed):
+        """Record the dependencies a test touched in this run.
+
+                A test that failed may have stopped before touching everything it depends on, so its new
+                dependencies are added to the known ones instead of replacing them.
+        """
+        if passed:
+            self.tests[test] = sorted(touched)
+        else:
+            self.tests[test] = sorted(set(self.tests.get(test, ())) | set(touched))
+
+    def save(self):
+        """Write the map, replacing the file atomically."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as map_file:
+            json.dump(self.tests, map_file, indent=1, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+    def files(self):
+        """Return every file some test depends on."""
+        return {dependency.split("::")[0] for touched in self.tests.values() for dependency in touched}
+
+
+def symbols_at(source, lines):
+    """Return the qualified names of the innermost classes or functions containing the given lines.
+
+    Args:
+        source (str): Python source code.
+        lines: Line numbers (1-indexed).
+
+    Returns:
+        set: Names such as "ForgotPasswordPage" or "TestOrangeHRM.test_tc_01_empty_username". None stands for
+        lines outside any class or function, such as imports, which may affect the whole module.
+    """
+    definitions = []
+
+    def visit(node, prefix):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+                name = prefix + child.name
+                start = min([child.lineno] + [decorator.lineno for decorator in child.decorator_list])
+                definitions.append((start, child.end_lineno, name))
+                visit(child, name + ".")
+
+    visit(ast.parse(source), "")
+    symbols = set()
+    for line in lines:
+        containing = [name for start, end, name in definitions if start <= line <= end]
+        symbols.add(max(containing, key=len) if containing else None)
+    return symbols
+
+
+def _read_source(root, path):
+    try:
+        with open(os.path.join(root, path), encoding="utf-8") as source_file:
+            return source_file.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def changes_from_lines(root, changed_lines):
+    """Turn the changed lines of each file into the changed symbols of each file.
+
+    Args:
+        root (str): The project root the paths are relative to.
+        changed_lines (dict): Path -> changed line numbers, or None if the whole file changed.
+
+    Returns:
+        dict: Path -> set of changed symbols (see symbols_at), or None if the whole file counts as changed
+        (deleted, not Python, not parseable, or changed outside any class or function).
+    """
+    changes = {}
+    for path, lines in changed_lines.items():
+        source = _read_source(root, path) if path.endswith(".py") and lines is not None else None
+        symbols = None
+        if source is not None:
+            try:
+                symbols = symbols_at(source, lines)
+            except SyntaxError:
+                symbols = None
+        changes[path] = None if symbols is None or None in symbols else symbols
+    return changes
+
+
+def git_changed_lines(root, ref):
+    """Return the lines changed since a git ref, committed or not, plus untracked files.
+
+    Returns:
+        dict: Path -> changed line numbers in the current file, or None for untracked files.
+    """
+    diff = subprocess.run(
+        ["git", "diff", "-U0", "--no-color", "--no-ext-diff", "--relative", ref, "--"],
+        cwd=root, capture_output=True, text=True, check=True,
+    ).stdout
+    changed, path = {}, None
+    for line in diff.splitlines():
+        if line.startswith("diff --git "):
+            # The new name; deleted files keep their old one, and later count as wholly changed
+            path = line.split(" b/", 1)[1]
+            changed[path] = set()
+        elif path is not None and not line.startswith(("+++ ", "--- ")):
+            match = _HUNK.match(line)
+            if match:
+                start, count = int(match.group(1)), int(match.group(2) or 1)
+                # A pure deletion (count 0) is reported at the line before it; count that line
+                changed[path].update(range(start, start + count) if count else [max(start, 1)])
+    for path, lines in list(changed.items()):
+        if not lines:
+            changed[path] = None
+    untracked = subprocess.run(
+        ["git", "ls-files", "--others", "--exclude-standard"],
+        cwd=root, capture_output=True, text=True, check=True,
+    ).stdout
+    for path in untracked.splitlines():
+        changed[path] = None
+    return changed
+
+
+def parse_changed_files(values):
+    """Parse ``--changed-file`` values, "path" or "path::Symbol", into changed symbols per path."""
+    changes = {}
+    for value in values:
+        path, _, symbol = value.replace(os.sep, "/").partition("::")
+        if not symbol or path in changes and changes[path] is None:
+            changes[path] = None
+        else:
+            changes.setdefault(path, set()).add(symbol)
+    return changes
+
+
+def _related(changed, symbol):
+    return changed == symbol or changed.startswith(symbol + ".") or symbol.startswith(changed + ".")
+
+
+def _depends_on(dependency, changes):
+    path, _, symbol = dependency.partition("::")
+    if path not in changes:
+        return False
+    return changes[path] is None or any(_related(changed, symbol) for changed in changes[path])
+
+
+def affected_tests(tests, dependency_map, changes):
+    """Select the tests a change can affect.
+
+    A test is affected if it touched a changed class, if its own test function changed, or if anything else in
+    its test file changed (helpers and fixtures may affect every test there). Tests missing from the dependency
+    map are always selected, and so are tests that ran without touching any page object or locator: they use
+    their code some other way (say, importing locators directly), so their dependencies are unknown. A changed
+    file that no test depends on selects every test, unless it matches IMPACT_FREE_PATTERNS: there is no
+    telling what a change to, say, pages/base_page.py can break.
+
+    Args:
+        tests: (node ID, test file, qualified test name) tuples, e.g. ("test/test_main.py::TestOrangeHRM::
+            test_tc_01_empty_username[TC_01]", "test/test_main.py", "TestOrangeHRM.test_tc_01_empty_username").
+        dependency_map (DependencyMap): The recorded dependencies.
+        changes (dict): Path -> changed symbols, or None for the whole file.
+
+    Returns:
+        tuple: The node IDs of the selected tests, and the changed paths that forced selecting all of them.
+    """
+    test_files = {test_file for _, test_file, _ in tests}
+    known_files = dependency_map.files() | test_files
+    unknown = sorted(
+        path for path in changes
+        if path not in known_files and not any(fnmatch.fnmatch(path, pattern) for pattern in IMPACT_FREE_PATTERNS)
+    )
+    if unknown:
+        return [nodeid for nodeid, _, _ in tests], unknown
+
+    selected = []
+    for nodeid, test_file, name in tests:
+        touched = dependency_map.tests.get(nodeid)
+        file_changes = changes.get(test_file, set())
+        if not touched or file_changes is None:
+            selected.append(nodeid)
+        elif any(_related(changed, name) or not changed.rpartition(".")[2].startswith("test")
+                 for changed in file_changes):
+            selected.append(nodeid)
+        elif any(_depends_on(dependency, changes) for dependency in touched):
+            selected.append(nodeid)
+    return selected, []
+
+
+def history_order(nodeids, history):
+    """Order tests so recent failures come first, then the slowest tests; tests without history go first.
+
+    Args:
+        nodeids: The node IDs in collection order.
+        history (DataFrame): Records as returned by RunHistory.load().
+
+    Returns:
+        list: The node IDs in run order. Ties keep their collection order.
+    """
+    summary = summarize(history).set_index("test")
+    recent_fail_rate = summary["recent_fail_rate"].to_dict()
+    duration = summary["p50_duration"].to_dict()
+
+    def key(nodeid):
+        if nodeid not in duration:
+            return 0, 0.0, 0.0
+        return 1, -recent_fail_rate[nodeid], -duration[nodeid]
+
+    return sorted(nodeids, key=key)
+
+
+def _test_name(item):
+    cls = getattr(item, "cls", None)
+    name = getattr(item, "originalname", None) or item.name
+    return f"{cls.__qualname__}.{name}" if cls is not None else name
+
+
+class Scheduler:
+    def __init__(self, config, history_file, dependency_file):
+        """Initialize the Scheduler plugin.
+
+                Args:
+                    config: The pytest config, with the --history-order, --changed-since and --changed-file
+                        options.
+                    history_file (str): The run history the order is computed from.
+                    dependency_file (str): The dependency map selection uses, updated at the end of each run.
+        """
+        self.config = config
+        self.history_file = history_file
+        self.dependency_map = DependencyMap(dependency_file)
+        self.touched = {}
+
+    def _changes(self):
+        root = str(self.config.rootpath)
+        changes = {}
+        ref = self.config.getoption("--changed-since")
+        if ref:
+            changes.update(changes_from_lines(root, git_changed_lines(root, ref)))
+        for path, symbols in parse_changed_files(self.config.getoption("--changed-file") or ()).items():
+            if symbols is None or changes.get(path, set()) is None:
+                changes[path] = None
+            else:
+                changes[path] = changes.get(path, set()) | symbols
+        return changes
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config, items):
+        if config.getoption("--changed-since") or config.getoption("--changed-file"):
+            root = config.rootpath
+            tests = [
+                (item.nodeid, os.path.relpath(str(item.path), str(root)).replace(os.sep, "/"), _test_name(item))
+                for item in items
+            ]
+            selected, unknown = affected_tests(tests, self.dependency_map, self._changes())
+            if unknown:
+                print(f"\nImpact selection: running every test, no recorded dependency covers {', '.join(unknown)}")
+            else:
+                selected = set(selected)
+                deselected = [item for item in items if item.nodeid not in selected]
+                if deselected:
+                    config.hook.pytest_deselected(items=deselected)
+                    items[:] = [item for item in items if item.nodeid in selected]
+
+        if config.getoption("--history-order"):
+            history = RunHistory(self.history_file).load()
+            by_nodeid = {item.nodeid: item for item in items}
+            items[:] = [by_nodeid[nodeid] for nodeid in history_order(list(by_nodeid), history)]
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item):
+        dependencies.start(item.nodeid)
+        yield
+        dependencies.stop()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        if report.when == "teardown":
+            # Sent to the controller with the report under xdist
+            report.touched_dependencies = sorted(dependencies.touched)
+
+    def pytest_runtest_logreport(self, report):
+        if is_worker(self.config):
+            return
+        passed = self.touched.get(report.nodeid, (None, True))[1] and not report.failed
+        touched = getattr(report, "touched_dependencies", None)
+        self.touched[report.nodeid] = (touched, passed)
+
+    def pytest_sessionfinish(self, session):
+        if is_worker(self.config):
+            return
+        recorded = False
+        for nodeid, (touched, passed) in self.touched.items():
+            if touched is not None:
+                self.dependency_map.record(nodeid, touched, passed)
+                recorded = True
+        if recorded:
+            self.dependency_map.save()
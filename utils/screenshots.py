@@ -0,0 +1,193 @@
+"""
+utils/screenshots.py
+
+This module provides the ScreenshotService class, which takes screenshots from the driver and hands decoding,
+optional downscaling and disk writes to a background thread pool. Identical frames are skipped by content
+hash, and the oldest screenshots written by the service are removed once a count or size limit is reached.
+
+Purpose:
+- To keep screenshots from blocking the tests and the screenshots directory from growing forever.
+"""
+import base64
+import hashlib
+import io
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from utils.timing import tracer
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; without it screenshots are stored at full size
+    Image = None
+
+POLICIES = ("always", "on-failure", "never")
+
+
+class ScreenshotService:
+    def __init__(self, directory="screenshots", policy="always", max_files=200, max_bytes=None, max_width=None,
+                 workers=2):
+        """Initialize the ScreenshotService.
+
+                Args:
+                    directory (str): The directory screenshots are written to.
+                    policy (str): When screenshots are taken: "always", "on-failure" or "never".
+                    max_files (int, optional): The number of screenshots to keep; older ones written by the service
+                        are removed, other files in the directory are never touched.
+                    max_bytes (int, optional): The total size of screenshots to keep; older ones written by the
+                        service are removed.
+                    max_width (int, optional): Screenshots wider than this are downscaled (requires Pillow).
+                    workers (int): The number of background threads writing screenshots.
+        """
+        self.directory = directory
+        self.policy = policy
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.max_width = max_width
+        self.workers = workers
+        self.test_policy = None
+        self.current_test = None
+        self.saved = {}
+        self._stored = {}
+        self._written = deque()
+        self._written_bytes = 0
+        self._lock = threading.Lock()
+        self._executor = None
+        self._futures = []
+
+    def configure(self, **settings):
+        """Change settings such as the policy or the retention limits, e.g. from command-line options."""
+        if settings.get("policy", self.policy) not in POLICIES:
+            raise ValueError(f"Unknown screenshot policy '{settings['policy']}', expected one of {POLICIES}")
+        for name, value in settings.items():
+            if not hasattr(self, name):
+                raise TypeError(f"Unknown screenshot setting '{name}'")
+            setattr(self, name, value)
+
+    def effective_policy(self):
+        """Return the policy of the current test if it set one, otherwise the policy of the run."""
+        return self.test_policy or self.policy
+
+    def should_capture(self, failure=False):
+        policy = self.effective_policy()
+        return policy == "always" or (policy == "on-failure" and failure)
+
+    def capture(self, driver, prefix, failure=False):
+        """Take a screenshot and queue it for writing in the background.
+
+                Only the screenshot command and a hash of its result run on the calling thread; decoding,
+                downscaling and writing happen on the worker pool. A frame identical to one taken earlier is not
+                written again.
+
+                Args:
+                    driver: A Selenium WebDriver instance.
+                    prefix (str): The start of the file name, e.g. the test case ID.
+                    failure (bool): Whether the screenshot documents a failure. With the "on-failure" policy,
+                        only those screenshots are taken.
+
+                Returns:
+                    str: The path the screenshot will be written to, or the path of the identical frame taken
+                        earlier, or None if the policy skipped it.
+        """
+        if not self.should_capture(failure):
+            return None
+        with tracer.span("screenshot", "get_screenshot_as_base64"):
+            encoded = driver.get_screenshot_as_base64()
+        digest = hashlib.sha256(encoded.encode()).hexdigest()
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        # The start of the hash tells apart different frames taken with the same prefix in the same second
+        path = os.path.join(self.directory, f"{prefix}_{timestamp}_{digest[:8]}.png")
+        with self._lock:
+            stored = self._stored.get(digest)
+            if stored is not None:
+                # The test's screenshot is the file of the identical frame taken earlier
+                self.saved.setdefault(self.current_test, []).append(stored)
+                return stored
+            self._stored[digest] = path
+            self.saved.setdefault(self.current_test, []).append(path)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="screenshot")
+            self._futures.append(self._executor.submit(self._write, encoded, path, digest))
+        return path
+
+    def _write(self, encoded, path, digest):
+        png = base64.b64decode(encoded)
+        if self.max_width and Image is not None:
+            png = self._downscale(png, self.max_width)
+        os.makedirs(self.directory, exist_ok=True)
+        # Written under a temporary name, so a screenshot that exists is complete for readers like the live report
+        partial = path + ".part"
+        with open(partial, "wb") as screenshot_file:
+            screenshot_file.write(png)
+        os.replace(partial, path)
+
+        with self._lock:
+            self._written.append((path, digest, len(png)))
+            self._written_bytes += len(png)
+            self._enforce_retention()
+        return path
+
+    @staticmethod
+    def _downscale(png, max_width):
+        image = Image.open(io.BytesIO(png))
+        if image.width <= max_width:
+            return png
+        height = round(image.height * max_width / image.width)
+        output = io.BytesIO()
+        image.resize((max_width, height)).save(output, format="PNG", optimize=True)
+        return output.getvalue()
+
+    def _enforce_retention(self):
+        """Remove the oldest screenshots written by the service until the count and size limits are met."""
+        while self._written and ((self.max_files and len(self._written) > self.max_files)
+                                 or (self.max_bytes and self._written_bytes > self.max_bytes)):
+            oldest, digest, size = self._written.popleft()
+            self._written_bytes -= size
+            # A later identical frame is written again rather than pointing at the removed file
+            if self._stored.get(digest) == oldest:
+                del self._stored[digest]
+            try:
+                os.remove(oldest)
+            except FileNotFoundError:
+                pass
+
+    def queued_for(self, test_id):
+        """Return the files that show or will show a test's screenshots, without waiting for them to be written.
+
+                A file is only created once it is complete, so a reader can check for it while the writes go on.
+        """
+        with self._lock:
+            return list(self.saved.get(test_id, ()))
+
+    def screenshots_for(self, test_id):
+        """Wait for the queued screenshots to be written and return the files showing a test's screenshots.
+
+                A screenshot identical to an earlier frame is shown by that frame's file.
+        """
+        self.wait()
+        with self._lock:
+            return list(self.saved.get(test_id, ()))
+
+    def wait(self):
+        """Block until every queued screenshot has been written.
+
+                Returns:
+                    list: The paths written, without the screenshots skipped as duplicates.
+        """
+        with self._lock:
+            futures, self._futures = self._futures, []
+        return [path for path in (future.result() for future in futures) if path]
+
+    def close(self):
+        """Write all queued screenshots and stop the worker threads."""
+        self.wait()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+screenshot_service = ScreenshotService()
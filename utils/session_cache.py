@@ -0,0 +1,147 @@
+"""
+utils/session_cache.py
+
+This module provides the LoginSessionCache class, which remembers the cookies and web storage of an
+authenticated OrangeHRM session per user and base URL, and restores them into later browsers so they can
+skip the login form.
+
+Purpose:
+- To replace repeated UI logins with a cookie and storage restore plus a single page load.
+"""
+import threading
+import time
+from collections import namedtuple
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from utils.driver_pool import RESET_STORAGE_SCRIPT
+from utils.wait_policy import get_default_policy
+
+LOGIN_PATH = "/web/index.php/auth/login"
+LANDING_PATH = "/web/index.php/dashboard/index"
+
+STORAGE_SNAPSHOT_SCRIPT = """
+var dump = function (storage) {
+    var values = {};
+    for (var i = 0; i < storage.length; i++) {
+        var key = storage.key(i);
+        values[key] = storage.getItem(key);
+    }
+    return values;
+};
+return {local: dump(window.localStorage), session: dump(window.sessionStorage)};
+"""
+
+STORAGE_RESTORE_SCRIPT = """
+var snapshot = arguments[0];
+Object.keys(snapshot.local).forEach(function (key) { window.localStorage.setItem(key, snapshot.local[key]); });
+Object.keys(snapshot.session).forEach(function (key) { window.sessionStorage.setItem(key, snapshot.session[key]); });
+"""
+
+SessionEntry = namedtuple("SessionEntry", ["cookies", "storage", "saved_at"])
+
+
+class LoginSessionCache:
+    def __init__(self, base_url, ttl=900, clock=time.monotonic):
+        """Initialize the LoginSessionCache.
+
+                Args:
+                    base_url (str): The base URL of the application, e.g. "https://opensource-demo.orangehrmlive.com".
+                    ttl (float): The number of seconds a saved session is reused before a real login is
+                        required again. A TTL of 0 disables the cache.
+                    clock: A callable returning the current time in seconds, used to expire entries.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @property
+    def login_url(self):
+        return self.base_url + LOGIN_PATH
+
+    @property
+    def landing_url(self):
+        return self.base_url + LANDING_PATH
+
+    def get(self, username):
+        """Return the saved session of a user, or None if there is none or it has expired."""
+        key = (username, self.base_url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.clock() - entry.saved_at >= self.ttl:
+                del self._entries[key]
+                entry = None
+        return entry
+
+    def save(self, driver, username):
+        """Save the cookies and web storage of the logged-in session in the driver.
+
+                Args:
+                    driver: A WebDriver instance on an authenticated page of the application.
+                    username (str): The user the session belongs to.
+        """
+        if self.ttl <= 0:
+            return
+        entry = SessionEntry(
+            cookies=driver.get_cookies(),
+            storage=driver.execute_script(STORAGE_SNAPSHOT_SCRIPT),
+            saved_at=self.clock(),
+        )
+        with self._lock:
+            self._entries[(username, self.base_url)] = entry
+
+    def invalidate(self, username):
+        """Forget the saved session of a user."""
+        with self._lock:
+            self._entries.pop((username, self.base_url), None)
+
+    def restore(self, driver, username, wait_policy=None):
+        """Restore a saved session into the driver and open the landing page.
+
+                The driver must be on a page of the application, so the cookies can be set for its domain.
+                The current URL is only read once the page the driver was on has been replaced, because with
+                the "none" page load strategy driver.get() returns before the navigation is committed.
+                If the application sends the browser back to the login page, the session has expired on the
+                server: the entry is dropped, the restored cookies and storage are cleared, and the driver is
+                left on the login page. A driver that stops responding during the cleanup is left as it is, so
+                the caller's own login attempt reports the failure.
+
+                Args:
+                    driver: A WebDriver instance on a page of the application.
+                    username (str): The user whose session should be restored.
+                    wait_policy (WaitPolicy, optional): The policy used to wait for the landing page. Defaults
+                        to the suite's default policy.
+
+                Returns:
+                    bool: True if the driver is now on an authenticated page, False otherwise.
+        """
+        entry = self.get(username)
+        if entry is None:
+            return False
+
+        try:
+            for cookie in entry.cookies:
+                driver.add_cookie(cookie)
+            driver.execute_script(STORAGE_RESTORE_SCRIPT, entry.storage)
+            previous_page = driver.find_element(By.TAG_NAME, "html")
+            driver.get(self.landing_url)
+            policy = wait_policy or get_default_policy()
+            policy.until(driver, EC.staleness_of(previous_page), policy.timeout_for(),
+                         "Timed out waiting for the landing page to replace the previous page")
+            if LOGIN_PATH not in driver.current_url:
+                return True
+        except WebDriverException:
+            pass
+
+        self.invalidate(username)
+        try:
+            driver.delete_all_cookies()
+            driver.execute_script(RESET_STORAGE_SCRIPT)
+            if driver.current_url != self.login_url:
+                driver.get(self.login_url)
+        except WebDriverException:
+            pass
+        return False
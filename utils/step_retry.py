@@ -0,0 +1,173 @@
+"""
+utils/step_retry.py
+
+This module provides the retry_step decorator, which retries a failed page-object action on the live browser
+session instead of failing the whole test, the StepRetryPolicy class deciding which failures are worth a retry
+and how many retries a step may spend, and the RetryLog recording every retry for the test report.
+
+Purpose:
+- To make a transient hiccup (a stale element, an overlay intercepting a click, a slow navigation) cost one
+  extra action rather than a new browser, a new login and a whole test, while a genuinely missing element
+  still fails after a single wait.
+"""
+import functools
+import html
+import time
+from collections import namedtuple
+
+from selenium.common.exceptions import (
+    ElementClickInterceptedException, ElementNotInteractableException, StaleElementReferenceException,
+    TimeoutException,
+)
+from utils.timing import tracer
+
+
+class NavigationTimeout(TimeoutException):
+    """A wait for the browser to reach a URL that timed out. Unlike other timeouts it is worth a retry: the click
+    that should have navigated may have been lost, while an element still missing after a full wait is not
+    going to appear on a second one."""
+
+
+# Failures that leave the session usable and may pass on a second try. Anything else (a lost session, a closed
+# window, a failed assertion, an element wait that timed out) is raised at once.
+RETRYABLE_EXCEPTIONS = (
+    StaleElementReferenceException,
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    NavigationTimeout,
+)
+
+StepRetry = namedtuple("StepRetry", ["test", "step", "attempt", "error", "elapsed"])
+
+
+class StepRetryPolicy:
+    def __init__(self, retries=1, budget=30.0, delay=0.2, retryable=RETRYABLE_EXCEPTIONS):
+        """Initialize the StepRetryPolicy.
+
+                Args:
+                    retries (int): How many times a failed step is tried again; 0 disables retries.
+                    budget (float): Seconds after the start of a step past which it is not retried any more, so
+                        retried waits cannot stretch a step without bound.
+                    delay (float): Seconds to pause before a retry.
+                    retryable (tuple): The exception classes worth a retry.
+        """
+        if retries < 0:
+            raise ValueError("retries must not be negative")
+        self.retries = retries
+        self.budget = budget
+        self.delay = delay
+        self.retryable = tuple(retryable)
+
+    def should_retry(self, exc, attempt, elapsed, retryable=None):
+        """Decide whether a step that failed is tried again.
+
+                Args:
+                    exc (Exception): The failure.
+                    attempt (int): The number of attempts made so far.
+                    elapsed (float): Seconds since the step started.
+                    retryable (tuple, optional): Exception classes overriding the policy's for this step.
+
+                Returns:
+                    bool: Whether to retry.
+        """
+        return (
+            attempt <= self.retries
+            and elapsed < self.budget
+            and isinstance(exc, retryable or self.retryable)
+        )
+
+
+_default_policy = None
+
+
+def get_default_retry_policy():
+    """Return the retry policy used by page objects that were not given one."""
+    global _default_policy
+    if _default_policy is None:
+        _default_policy = StepRetryPolicy()
+    return _default_policy
+
+
+def set_default_retry_policy(policy):
+    """Replace the retry policy used by page objects that were not given one."""
+    global _default_policy
+    _default_policy = policy
+
+
+def describe(exc):
+    """Return the class and the first line of the message of an exception, without Selenium's documentation link."""
+    message = (getattr(exc, "msg", None) or str(exc)).split("; For documentation on this error")[0].strip()
+    return f"{type(exc).__name__}: {message.splitlines()[0]}" if message else type(exc).__name__
+
+
+class RetryLog:
+    def __init__(self):
+        """Initialize the RetryLog."""
+        self.current_test = None
+        self.retries = []
+
+    def record(self, step, attempt, exc, elapsed):
+        """Record a retry of a step, attributed to the running test."""
+        self.retries.append(StepRetry(self.current_test, step, attempt, describe(exc), elapsed))
+
+    def reset(self):
+        """Drop all recorded retries."""
+        self.retries = []
+
+
+retry_log = RetryLog()
+
+
+def retry_step(function=None, *, retryable=None):
+    """Retry a page-object action on the live session when it fails in a way the retry policy classifies as
+    transient.
+
+    The page's cached elements are dropped before each retry, so the action looks its elements up again. Each
+    retry is recorded in retry_log and timed as a "retry" span. Only decorate actions that are safe to run
+    again after failing part way, such as a click followed by a wait; never an action that submits a form.
+
+    Args:
+        function: The page-object method, when used as ``@retry_step``.
+        retryable (tuple, optional): Exception classes overriding the policy's, when used as
+            ``@retry_step(retryable=(...))``.
+    """
+    def decorator(function):
+        step = function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(page, *args, **kwargs):
+            policy = getattr(page, "retry_policy", None) or get_default_retry_policy()
+            started = time.monotonic()
+            attempt = 1
+            while True:
+                try:
+                    if attempt == 1:
+                        return function(page, *args, **kwargs)
+                    with tracer.span("retry", step):
+                        return function(page, *args, **kwargs)
+                except Exception as exc:
+                    elapsed = time.monotonic() - started
+                    if not policy.should_retry(exc, attempt, elapsed, retryable):
+                        raise
+                    retry_log.record(step, attempt, exc, elapsed)
+                page.elements.invalidate()
+                time.sleep(policy.delay)
+                attempt += 1
+        return wrapper
+
+    return decorator(function) if function is not None else decorator
+
+
+def render_retries_html(retries):
+    """Render step retries as an HTML table for the pytest-html report."""
+    cells = "".join(
+        f"<tr><td>{html.escape(retry['test'] or '')}</td><td>{html.escape(retry['step'])}</td>"
+        f"<td>{retry['attempt'] + 1}</td><td>{html.escape(retry['error'])}</td><td>{retry['elapsed']:.3f}</td></tr>"
+        for retry in retries
+    )
+    return (
+        "<h2>Step retries</h2>"
+        "<table id=\"step-retries\"><thead><tr><th>Test</th><th>Step</th><th>Attempt</th><th>After</th>"
+        "<th>Elapsed (s)</th></tr></thead>"
+        f"<tbody>{cells}</tbody></table>"
+    )
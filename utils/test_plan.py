@@ -0,0 +1,171 @@
+"""
+utils/test_plan.py
+
+This module loads the test cases of data/test_plan.xlsx so the sheet can drive the tests: each row becomes a
+PlanCase with its inputs (the JSON in the "Test data" column) and the row its result is written back to.
+Rows are streamed with openpyxl's read-only mode, and the parsed cases are cached in a JSON file keyed on the
+workbook's modification time, size and content hash.
+
+Purpose:
+- To keep test inputs and result rows in the test plan instead of hard-coding them in the tests.
+- To avoid parsing the workbook again on every test collection when it has not changed.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from collections import namedtuple
+
+from openpyxl import load_workbook
+
+CACHE_VERSION = 1
+
+# Header of each column in the test plan -> PlanCase field
+COLUMNS = {
+    "Test_case": "case_id",
+    "Tested by": "tested_by",
+    "Scenario": "scenario",
+    "Type": "type",
+    "Expected": "expected",
+    "Test data": "data",
+}
+RESULT_HEADER = "Result"
+
+PlanCase = namedtuple(
+    "PlanCase", ["case_id", "row", "tested_by", "scenario", "type", "expected", "data", "result_column"]
+)
+
+
+def default_cache_file(file_name, sheet_name):
+    """Return the cache file of a sheet, a hidden JSON file next to the workbook."""
+    directory, base_name = os.path.split(os.path.abspath(file_name))
+    return os.path.join(directory, f".{base_name}.{sheet_name}.cache.json")
+
+
+def _file_hash(file_name):
+    digest = hashlib.sha256()
+    with open(file_name, "rb") as workbook_file:
+        for block in iter(lambda: workbook_file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def iter_plan_cases(file_name, sheet_name="Sheet1"):
+    """Stream the test cases of a sheet, one row at a time.
+
+    The first row is the header; rows without a test case ID are skipped.
+
+    Args:
+        file_name (str): The test plan workbook.
+        sheet_name (str): The worksheet holding the test cases.
+
+    Yields:
+        PlanCase: One case per test case row.
+    """
+    workbook = load_workbook(file_name, read_only=True)
+    try:
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        header = next(rows, ())
+        indexes = {field: header.index(name) for name, field in COLUMNS.items() if name in header}
+        result_column = header.index(RESULT_HEADER) + 1 if RESULT_HEADER in header else None
+        if "case_id" not in indexes:
+            raise ValueError(f"Sheet '{sheet_name}' of {file_name} has no 'Test_case' column")
+
+        for row_number, row in enumerate(rows, start=2):
+            values = {field: row[index] if index < len(row) else None for field, index in indexes.items()}
+            if not values["case_id"]:
+                continue
+            raw_data = values.get("data")
+            values["data"] = json.loads(raw_data) if raw_data else {}
+            yield PlanCase(
+                case_id=str(values["case_id"]).strip(),
+                row=row_number,
+                tested_by=values.get("tested_by"),
+                scenario=values.get("scenario"),
+                type=values.get("type"),
+                expected=values.get("expected"),
+                data=values["data"],
+                result_column=result_column,
+            )
+    finally:
+        workbook.close()
+
+
+def load_test_plan(file_name, sheet_name="Sheet1", cache_file=None):
+    """Return the test cases of a sheet, from the compiled cache when the workbook has not changed.
+
+    The cache is used as is if the workbook's modification time and size match. Otherwise the workbook's hash
+    is compared, so a touched but unchanged workbook is not parsed again either.
+
+    Args:
+        file_name (str): The test plan workbook.
+        sheet_name (str): The worksheet holding the test cases.
+        cache_file (str, optional): The compiled cache. Defaults to a hidden file next to the workbook.
+
+    Returns:
+        list: The PlanCase of every test case row, in sheet order.
+    """
+    cache_file = cache_file or default_cache_file(file_name, sheet_name)
+    stat = os.stat(file_name)
+    cache = None
+    try:
+        with open(cache_file, encoding="utf-8") as cached:
+            cache = json.load(cached)
+    except (OSError, ValueError):
+        pass
+
+    if cache is not None and cache.get("version") == CACHE_VERSION:
+        if cache["mtime_ns"] == stat.st_mtime_ns and cache["size"] == stat.st_size:
+            return [PlanCase(*case) for case in cache["cases"]]
+        file_hash = _file_hash(file_name)
+        if cache["sha256"] == file_hash:
+            cases = [PlanCase(*case) for case in cache["cases"]]
+            _write_cache(cache_file, stat, file_hash, cases)
+            return cases
+    else:
+        file_hash = _file_hash(file_name)
+
+    cases = list(iter_plan_cases(file_name, sheet_name))
+    _write_cache(cache_file, stat, file_hash, cases)
+    return cases
+
+
+def _write_cache(cache_file, stat, file_hash, cases):
+    cache = {
+        "version": CACHE_VERSION,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": file_hash,
+        "cases": [list(case) for case in cases],
+    }
+    # Several workers may compile the cache at once; each writes a temporary file and renames it into place
+    fd, temp_path = tempfile.mkstemp(suffix=".json", dir=os.path.dirname(cache_file))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as temp_file:
+            json.dump(cache, temp_file)
+        os.replace(temp_path, cache_file)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def restamp_cache(file_name, sheet_name="Sheet1", cache_file=None):
+    """Mark an existing cache as current after writing to the workbook only what the cases do not depend on.
+
+    Recording results changes the workbook but not its test cases, so the compiled cases stay valid; without
+    restamping, the next run would parse the workbook again.
+    """
+    cache_file = cache_file or default_cache_file(file_name, sheet_name)
+    try:
+        with open(cache_file, encoding="utf-8") as cached:
+            cache = json.load(cached)
+    except (OSError, ValueError):
+        return
+    if cache.get("version") == CACHE_VERSION:
+        cases = [PlanCase(*case) for case in cache["cases"]]
+        _write_cache(cache_file, os.stat(file_name), _file_hash(file_name), cases)
+
+
+def cases_for(cases, case_prefix):
+    """Return the cases of one test: the case whose ID is the prefix, and variants such as "TC_04.2"."""
+    return [case for case in cases if case.case_id == case_prefix or case.case_id.startswith(case_prefix + ".")]
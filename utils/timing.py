@@ -0,0 +1,214 @@
+"""
+utils/timing.py
+
+This module provides the Tracer class, which records the wall time of page-object methods, locator waits,
+WebDriver commands and result-file writes, and helpers to save the recorded spans as a JSON trace and to
+summarize the slowest steps of a run.
+
+Purpose:
+- To show where the suite's time goes, cheaply enough to leave tracing on in every run.
+"""
+import functools
+import glob
+import html
+import json
+import os
+import shutil
+import time
+from contextlib import contextmanager
+
+SPAN_FIELDS = ("category", "name", "start", "duration", "test")
+
+
+class Tracer:
+    def __init__(self, enabled=True):
+        """Initialize the Tracer.
+
+                Args:
+                    enabled (bool): Whether spans are recorded. A disabled tracer costs one attribute check per span.
+        """
+        self.enabled = enabled
+        self.current_test = None
+        self.spans = []
+        self._origin = time.perf_counter()
+
+    @contextmanager
+    def span(self, category, name):
+        """Record the wall time of the enclosed block.
+
+                Args:
+                    category (str): The kind of step, e.g. "page", "wait", "webdriver" or "excel".
+                    name (str): The name of the step within its category.
+        """
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            ended = time.perf_counter()
+            self.spans.append((category, name, started - self._origin, ended - started, self.current_test))
+
+    def traced(self, category, name=None):
+        """Decorate a function so each call is recorded as a span.
+
+                Args:
+                    category (str): The kind of step.
+                    name (str, optional): The name of the step. Defaults to the function's qualified name.
+        """
+        def decorator(function):
+            label = name or function.__qualname__
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                with self.span(category, label):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def instrument_driver(self, driver):
+        """Record every command the driver sends to the browser as a "webdriver" span.
+
+                Args:
+                    driver: A Selenium WebDriver instance. Instrumenting it twice has no further effect.
+
+                Returns:
+                    The same driver.
+        """
+        if getattr(driver, "_tracer_instrumented", False):
+            return driver
+        execute = driver.execute
+
+        def traced_execute(driver_command, params=None):
+            if not self.enabled:
+                return execute(driver_command, params)
+            with self.span("webdriver", driver_command):
+                return execute(driver_command, params)
+
+        driver.execute = traced_execute
+        driver._tracer_instrumented = True
+        return driver
+
+    def reset(self):
+        """Drop all recorded spans."""
+        self.spans = []
+        self._origin = time.perf_counter()
+
+    def write_json(self, path, **metadata):
+        """Write the recorded spans to a JSON trace file.
+
+                Args:
+                    path (str): The file to write.
+                    **metadata: Extra top-level fields, such as the run and worker IDs.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        trace = dict(metadata, spans=[dict(zip(SPAN_FIELDS, span)) for span in self.spans])
+        with open(path, "w", encoding="utf-8") as trace_file:
+            json.dump(trace, trace_file)
+
+
+tracer = Tracer()
+
+
+@functools.lru_cache(maxsize=1)
+def _locator_names():
+    from locators import locators_test
+
+    names = {}
+    for class_name, locator_class in vars(locators_test).items():
+        if isinstance(locator_class, type) and class_name.endswith("Locators"):
+            for attribute, value in vars(locator_class).items():
+                if isinstance(value, tuple):
+                    names[value] = f"{class_name}.{attribute}"
+    return names
+
+
+def locator_name(locator):
+    """Return the name of a locator in locators/locators_test.py, e.g. "LoginPageLocators.LOGIN_BUTTON".
+
+    Locators that are not defined there are named by their value.
+    """
+    if isinstance(locator, tuple):
+        return _locator_names().get(locator, str(locator[1]))
+    return str(locator)
+
+
+def load_spans(directory):
+    """Load the spans of every trace file in a directory, e.g. the traces of all workers of a run."""
+    spans = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+        with open(path, encoding="utf-8") as trace_file:
+            spans.extend(json.load(trace_file)["spans"])
+    return spans
+
+
+def recent_runs(root, keep):
+    """Return the trace directories of the newest runs under root, oldest first.
+
+    Run IDs start with their start time, so they sort in the order the runs started.
+
+    Args:
+        root (str): The directory holding one trace directory per run.
+        keep (int): The number of runs to return.
+    """
+    if not os.path.isdir(root) or keep <= 0:
+        return []
+    runs = sorted(entry.name for entry in os.scandir(root) if entry.is_dir())
+    return [os.path.join(root, run) for run in runs[-keep:]]
+
+
+def prune_runs(root, keep):
+    """Remove the trace directories of all but the newest runs under root.
+
+    Args:
+        root (str): The directory holding one trace directory per run.
+        keep (int): The number of runs to keep.
+    """
+    if not os.path.isdir(root):
+        return
+    kept = set(recent_runs(root, keep))
+    for entry in os.scandir(root):
+        if entry.is_dir() and entry.path not in kept:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def slowest_steps(spans, limit=15):
+    """Aggregate spans per step and return the steps with the largest total time.
+
+    Args:
+        spans: Span dictionaries as stored in a trace file.
+        limit (int): The number of steps to return.
+
+    Returns:
+        list: Dictionaries with the category, name, count, total, mean and max of each step.
+    """
+    steps = {}
+    for span in spans:
+        key = (span["category"], span["name"])
+        count, total, longest = steps.get(key, (0, 0.0, 0.0))
+        steps[key] = (count + 1, total + span["duration"], max(longest, span["duration"]))
+
+    rows = [
+        {"category": category, "name": name, "count": count, "total": total, "mean": total / count, "max": longest}
+        for (category, name), (count, total, longest) in steps.items()
+    ]
+    rows.sort(key=lambda row: row["total"], reverse=True)
+    return rows[:limit]
+
+
+def render_slowest_steps_html(rows):
+    """Render the rows of slowest_steps() as an HTML table for the pytest-html report."""
+    cells = "".join(
+        f"<tr><td>{html.escape(row['category'])}</td><td>{html.escape(row['name'])}</td><td>{row['count']}</td>"
+        f"<td>{row['total']:.3f}</td><td>{row['mean']:.3f}</td><td>{row['max']:.3f}</td></tr>"
+        for row in rows
+    )
+    return (
+        "<h2>Slowest steps</h2>"
+        "<table id=\"slowest-steps\"><thead><tr><th>Category</th><th>Step</th><th>Calls</th>"
+        "<th>Total (s)</th><th>Mean (s)</th><th>Max (s)</th></tr></thead>"
+        f"<tbody>{cells}</tbody></table>"
+    )
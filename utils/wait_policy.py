@@ -0,0 +1,156 @@
+"""
+utils/wait_policy.py
+
+This module provides the WaitPolicy class, which decides how long and how often the page objects wait for
+conditions on the page, and runs those waits: in the browser on DOM mutation events (utils/event_waits.py)
+where it can, and by polling otherwise.
+
+Purpose:
+- To keep every timeout of the suite in one place, tunable per environment and per locator.
+- To notice a condition as soon as it is true: by event, or by polling fast at first and backing off.
+"""
+import os
+import time
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from utils.event_waits import EventWaitUnsupported, supports, wait_for_condition
+
+ENVIRONMENT_VARIABLE = "ORANGEHRM_ENV"
+
+# Default timeout in seconds for each environment the suite runs against
+ENVIRONMENT_TIMEOUTS = {
+    "local": 5,
+    "default": 10,
+    "staging": 20,
+}
+
+IGNORED_EXCEPTIONS = (NoSuchElementException,)
+
+BACKENDS = ("event", "poll")
+
+
+class WaitPolicy:
+    def __init__(self, timeout=10, locator_timeouts=None, initial_poll=0.05, max_poll=0.5, backoff=1.5,
+                 backend="event"):
+        """Initialize the WaitPolicy.
+
+                Args:
+                    timeout (float): The default number of seconds to wait for a condition.
+                    locator_timeouts (dict, optional): Timeouts overriding the default for specific locators.
+                    initial_poll (float): The first polling interval in seconds.
+                    max_poll (float): The longest polling interval in seconds.
+                    backoff (float): The factor each polling interval grows by.
+                    backend (str): "event" to wait for element and URL conditions in the browser, falling back
+                        to polling where that is not possible, or "poll" to always poll.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown wait backend '{backend}', expected one of {BACKENDS}")
+        self.timeout = timeout
+        self.locator_timeouts = dict(locator_timeouts or {})
+        self.initial_poll = initial_poll
+        self.max_poll = max_poll
+        self.backoff = backoff
+        self.backend = backend
+
+    @classmethod
+    def for_environment(cls, name=None, **kwargs):
+        """Create a policy with the default timeout of an environment.
+
+                Args:
+                    name (str, optional): One of ENVIRONMENT_TIMEOUTS. Defaults to the ORANGEHRM_ENV environment
+                        variable, or "default" if it is not set.
+                    **kwargs: Further arguments for the WaitPolicy constructor.
+
+                Returns:
+                    WaitPolicy: The policy for the environment.
+        """
+        name = name or os.environ.get(ENVIRONMENT_VARIABLE, "default")
+        if name not in ENVIRONMENT_TIMEOUTS:
+            raise ValueError(f"Unknown environment '{name}', expected one of {sorted(ENVIRONMENT_TIMEOUTS)}")
+        return cls(timeout=ENVIRONMENT_TIMEOUTS[name], **kwargs)
+
+    def timeout_for(self, locator=None):
+        """Return the timeout for a locator, falling back to the default timeout."""
+        return self.locator_timeouts.get(locator, self.timeout)
+
+    def poll_intervals(self):
+        """Yield polling intervals that start at initial_poll and grow by backoff up to max_poll."""
+        interval = self.initial_poll
+        while True:
+            yield interval
+            interval = min(interval * self.backoff, self.max_poll)
+
+    def until(self, driver, condition, timeout, message=""):
+        """Call the condition with the driver until it returns a truthy value.
+
+                Args:
+                    driver: A Selenium WebDriver instance.
+                    condition: A callable taking the driver, such as an expected condition.
+                    timeout (float): The maximum number of seconds to wait.
+                    message (str): The message of the TimeoutException raised when the wait expires.
+
+                Returns:
+                    The truthy value returned by the condition.
+
+                Raises:
+                    TimeoutException: If the condition is not met before the timeout.
+        """
+        screen = None
+        stacktrace = None
+        end_time = time.monotonic() + timeout
+        intervals = self.poll_intervals()
+        while True:
+            try:
+                value = condition(driver)
+                if value:
+                    return value
+            except IGNORED_EXCEPTIONS as exc:
+                screen = getattr(exc, "screen", None)
+                stacktrace = getattr(exc, "stacktrace", None)
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(next(intervals), remaining))
+        raise TimeoutException(message, screen, stacktrace)
+
+    def wait_for(self, driver, kind, target, condition, timeout, message=""):
+        """Wait for an element or URL condition, by event if the backend and the driver allow it.
+
+                Args:
+                    driver: A Selenium WebDriver instance.
+                    kind (str): "presence", "visible", "clickable" or "url" (see utils/event_waits.py).
+                    target: The (By, value) locator of the element, or the URL fragment for "url".
+                    condition: The equivalent expected condition, polled when events cannot be used.
+                    timeout (float): The maximum number of seconds to wait.
+                    message (str): The message of the TimeoutException raised when the wait expires.
+
+                Returns:
+                    The element, or a truthy value for "url".
+
+                Raises:
+                    TimeoutException: If the condition is not met before the timeout.
+        """
+        if self.backend == "event" and supports(kind, target):
+            started = time.monotonic()
+            try:
+                return wait_for_condition(driver, kind, target, timeout, message)
+            except EventWaitUnsupported:
+                timeout = max(0.0, timeout - (time.monotonic() - started))
+        return self.until(driver, condition, timeout, message)
+
+
+_default_policy = None
+
+
+def get_default_policy():
+    """Return the policy used by page objects that were not given one."""
+    global _default_policy
+    if _default_policy is None:
+        _default_policy = WaitPolicy.for_environment()
+    return _default_policy
+
+
+def set_default_policy(policy):
+    """Replace the policy used by page objects that were not given one."""
+    global _default_policy
+    _default_policy = policy